@@ -0,0 +1,134 @@
+"""
+Load test for the real-time alert stream.
+
+In-process (default): subscribes N idle connections to an AlertHub, then
+publishes events and reports fan-out latency and memory per connection.
+
+    python -m benchmarks.alert_stream --connections 5000 --events 2000
+
+Against a running server: holds N SSE connections open for a member and counts
+what they receive (trigger alerts separately, e.g. PATCH /api/alerts/{id}).
+
+    python -m benchmarks.alert_stream --url http://localhost:8001 \\
+        --token <access token> --member <member id> --connections 2000 --duration 60
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.alert_hub import AlertHub
+
+
+async def run_in_process(args):
+    hub = AlertHub(max_queue=args.max_queue)
+    await hub.start()
+    members = [f"member-{i}" for i in range(max(1, args.connections // args.per_member))]
+    latencies = []
+    received = 0
+    
+    async def client(member_id: str):
+        nonlocal received
+        subscription = hub.subscribe(member_id)
+        try:
+            while True:
+                message = await subscription.get()
+                latencies.append((time.perf_counter() - json.loads(message.payload)['sent']) * 1000)
+                received += 1
+        finally:
+            hub.unsubscribe(subscription)
+    
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(client(members[i % len(members)])) for i in range(args.connections)]
+    await asyncio.sleep(0)
+    per_connection = (tracemalloc.get_traced_memory()[0] - baseline) / args.connections
+    tracemalloc.stop()
+    
+    started = time.perf_counter()
+    for _ in range(args.events):
+        member_id = random.choice(members)
+        await hub.publish(member_id, 'risk_event.updated', json.dumps({'sent': time.perf_counter()}))
+        # Let subscribers drain between publishes, as a live event loop would
+        await asyncio.sleep(0)
+    while received < hub.delivered:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    
+    latencies.sort()
+    print(f"connections:        {args.connections} ({len(members)} members)")
+    print(f"memory/connection:  {per_connection / 1024:.1f} KiB")
+    print(f"events published:   {args.events} ({args.events / elapsed:.0f}/s)")
+    print(f"messages delivered: {received} (dropped {hub.dropped})")
+    if latencies:
+        print(f"fan-out latency:    p50 {statistics.median(latencies):.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+
+
+async def run_against_server(args):
+    import httpx
+    
+    url = f"{args.url.rstrip('/')}/api/members/{args.member}/alerts/stream"
+    headers = {'Authorization': f'Bearer {args.token}'}
+    counts = {'connected': 0, 'failed': 0, 'events': 0, 'keepalives': 0}
+    limits = httpx.Limits(max_connections=args.connections + 10)
+    
+    async with httpx.AsyncClient(timeout=None, limits=limits) as http:
+        async def client():
+            try:
+                async with http.stream('GET', url, headers=headers) as response:
+                    if response.status_code != 200:
+                        counts['failed'] += 1
+                        return
+                    counts['connected'] += 1
+                    async for line in response.aiter_lines():
+                        if line.startswith('event:'):
+                            counts['events'] += 1
+                        elif line.startswith(':'):
+                            counts['keepalives'] += 1
+            except httpx.HTTPError:
+                counts['failed'] += 1
+        
+        tasks = [asyncio.create_task(client()) for _ in range(args.connections)]
+        deadline = time.monotonic() + args.duration
+        while time.monotonic() < deadline:
+            await asyncio.sleep(5)
+            print(json.dumps(counts))
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=5000)
+    parser.add_argument('--per-member', type=int, default=2, help='subscribers per member (in-process)')
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--max-queue', type=int, default=100)
+    parser.add_argument('--url')
+    parser.add_argument('--token')
+    parser.add_argument('--member')
+    parser.add_argument('--duration', type=float, default=60)
+    args = parser.parse_args()
+    
+    if args.url:
+        if not (args.token and args.member):
+            parser.error('--url requires --token and --member')
+        asyncio.run(run_against_server(args))
+    else:
+        asyncio.run(run_in_process(args))
+
+
+if __name__ == '__main__':
+    main()
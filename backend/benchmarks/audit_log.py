@@ -0,0 +1,163 @@
+"""
+Request latency with and without audit logging, plus writer throughput and
+the MongoDB-outage path (spill to disk, then replay).
+
+Usage (from backend/):
+    python -m benchmarks.audit_log [--requests 2000] [--events 50000] [--db-latency-ms 2]
+
+Runs the app in-process on the in-memory backend. `--db-latency-ms` is added to
+every database operation, so the "synchronous insert" figure shows what writing
+each event inside the handler would cost instead.
+"""
+from datetime import datetime
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[max(0, int(len(values) * p) - 1)]
+
+
+def request_latency(args):
+    import server
+    from fastapi.testclient import TestClient
+    
+    with TestClient(server.app) as client:
+        r = client.post('/api/auth/register', json={
+            'email': 'bench@example.com', 'password': 'bench', 'role': 'member', 'org_id': 'bench-org'
+        })
+        headers = {'Authorization': f"Bearer {r.json()['access_token']}"}
+        r = client.post('/api/members', headers=headers, json={
+            'user_id': r.json()['user']['id'], 'org_id': 'bench-org', 'first_name': 'Bench', 'last_name': 'Member'
+        })
+        url = f"/api/members/{r.json()['id']}"
+        
+        record = server.container.audit_logger.record
+        timings = {'audited': [], 'not audited': []}
+        for i in range(args.requests * 2):
+            audited = i % 2 == 0
+            server.container.audit_logger.record = record if audited else (lambda *a, **k: None)
+            started = time.perf_counter()
+            assert client.get(url, headers=headers).status_code == 200
+            timings['audited' if audited else 'not audited'].append((time.perf_counter() - started) * 1000)
+        server.container.audit_logger.record = record
+        
+        print(f"GET /members/{{id}} x {args.requests} each, interleaved (db latency {args.db_latency_ms} ms)")
+        for name, values in timings.items():
+            print(f"  {name:12s} p50 {percentile(values, 0.5):7.3f} ms  p99 {percentile(values, 0.99):7.3f} ms  "
+                  f"mean {statistics.mean(values):7.3f} ms")
+        added = statistics.mean(timings['audited']) - statistics.mean(timings['not audited'])
+        print(f"  added by auditing: {added * 1000:+.0f} us/request (mean)")
+    print(f"  writer: {server.container.audit_logger.stats()}")
+
+
+async def writer_throughput(args):
+    from repositories.memory import InMemoryDatabase
+    from repositories import AuditLogRepository
+    from services import AuditLogger
+    from models import AuditAction
+    
+    class BenchAuditRepository(AuditLogRepository):
+        # The in-memory backend enforces unique indexes by scanning every
+        # document, which would dominate here (MongoDB uses the index)
+        indexes = [spec for spec in AuditLogRepository.indexes if not spec.unique]
+    
+    db = InMemoryDatabase(latency_ms=args.db_latency_ms)
+    repo = BenchAuditRepository(db)
+    
+    started = time.perf_counter()
+    await repo.insert_batch([{'id': 'sync', 'action': 'login', 'timestamp': datetime.utcnow()}])
+    await repo.insert_batch([{'id': 'sync-2', 'action': 'login', 'timestamp': datetime.utcnow()}])
+    sync_ms = (time.perf_counter() - started) * 1000 / 2
+    print(f"\nsynchronous insert in the handler: ~{sync_ms:.2f} ms/request")
+    
+    audit = AuditLogger(repo, max_queue=args.events)
+    started = time.perf_counter()
+    for i in range(args.events):
+        audit.record(AuditAction.VIEW_METRICS, resource_type='member', resource_id=str(i % 100))
+    record_us = (time.perf_counter() - started) * 1e6 / args.events
+    
+    audit.start()
+    started = time.perf_counter()
+    while audit.stats()['written'] < args.events:
+        await asyncio.sleep(0.005)
+    drain_s = time.perf_counter() - started
+    await audit.stop()
+    stats = audit.stats()
+    print(f"record(): {record_us:.1f} us/event; background writer: {args.events / drain_s:,.0f} events/s "
+          f"in {stats['batches']} batches")
+
+
+class UnreachableRepository:
+    """Stands in for the audit repository while MongoDB is down"""
+    
+    def __init__(self, repo):
+        self.repo = repo
+        self.down = True
+    
+    async def insert_batch(self, events):
+        if self.down:
+            raise ConnectionError("server selection timeout")
+        return await self.repo.insert_batch(events)
+    
+    async def drop_expired_partitions(self):
+        return []
+
+
+async def outage(args):
+    from repositories.memory import InMemoryDatabase
+    from repositories import AuditLogRepository
+    from services import AuditLogger
+    from models import AuditAction
+    
+    db = InMemoryDatabase()
+    repo = UnreachableRepository(AuditLogRepository(db))
+    with tempfile.TemporaryDirectory() as tmp:
+        audit = AuditLogger(repo, spill_path=str(Path(tmp) / 'audit_spill.jsonl'), flush_interval=0.01, retry_interval=0.05)
+        audit.start()
+        for i in range(1000):
+            audit.record(AuditAction.LOGIN, resource_type='user', resource_id=str(i))
+        await asyncio.sleep(0.1)
+        spilled = audit.stats()['spilled']
+        
+        repo.down = False
+        audit.record(AuditAction.LOGIN, resource_type='user', resource_id='after')
+        while audit.stats()['spill_pending']:
+            await asyncio.sleep(0.01)
+        await audit.stop()
+        
+        partition = db[AuditLogRepository.partition_name(datetime.utcnow())]
+        stored = await partition.count_documents({})
+        print(f"\noutage: {spilled} events spilled to disk, {audit.stats()['replayed']} replayed, "
+              f"{stored} stored (expected 1001)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=50000)
+    parser.add_argument('--db-latency-ms', type=float, default=2.0)
+    args = parser.parse_args()
+    
+    os.environ['DB_BACKEND'] = 'memory'
+    os.environ['MEMORY_DB_LATENCY_MS'] = str(args.db_latency_ms)
+    os.environ['AUDIT_SPILL_PATH'] = str(Path(tempfile.gettempdir()) / 'audit_bench_spill.jsonl')
+    logging.disable(logging.WARNING)
+    
+    request_latency(args)
+    asyncio.run(writer_throughput(args))
+    asyncio.run(outage(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Import-time budget for server.py.
+
+Usage (from backend/):
+    python -m benchmarks.import_time [--budget-ms 1500] [--runs 3] [--top 15]
+
+Imports `server` in fresh interpreters with `-X importtime` and no database
+settings in the environment, then prints the slowest modules (cumulative, from
+the fastest run). Exits non-zero if the import fails, builds any dependency
+(e.g. opens a database client) or exceeds the budget, so it can gate CI.
+"""
+from pathlib import Path
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Fails the import if the container built anything while importing
+CHECK = (
+    "import server\n"
+    "built = [n for n in vars(server.container) if n not in ('env', 'ready', 'warm_up_error')]\n"
+    "assert not built, f'built at import: {built}'\n"
+)
+
+
+def parse_importtime(stderr: str):
+    """(self_us, cumulative_us, module) rows from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def run_once():
+    env = {k: v for k, v in os.environ.items() if k not in ('MONGO_URL', 'DB_NAME', 'DB_BACKEND', 'METRIC_STORE')}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHECK],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        print('\n'.join(errors[-20:]))
+        return None
+    return parse_importtime(result.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=1500)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args(argv)
+    
+    best = None
+    for _ in range(args.runs):
+        rows = run_once()
+        if rows is None:
+            print('FAIL: importing server failed without MONGO_URL/DB_NAME')
+            return 1
+        total = next(cumulative for _, cumulative, name in rows if name.strip() == 'server')
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+    
+    print(f"slowest imports (cumulative ms, fastest of {args.runs} runs):")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f}  {self_us / 1000:8.1f} self  {name.strip()}")
+    
+    total_ms = total / 1000
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import server took {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        return 1
+    print(f"OK: import server took {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Rows/second for serializing large list responses: the default FastAPI path
+(model per row, response_model validation, jsonable encoding, json.dumps)
+versus utils.fast_json (one pydantic-core validate + dump_json pass).
+
+Usage (from backend/):
+    python -m benchmarks.json_responses [--rows 10000] [--repeat 5]
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from models import MetricSample, RiskEvent
+from utils.fast_json import dump_json
+
+
+def metric_rows(n: int):
+    now = datetime.utcnow()
+    return [{
+        'id': str(uuid.uuid4()),
+        'member_id': 'member-1',
+        'type': 'hrv',
+        'value_num': 42.5 + i % 10,
+        'value_json': None,
+        'unit': 'ms',
+        'source': 'healthkit',
+        'device_account_id': None,
+        'timestamp': now - timedelta(minutes=i),
+        'ingested_at': now,
+    } for i in range(n)]
+
+
+def alert_rows(n: int):
+    now = datetime.utcnow()
+    return [{
+        'id': str(uuid.uuid4()),
+        'member_id': 'member-1',
+        'org_id': 'org-1',
+        'tier': 'yellow',
+        'score': 55.0,
+        'factors': [{'type': 'hrv_drop', 'window_days': 7, 'delta': -0.22, 'severity': 0.6}],
+        'explanation_text': 'HRV is 22% below your baseline.',
+        'status': 'new',
+        'suggested_actions': ['Check in'],
+        'detected_at': now - timedelta(hours=i),
+        'updated_at': now,
+    } for i in range(n)]
+
+
+async def default_path(model, rows) -> bytes:
+    field = create_response_field(name='response', type_=List[model], mode='serialization')
+    content = await serialize_response(field=field, response_content=[model(**row) for row in rows])
+    return JSONResponse(content).body
+
+
+async def fast_path(model, rows) -> bytes:
+    return dump_json(List[model], rows)
+
+
+async def measure(fn, model, rows, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn(model, rows)
+        best = min(best, time.perf_counter() - started)
+    return len(rows) / best
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    for name, model, rows in (
+        ('metrics', MetricSample, metric_rows(args.rows)),
+        ('alerts', RiskEvent, alert_rows(args.rows)),
+    ):
+        # Same bytes either way
+        assert await default_path(model, rows) == await fast_path(model, rows)
+        before = await measure(default_path, model, rows, args.repeat)
+        after = await measure(fast_path, model, rows, args.repeat)
+        print(f"{name:8} {args.rows} rows: default {before:10,.0f} rows/s   fast {after:10,.0f} rows/s   ({after / before:.1f}x)")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Compare the app's launch sequence (/members/me, current-risk, 7-day metrics,
+devices, one after another) with the composite /members/me/home endpoint.
+
+Usage (from backend/):
+    python -m benchmarks.member_home [--requests 200] [--db-latency-ms 2] [--rtt-ms 80]
+
+Runs the app in-process on the in-memory backend. `--db-latency-ms` is added to
+every database operation; `--rtt-ms` is added per HTTP request to model a
+mobile network round trip.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[max(0, int(len(values) * p) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--db-latency-ms', type=float, default=2.0)
+    parser.add_argument('--rtt-ms', type=float, default=0.0)
+    args = parser.parse_args()
+    
+    os.environ['DB_BACKEND'] = 'memory'
+    os.environ['MEMORY_DB_LATENCY_MS'] = str(args.db_latency_ms)
+    logging.disable(logging.WARNING)
+    from fastapi.testclient import TestClient
+    import server
+    
+    with TestClient(server.app) as client:
+        r = client.post('/api/auth/register', json={
+            'email': 'bench@example.com', 'password': 'bench', 'role': 'member', 'org_id': 'bench-org'
+        })
+        headers = {'Authorization': f"Bearer {r.json()['access_token']}"}
+        user_id = r.json()['user']['id']
+        r = client.post('/api/members', headers=headers, json={
+            'user_id': user_id, 'org_id': 'bench-org', 'first_name': 'Bench', 'last_name': 'Member'
+        })
+        member_id = r.json()['id']
+        now = datetime.utcnow()
+        samples = [
+            {'member_id': member_id, 'type': t, 'value_num': 50.0, 'source': 'mock',
+             'timestamp': (now - timedelta(hours=h)).isoformat()}
+            for h in range(7 * 24) for t in ('hrv', 'resting_hr', 'steps', 'sleep_efficiency')
+        ]
+        client.post('/api/metrics/bulk', headers=headers, json={'samples': samples})
+        client.post(f'/api/members/{member_id}/analyze-risk', headers=headers)
+        
+        per_call = {}
+        
+        def get(path):
+            started = time.perf_counter()
+            if args.rtt_ms:
+                time.sleep(args.rtt_ms / 1000)
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, response.text
+            per_call.setdefault(path.split('?')[0], []).append((time.perf_counter() - started) * 1000)
+            return response
+        
+        def sequential():
+            get('/api/members/me')
+            get(f'/api/members/{member_id}/current-risk')
+            get(f'/api/members/{member_id}/metrics?days=7')
+            get(f'/api/members/{member_id}/devices')
+        
+        def composite():
+            get('/api/members/me/home')
+        
+        for name, flow in (('sequential (4 calls)', sequential), ('composite /home', composite)):
+            flow()  # warm caches
+            timings = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                flow()
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"{name:22} p50 {statistics.median(timings):7.2f} ms   p95 {percentile(timings, 0.95):7.2f} ms")
+        
+        slowest = max((p for p in per_call if not p.endswith('/home')), key=lambda p: percentile(per_call[p], 0.95))
+        print(f"slowest single call    p95 {percentile(per_call[slowest], 0.95):7.2f} ms ({slowest.replace(member_id, '{id}')})")
+        
+        size = len(get('/api/members/me/home').content)
+        raw = len(get(f'/api/members/{member_id}/metrics?days=7').content)
+        print(f"payload: home {size / 1024:.1f} KiB vs raw 7-day metrics alone {raw / 1024:.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
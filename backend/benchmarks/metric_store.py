@@ -0,0 +1,112 @@
+"""
+Compare metric ingest and range-query throughput across storage backends.
+
+Usage (from backend/):
+    python -m benchmarks.metric_store [--members 50] [--days 30] [--queries 500]
+
+Always runs the in-memory and SQLite backends; MongoDB is included when
+MONGO_URL is set (a throwaway `aegis_bench` database is used and dropped).
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from repositories.metric_repository import MetricRepository
+from repositories.memory import InMemoryClient
+from repositories.sqlite_store import SQLiteDatabase
+
+METRIC_TYPES = ['hrv', 'resting_hr', 'steps', 'sleep_efficiency']
+
+
+def generate_samples(members: int, days: int, per_day: int):
+    now = datetime.utcnow()
+    for m in range(members):
+        member_id = f"member-{m}"
+        for d in range(days):
+            for i in range(per_day):
+                for metric_type in METRIC_TYPES:
+                    yield {
+                        'id': str(uuid.uuid4()),
+                        'member_id': member_id,
+                        'type': metric_type,
+                        'value_num': random.random() * 100,
+                        'source': 'bench',
+                        'timestamp': now - timedelta(days=d, minutes=i * (1440 // per_day)),
+                        'ingested_at': now,
+                    }
+
+
+async def run(name: str, db, args) -> dict:
+    repo = MetricRepository(db)
+    await repo.create_indexes()
+    samples = list(generate_samples(args.members, args.days, args.per_day))
+    
+    started = time.perf_counter()
+    for i in range(0, len(samples), args.batch):
+        await repo.bulk_create(samples[i:i + args.batch])
+    ingest_s = time.perf_counter() - started
+    
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    rows = 0
+    for _ in range(args.queries):
+        member_id = f"member-{random.randrange(args.members)}"
+        docs = await repo.find_by_member_and_type(
+            member_id, random.choice(METRIC_TYPES), now - timedelta(days=7), now
+        )
+        rows += len(docs)
+    query_s = time.perf_counter() - started
+    
+    return {
+        'backend': name,
+        'samples': len(samples),
+        'ingest_per_s': round(len(samples) / ingest_s),
+        'queries_per_s': round(args.queries / query_s),
+        'avg_rows': round(rows / args.queries, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--per-day', type=int, default=24)
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+    
+    results = [await run('memory', InMemoryClient()['bench'], args)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteDatabase(os.path.join(tmp, 'metrics.db'))
+        try:
+            results.append(await run('sqlite', store, args))
+        finally:
+            store.close()
+    
+    if os.environ.get('MONGO_URL'):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        await client.drop_database('aegis_bench')
+        try:
+            results.append(await run('mongo', client['aegis_bench'], args))
+        finally:
+            await client.drop_database('aegis_bench')
+            client.close()
+    
+    print(f"{'backend':<8} {'samples':>8} {'ingest/s':>10} {'queries/s':>10} {'avg rows':>9}")
+    for r in results:
+        print(f"{r['backend']:<8} {r['samples']:>8} {r['ingest_per_s']:>10} {r['queries_per_s']:>10} {r['avg_rows']:>9}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
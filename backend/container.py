@@ -0,0 +1,260 @@
+"""
+Application dependencies, built on first use.
+
+Constructing a Container reads nothing from the environment and opens no
+connections, so importing server.py is cheap and needs no MONGO_URL. Each
+dependency is a cached_property: the first access builds it (and whatever it
+depends on), later accesses are plain attribute reads.
+"""
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+import asyncio
+import logging
+import os
+
+from repositories import (
+    UserRepository, MemberRepository, MetricRepository,
+    RiskRepository, ConsentRepository, DeviceRepository, OrganizationRepository, MemberStatusRepository,
+    NotificationOutboxRepository, AuditLogRepository,
+    ensure_indexes, query_monitor
+)
+from repositories.caregiver_repository import CaregiverRepository, CaregiverMemberRepository
+from services import (
+    AuthService, MemberService, MetricService, RiskService, AlertHub, InProcessBroker,
+    NotificationDispatcher, RiskAlertNotifier, PushProvider, StubPushProvider, ExpoPushProvider,
+    CaregiverPermissionIndex, CaregiverInvitationService, SyncService, ConsentSnapshotCache,
+    AuditLogger
+)
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+
+
+class Container:
+    """
+    Lazily constructed repositories and services for one app instance.
+    `env` defaults to os.environ (read when a dependency is first built).
+    """
+    
+    def __init__(self, env: Optional[Mapping[str, str]] = None):
+        self.env = os.environ if env is None else env
+        self.ready = False
+        self.warm_up_error: Optional[str] = None
+    
+    def built(self, name: str) -> bool:
+        """True if the named dependency has been constructed"""
+        return name in self.__dict__
+    
+    # ----- databases -----
+    
+    @cached_property
+    def client(self) -> Any:
+        # DB_BACKEND=memory runs without MongoDB for local load tests
+        if self.env.get('DB_BACKEND') == 'memory':
+            from repositories.memory import InMemoryClient
+            return InMemoryClient(latency_ms=float(self.env.get('MEMORY_DB_LATENCY_MS', '0')))
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(self.env['MONGO_URL'], event_listeners=[query_monitor])
+    
+    @cached_property
+    def db(self) -> Any:
+        if self.env.get('DB_BACKEND') == 'memory':
+            return self.client[self.env.get('DB_NAME', 'aegis')]
+        return self.client[self.env['DB_NAME']]
+    
+    @cached_property
+    def metric_db(self) -> Any:
+        # Time-series store (METRIC_STORE=sqlite keeps metrics and risk events in an embedded file)
+        if self.env.get('METRIC_STORE') == 'sqlite':
+            from repositories.sqlite_store import SQLiteDatabase
+            return SQLiteDatabase(self.env.get('SQLITE_PATH', str(ROOT_DIR / 'metrics.db')))
+        return self.db
+    
+    # ----- repositories -----
+    
+    @cached_property
+    def user_repo(self) -> UserRepository:
+        return UserRepository(self.db)
+    
+    @cached_property
+    def member_repo(self) -> MemberRepository:
+        return MemberRepository(self.db)
+    
+    @cached_property
+    def metric_repo(self) -> MetricRepository:
+        return MetricRepository(self.metric_db)
+    
+    @cached_property
+    def risk_repo(self) -> RiskRepository:
+        return RiskRepository(self.metric_db)
+    
+    @cached_property
+    def consent_repo(self) -> ConsentRepository:
+        return ConsentRepository(self.db)
+    
+    @cached_property
+    def device_repo(self) -> DeviceRepository:
+        return DeviceRepository(self.db)
+    
+    @cached_property
+    def org_repo(self) -> OrganizationRepository:
+        return OrganizationRepository(self.db)
+    
+    @cached_property
+    def status_repo(self) -> MemberStatusRepository:
+        return MemberStatusRepository(self.db)
+    
+    @cached_property
+    def outbox_repo(self) -> NotificationOutboxRepository:
+        return NotificationOutboxRepository(
+            self.db, retention_days=int(self.env.get('OUTBOX_RETENTION_DAYS', '30'))
+        )
+    
+    @cached_property
+    def caregiver_repo(self) -> CaregiverRepository:
+        return CaregiverRepository(self.db)
+    
+    @cached_property
+    def caregiver_member_repo(self) -> CaregiverMemberRepository:
+        return CaregiverMemberRepository(self.db)
+    
+    @cached_property
+    def audit_repo(self) -> AuditLogRepository:
+        return AuditLogRepository(self.db, retention_days=int(self.env.get('AUDIT_RETENTION_DAYS', '2190')))
+    
+    @property
+    def repositories(self) -> List[Any]:
+        """Repositories whose declared indexes are built at startup or by manage_indexes.py"""
+        return [
+            self.user_repo, self.member_repo, self.metric_repo, self.risk_repo,
+            self.consent_repo, self.device_repo, self.org_repo, self.status_repo, self.outbox_repo,
+            self.caregiver_repo, self.caregiver_member_repo
+        ]
+    
+    # ----- services -----
+    
+    @cached_property
+    def auth_service(self) -> AuthService:
+        return AuthService(self.user_repo)
+    
+    @cached_property
+    def consent_snapshots(self) -> ConsentSnapshotCache:
+        return ConsentSnapshotCache(
+            self.member_repo, self.consent_repo,
+            ttl_seconds=float(self.env.get('CONSENT_SNAPSHOT_TTL_SECONDS', '60'))
+        )
+    
+    @cached_property
+    def member_service(self) -> MemberService:
+        return MemberService(self.member_repo, self.consent_repo, self.consent_snapshots)
+    
+    @cached_property
+    def metric_service(self) -> MetricService:
+        return MetricService(self.metric_repo, self.status_repo)
+    
+    @cached_property
+    def caregiver_permissions(self) -> CaregiverPermissionIndex:
+        return CaregiverPermissionIndex(
+            self.caregiver_repo, self.caregiver_member_repo,
+            ttl_seconds=float(self.env.get('CAREGIVER_PERMISSION_TTL_SECONDS', '60'))
+        )
+    
+    @cached_property
+    def caregiver_invitations(self) -> CaregiverInvitationService:
+        return CaregiverInvitationService(self.user_repo, self.caregiver_repo, self.caregiver_member_repo)
+    
+    @cached_property
+    def sync_service(self) -> SyncService:
+        return SyncService(
+            self.metric_repo, self.risk_repo, self.consent_repo, self.device_repo,
+            settle_seconds=float(self.env.get('SYNC_SETTLE_SECONDS', '5'))
+        )
+    
+    @cached_property
+    def alert_hub(self) -> AlertHub:
+        # Real-time alert fan-out (swap InProcessBroker for a shared broker when running several workers)
+        return AlertHub(InProcessBroker(), max_queue=int(self.env.get('ALERT_STREAM_MAX_QUEUE', '100')))
+    
+    @cached_property
+    def push_providers(self) -> Dict[str, PushProvider]:
+        # PUSH_DELIVERY=expo sends for real
+        if self.env.get('PUSH_DELIVERY') == 'expo':
+            return {'expo': ExpoPushProvider(access_token=self.env.get('EXPO_ACCESS_TOKEN'))}
+        return {'expo': StubPushProvider()}
+    
+    @cached_property
+    def notification_dispatcher(self) -> NotificationDispatcher:
+        return NotificationDispatcher(
+            self.outbox_repo, self.org_repo, self.push_providers,
+            poll_interval=float(self.env.get('PUSH_POLL_SECONDS', '2')),
+            max_attempts=int(self.env.get('PUSH_MAX_ATTEMPTS', '5'))
+        )
+    
+    @cached_property
+    def risk_notifier(self) -> RiskAlertNotifier:
+        return RiskAlertNotifier(
+            self.notification_dispatcher, self.user_repo, self.member_repo,
+            self.caregiver_repo, self.caregiver_member_repo, self.consent_snapshots
+        )
+    
+    @cached_property
+    def risk_service(self) -> RiskService:
+        return RiskService(self.risk_repo, self.metric_repo, self.status_repo, self.alert_hub, self.risk_notifier)
+    
+    @cached_property
+    def audit_logger(self) -> AuditLogger:
+        # Queued in memory, written in background batches, spilled to disk while MongoDB is down
+        return AuditLogger(
+            self.audit_repo,
+            spill_path=self.env.get('AUDIT_SPILL_PATH', str(ROOT_DIR / 'audit_spill.jsonl')),
+            max_queue=int(self.env.get('AUDIT_MAX_QUEUE', '10000')),
+            batch_size=int(self.env.get('AUDIT_BATCH_SIZE', '500')),
+            flush_interval=float(self.env.get('AUDIT_FLUSH_SECONDS', '1'))
+        )
+    
+    # ----- lifecycle -----
+    
+    async def start(self):
+        """Start background workers (no database round trips)"""
+        query_monitor.attach(self.db)
+        await self.alert_hub.start()
+        self.notification_dispatcher.start()
+        self.audit_logger.start()
+    
+    async def warm_up(self, prime_limit: int = 1000):
+        """
+        Connect the pool and prime caches; sets `ready`. Raises if the database
+        is unreachable (the caller retries).
+        """
+        await self.db.command('ping')
+        if self.env.get('METRIC_STORE') == 'sqlite':
+            # Opening the file and creating tables is blocking I/O
+            await asyncio.to_thread(lambda: self.metric_db)
+        
+        # Organizations are few and read on most alert paths
+        orgs = await self.org_repo.find_many({}, limit=prime_limit)
+        await self.org_repo.prime(orgs)
+        
+        self.ready = True
+        self.warm_up_error = None
+        logger.info(f"Warm-up complete ({len(orgs)} organizations cached)")
+    
+    async def build_indexes(self, apply: bool = True) -> List[Dict[str, Any]]:
+        """Index drift reports for all repositories, building missing indexes if `apply`"""
+        return await ensure_indexes(self.repositories, apply=apply)
+    
+    async def close(self):
+        """Stop workers and close connections; dependencies never built are skipped"""
+        self.ready = False
+        if self.built('alert_hub'):
+            await self.alert_hub.close()
+        if self.built('notification_dispatcher'):
+            await self.notification_dispatcher.stop()
+        if self.built('audit_logger'):
+            await self.audit_logger.stop()
+        if self.built('metric_db') and self.metric_db is not self.db:
+            self.metric_db.close()
+        if self.built('client'):
+            self.client.close()
@@ -0,0 +1,39 @@
+"""
+Check or build MongoDB indexes declared by the repositories.
+
+Usage:
+    python manage_indexes.py          # report drift only
+    python manage_indexes.py --apply  # build missing indexes
+
+Deploys that run `--apply` as a release step can set INDEX_BUILD=off on the
+API so instances skip their own background build after warm-up.
+"""
+import asyncio
+import json
+import sys
+from dotenv import load_dotenv
+from pathlib import Path
+
+from container import Container
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+async def main(apply: bool) -> int:
+    container = Container()
+    reports = await container.build_indexes(apply=apply)
+    await container.close()
+    
+    print(json.dumps(reports, indent=2))
+    
+    # Non-zero exit when anything is still missing or failed, for CI/deploy gates
+    outstanding = [
+        r for r in reports
+        if r['errors'] or r['mismatched'] or set(r['missing']) - set(r['created'])
+    ]
+    return 1 if outstanding else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(apply='--apply' in sys.argv)))
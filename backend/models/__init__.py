@@ -1,10 +1,15 @@
 from .user import User, UserRole, UserCreate, UserLogin, UserResponse
 from .organization import Organization, OrganizationCreate
 from .member import Member, MemberCreate, MemberResponse
-from .caregiver import Caregiver, CaregiverOnMember, CaregiverCreate, CaregiverInvite
+from .caregiver import (
+    Caregiver, CaregiverOnMember, CaregiverCreate, CaregiverInvite,
+    CaregiverBatchInviteEntry, CaregiverBatchInvite
+)
 from .metric_sample import MetricSample, MetricType, MetricSampleCreate, MetricSampleBulkCreate
 from .risk_event import RiskEvent, RiskTier, RiskFactor, RiskEventCreate, RiskEventUpdate, RiskEventResponse
+from .member_status import MemberStatus
 from .consent import Consent, ConsentType, ConsentCreate
+from .caregiver_note import PushNotificationLog
 from .audit_log import AuditLog, AuditAction
 from .device_account import DeviceAccount, DeviceType, DeviceAccountCreate
 
@@ -23,6 +28,8 @@ __all__ = [
     'CaregiverOnMember',
     'CaregiverCreate',
     'CaregiverInvite',
+    'CaregiverBatchInviteEntry',
+    'CaregiverBatchInvite',
     'MetricSample',
     'MetricType',
     'MetricSampleCreate',
@@ -33,9 +40,11 @@ __all__ = [
     'RiskEventCreate',
     'RiskEventUpdate',
     'RiskEventResponse',
+    'MemberStatus',
     'Consent',
     'ConsentType',
     'ConsentCreate',
+    'PushNotificationLog',
     'AuditLog',
     'AuditAction',
     'DeviceAccount',
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 import uuid
 
@@ -51,3 +51,14 @@ class CaregiverInvite(BaseModel):
     first_name: str
     last_name: str
     relationship: Optional[str] = None
+
+
+class CaregiverBatchInviteEntry(BaseModel):
+    email: str
+    first_name: str
+    last_name: str
+    relationship: Optional[str] = None
+
+
+class CaregiverBatchInvite(BaseModel):
+    invites: List[CaregiverBatchInviteEntry] = Field(..., min_length=1, max_length=500)
@@ -43,10 +43,18 @@ class PushNotificationLog(BaseModel):
     # Type
     notification_type: str  # "risk_alert", "caregiver_invite", "general"
     
+    # Delivery
+    provider: Optional[str] = None  # Push provider key, e.g. "expo"
+    org_id: Optional[str] = None  # Quiet hours apply per organization
+    
     # Status
-    status: str = "pending"  # "pending", "sent", "failed"
+    status: str = "pending"  # "pending", "sending", "sent", "failed"
     error_message: Optional[str] = None
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)  # Deferred by quiet hours/backoff
+    claimed_until: Optional[datetime] = None  # Lease held by a dispatcher while sending
     
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     sent_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None  # Sent or failed; the row expires after retention
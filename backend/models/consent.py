@@ -30,6 +30,7 @@ class Consent(BaseModel):
     # Timestamps
     granted_at: datetime = Field(default_factory=datetime.utcnow)
     revoked_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Config:
         use_enum_values = True
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+from .risk_event import RiskTier
+
+
+class MemberStatus(BaseModel):
+    """Materialized current state of a member, one document per member"""
+    member_id: str
+    org_id: Optional[str] = None  # Unknown until the first analysis if samples arrive first
+    
+    # Current risk (from the most recent risk event)
+    tier: Optional[RiskTier] = None
+    score: Optional[float] = None
+    latest_event: Optional[Dict[str, Any]] = None  # Copy of the latest RiskEvent
+    open_alert_id: Optional[str] = None  # Latest event if it still needs attention
+    
+    # Activity
+    last_analysis_at: Optional[datetime] = None
+    last_sample_at: Optional[datetime] = None
+    
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        use_enum_values = True
@@ -46,6 +46,7 @@ class RiskEvent(BaseModel):
     detected_at: datetime = Field(default_factory=datetime.utcnow)
     acknowledged_at: Optional[datetime] = None
     resolved_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
     
     # Metadata
     metadata: Optional[Dict[str, Any]] = None
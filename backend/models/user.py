@@ -29,6 +29,10 @@ class User(BaseModel):
     last_name: Optional[str] = None
     phone: Optional[str] = None
     
+    # Push notifications
+    push_token: Optional[str] = None
+    push_provider: Optional[str] = None  # "expo"
+    
     # Security
     is_active: bool = True
     is_verified: bool = False
@@ -1,17 +1,41 @@
 from .base import BaseRepository
+from .indexes import IndexSpec, ensure_indexes, index_drift
+from .instrumentation import QueryMonitor, query_metrics, query_monitor
+from .pagination import InvalidCursor
+from .cache import CacheBackend, InMemoryCacheBackend, cached_repository, cache_stats, set_cache_backend
 from .user_repository import UserRepository
 from .member_repository import MemberRepository
 from .metric_repository import MetricRepository
 from .risk_repository import RiskRepository
 from .consent_repository import ConsentRepository
 from .device_repository import DeviceRepository
+from .organization_repository import OrganizationRepository
+from .member_status_repository import MemberStatusRepository
+from .notification_repository import NotificationOutboxRepository
+from .audit_repository import AuditLogRepository
 
 __all__ = [
     'BaseRepository',
+    'IndexSpec',
+    'ensure_indexes',
+    'index_drift',
+    'QueryMonitor',
+    'query_metrics',
+    'query_monitor',
+    'InvalidCursor',
+    'CacheBackend',
+    'InMemoryCacheBackend',
+    'cached_repository',
+    'cache_stats',
+    'set_cache_backend',
     'UserRepository',
     'MemberRepository',
     'MetricRepository',
     'RiskRepository',
     'ConsentRepository',
     'DeviceRepository',
+    'OrganizationRepository',
+    'MemberStatusRepository',
+    'NotificationOutboxRepository',
+    'AuditLogRepository',
 ]
@@ -0,0 +1,112 @@
+from .base import BaseRepository
+from .indexes import IndexSpec
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+from collections import defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Duplicate key: the event was already written (e.g. a replayed batch)
+_DUPLICATE_KEY = 11000
+
+
+class AuditLogRepository(BaseRepository):
+    """
+    Append-only audit events (AuditLog documents), partitioned by month into
+    `audit_log_YYYYMM` collections. Each partition has a TTL index on
+    `timestamp`, and whole partitions past the retention period are dropped,
+    which is far cheaper than TTL-deleting them document by document.
+    """
+    
+    PREFIX = 'audit_log_'
+    
+    indexes = [
+        IndexSpec([('id', 1)], unique=True),
+        IndexSpec([('user_id', 1), ('timestamp', -1)]),
+        IndexSpec([('resource_type', 1), ('resource_id', 1), ('timestamp', -1)]),
+        IndexSpec([('org_id', 1), ('timestamp', -1)]),
+    ]
+    
+    def __init__(self, db: AsyncIOMotorDatabase, retention_days: int = 365):
+        super().__init__(db, self.partition_name(datetime.utcnow()))
+        self.retention_days = retention_days
+        self._indexed = set()
+    
+    @classmethod
+    def partition_name(cls, timestamp: datetime) -> str:
+        return f"{cls.PREFIX}{timestamp:%Y%m}"
+    
+    def declared_indexes(self) -> List[IndexSpec]:
+        ttl = IndexSpec([('timestamp', 1)], expire_after_seconds=self.retention_days * 86400)
+        return list(self.indexes) + [ttl]
+    
+    async def _ensure_partition(self, name: str):
+        if name in self._indexed:
+            return
+        collection = self.db[name]
+        for spec in self.declared_indexes():
+            await collection.create_index(spec.keys, **spec.options())
+        self._indexed.add(name)
+    
+    async def insert_batch(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Write events to their monthly partitions with unordered bulk inserts.
+        Events already present (same `id`) count as written, so a batch can be
+        retried safely. Returns the number of events written.
+        """
+        partitions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for event in events:
+            partitions[self.partition_name(event['timestamp'])].append(event)
+        
+        written = 0
+        for name, docs in partitions.items():
+            await self._ensure_partition(name)
+            try:
+                await self.db[name].insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                if any(err.get('code') != _DUPLICATE_KEY for err in e.details.get('writeErrors', [])):
+                    raise
+            except DuplicateKeyError:
+                pass
+            finally:
+                for doc in docs:
+                    doc.pop('_id', None)
+            written += len(docs)
+        return written
+    
+    async def find_recent(
+        self,
+        query: Dict[str, Any],
+        since: datetime,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Events matching `query` since `since`, newest first, across partitions"""
+        results: List[Dict[str, Any]] = []
+        month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        floor = since.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        while month >= floor and len(results) < limit:
+            cursor = self.db[self.partition_name(month)].find(
+                {**query, 'timestamp': {'$gte': since}}
+            ).sort('timestamp', -1).limit(limit - len(results))
+            docs = await cursor.to_list(length=limit - len(results))
+            for doc in docs:
+                doc.pop('_id', None)
+            results.extend(docs)
+            month = (month - timedelta(days=1)).replace(day=1)
+        return results
+    
+    async def drop_expired_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """Drop monthly partitions whose newest possible event is past retention"""
+        cutoff = self.partition_name((now or datetime.utcnow()) - timedelta(days=self.retention_days))
+        dropped = []
+        for name in await self.db.list_collection_names():
+            if name.startswith(self.PREFIX) and name[len(self.PREFIX):].isdigit() and name < cutoff:
+                await self.db[name].drop()
+                self._indexed.discard(name)
+                dropped.append(name)
+        if dropped:
+            logger.info(f"Dropped expired audit partitions: {dropped}")
+        return dropped
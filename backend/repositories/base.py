@@ -1,6 +1,11 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Optional, List, Dict, Any, TypeVar, Generic
+from pymongo import ReturnDocument
+from typing import Optional, List, Dict, Any, Tuple, TypeVar, Generic
 from datetime import datetime
+from .indexes import IndexSpec
+from .loader import current_loader
+from .pagination import decode_cursor, keyset_filter, page_cursor
+from .instrumentation import instrument_class
 
 T = TypeVar('T')
 
@@ -11,18 +16,52 @@ class BaseRepository(Generic[T]):
     This pattern allows future migration to PostgreSQL without changing business logic.
     """
     
+    # Indexes required by this repository's query patterns (in addition to `id`)
+    indexes: List[IndexSpec] = []
+    
+    # Route find_by_id through the request-scoped loader (batched + memoized)
+    batch_loads: bool = False
+    
+    # Field stamped on every insert and update, for change feeds (find_changes)
+    SYNC_FIELD: str = 'updated_at'
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Time every public query method, including subclass finders
+        instrument_class(cls)
+    
     def __init__(self, db: AsyncIOMotorDatabase, collection_name: str):
         self.db = db
         self.collection = db[collection_name]
     
+    def declared_indexes(self) -> List[IndexSpec]:
+        """All indexes this repository expects, including the `id` lookup index"""
+        return [IndexSpec([('id', 1)])] + list(self.indexes)
+    
+    async def create_indexes(self):
+        """Create declared indexes (background build)"""
+        for spec in self.declared_indexes():
+            await self.collection.create_index(spec.keys, **spec.options())
+    
     async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new document"""
         result = await self.collection.insert_one(data)
         data['_id'] = str(result.inserted_id)
         return data
     
+    async def create_many(self, docs: List[Dict[str, Any]], session: Any = None) -> List[Dict[str, Any]]:
+        """Create documents in one ordered insert, optionally inside a transaction session"""
+        if docs:
+            await self.collection.insert_many(docs, ordered=True, session=session)
+            for doc in docs:
+                doc.pop('_id', None)
+        return docs
+    
     async def find_by_id(self, id: str) -> Optional[Dict[str, Any]]:
         """Find document by ID"""
+        loader = current_loader() if self.batch_loads else None
+        if loader is not None:
+            return await loader.load(self, id)
         doc = await self.collection.find_one({'id': id})
         if doc:
             doc.pop('_id', None)
@@ -43,22 +82,155 @@ class BaseRepository(Generic[T]):
             doc.pop('_id', None)
         return docs
     
-    async def update(self, id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Update document by ID"""
+    async def find_page(
+        self,
+        query: Dict[str, Any],
+        sort: List[Tuple[str, int]],
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Keyset-paginated find. `sort` must end in a unique field (normally `id`) and
+        should match an index prefixed by the equality fields of `query`, so every
+        page is an index seek regardless of depth.
+        Returns (docs, next_cursor); next_cursor is None on the last page.
+        Raises InvalidCursor for a malformed cursor.
+        """
+        if cursor:
+            after = keyset_filter(sort, decode_cursor(cursor, len(sort)))
+            query = {**query, **after} if '$or' not in query else {'$and': [query, after]}
+        results = self.collection.find(query).sort(sort).limit(limit + 1)
+        docs = await results.to_list(length=limit + 1)
+        for doc in docs:
+            doc.pop('_id', None)
+        return docs[:limit], page_cursor(docs, sort, limit)
+    
+    async def find_changes(
+        self,
+        query: Dict[str, Any],
+        after: Tuple[datetime, str],
+        until: datetime,
+        limit: int = 1000
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Documents matching `query` changed after the position `after`
+        ((SYNC_FIELD value, id) of the last document already seen) and no later
+        than `until`, oldest change first. Returns (docs, has_more).
+        Needs an index on the equality fields of `query` + (SYNC_FIELD, id).
+        """
+        sort = [(self.SYNC_FIELD, 1), ('id', 1)]
+        query = {'$and': [query, {self.SYNC_FIELD: {'$lte': until}}, keyset_filter(sort, list(after))]}
+        results = self.collection.find(query).sort(sort).limit(limit + 1)
+        docs = await results.to_list(length=limit + 1)
+        for doc in docs:
+            doc.pop('_id', None)
+        return docs[:limit], len(docs) > limit
+    
+    async def max_value(self, query: Dict[str, Any], field: str, direction: int = -1) -> Any:
+        """
+        Largest (direction=-1) or smallest (1) value of `field` among documents
+        matching `query`, or None. An index on query fields + `field` makes this one index seek.
+        """
+        cursor = self.collection.find(query, {field: 1, '_id': 0}).sort(field, direction).limit(1)
+        docs = await cursor.to_list(length=1)
+        return docs[0].get(field) if docs else None
+    
+    async def find_by_ids(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Find documents for many IDs in one query. Returns {id: doc}; unknown IDs are absent."""
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return {}
+        cursor = self.collection.find({'id': {'$in': unique_ids}})
+        docs = await cursor.to_list(length=len(unique_ids))
+        result = {}
+        for doc in docs:
+            doc.pop('_id', None)
+            result[doc['id']] = doc
+        return result
+    
+    async def find_with_lookup(
+        self,
+        query: Dict[str, Any],
+        from_collection: str,
+        local_field: str,
+        as_field: str,
+        foreign_field: str = 'id',
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find documents and join one related document from another collection
+        server-side ($lookup). Documents without a match are dropped.
+        """
+        pipeline = [
+            {'$match': query},
+            {'$limit': limit},
+            {'$lookup': {
+                'from': from_collection,
+                'localField': local_field,
+                'foreignField': foreign_field,
+                'as': as_field
+            }},
+            {'$unwind': f'${as_field}'},
+            {'$project': {'_id': 0, f'{as_field}._id': 0}},
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=limit)
+    
+    async def update(
+        self,
+        id: str,
+        data: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update document by ID in a single round trip.
+        Returns the updated document (optionally projected), or None if no document has this ID.
+        """
+        return await self.update_where(id, {}, data, projection=projection)
+    
+    async def update_where(
+        self,
+        id: str,
+        conditions: Dict[str, Any],
+        data: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update document by ID only if it also matches `conditions`
+        (e.g. {'status': 'new'}). Returns the updated document, or None if nothing matched.
+        """
         data['updated_at'] = datetime.utcnow()
-        result = await self.collection.update_one(
-            {'id': id},
-            {'$set': data}
+        self._forget(id)
+        return await self.collection.find_one_and_update(
+            {**conditions, 'id': id},
+            {'$set': data},
+            projection={**(projection or {}), '_id': 0},
+            return_document=ReturnDocument.AFTER
         )
-        if result.modified_count:
-            return await self.find_by_id(id)
-        return None
     
-    async def delete(self, id: str) -> bool:
-        """Delete document by ID"""
-        result = await self.collection.delete_one({'id': id})
+    async def delete(self, id: str, session: Any = None) -> bool:
+        """Delete document by ID, optionally inside a transaction session"""
+        self._forget(id)
+        result = await self.collection.delete_one({'id': id}, session=session)
         return result.deleted_count > 0
     
+    async def delete_many(self, query: Dict[str, Any], session: Any = None) -> int:
+        """Delete all documents matching query, optionally inside a transaction session"""
+        self._forget()
+        result = await self.collection.delete_many(query, session=session)
+        return result.deleted_count
+    
+    async def invalidate(self, id: str):
+        """Drop any cached or request-memoized copy of a document"""
+        self._forget(id)
+    
+    def _forget(self, id: Optional[str] = None):
+        loader = current_loader()
+        if loader is not None:
+            loader.forget(self.collection.name, id)
+    
     async def count(self, query: Dict[str, Any] = {}) -> int:
         """Count documents matching query"""
         return await self.collection.count_documents(query)
+
+
+instrument_class(BaseRepository)
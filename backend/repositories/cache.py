@@ -0,0 +1,171 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List
+from collections import defaultdict
+import asyncio
+import functools
+
+from utils.cache import TTLCache
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface for the repository read-through cache.
+    Implement this over Redis/Memcached to share entries between workers.
+    """
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: float):
+        ...
+    
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU+TTL backend"""
+    
+    def __init__(self, max_size: int = 50000):
+        self._cache = TTLCache(max_size=max_size)
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+    
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: float):
+        self._cache.set(key, value, ttl_seconds=ttl_seconds)
+    
+    async def delete(self, key: str):
+        self._cache.invalidate(key)
+
+
+_default_backend: CacheBackend = InMemoryCacheBackend()
+_collection_stats: Dict[str, Dict[str, int]] = defaultdict(
+    lambda: {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0}
+)
+
+
+def set_cache_backend(backend: CacheBackend):
+    """Replace the backend used by cached repositories without an explicit one"""
+    global _default_backend
+    _default_backend = backend
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-collection hit ratios"""
+    report = {}
+    for collection, counters in _collection_stats.items():
+        lookups = counters['hits'] + counters['misses']
+        report[collection] = {
+            **counters,
+            'hit_ratio': round(counters['hits'] / lookups, 4) if lookups else 0.0,
+        }
+    return report
+
+
+def cached_repository(ttl_seconds: float = 300, backend: Optional[CacheBackend] = None):
+    """
+    Class decorator adding a read-through cache to a repository's find_by_id.
+    
+    Entries are invalidated by update/update_where/delete/delete_many on the same
+    repository; subclass methods that write through `self.collection` directly
+    must call `await self.invalidate(id)`. Concurrent misses for the same ID share
+    one database read (single-flight).
+    """
+    def decorate(cls):
+        find_by_id = cls.find_by_id
+        update_where = cls.update_where
+        delete = cls.delete
+        delete_many = cls.delete_many
+        
+        def _backend() -> CacheBackend:
+            return backend or _default_backend
+        
+        def _key(self, id: str) -> str:
+            return f"{self.collection.name}:{id}"
+        
+        def _inflight(self) -> Dict[str, List[Any]]:
+            # key -> [future, stale]; stale is set when invalidated mid-load
+            return self.__dict__.setdefault('_cache_inflight', {})
+        
+        @functools.wraps(find_by_id)
+        async def cached_find_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+            stats = _collection_stats[self.collection.name]
+            key = _key(self, id)
+            
+            doc = await _backend().get(key)
+            if doc is not None:
+                stats['hits'] += 1
+                return dict(doc)
+            stats['misses'] += 1
+            
+            inflight = _inflight(self)
+            if key in inflight:
+                stats['coalesced'] += 1
+                doc = await asyncio.shield(inflight[key][0])
+                return dict(doc) if doc is not None else None
+            
+            entry = inflight[key] = [asyncio.get_running_loop().create_future(), False]
+            try:
+                doc = await find_by_id(self, id)
+                if doc is not None and not entry[1]:
+                    await _backend().set(key, doc, ttl_seconds)
+                entry[0].set_result(doc)
+            except Exception as e:
+                entry[0].set_exception(e)
+                # Waiters re-raise; mark retrieved so an unobserved error isn't logged
+                entry[0].exception()
+                raise
+            finally:
+                inflight.pop(key, None)
+            return dict(doc) if doc is not None else None
+        
+        async def invalidate(self, id: str):
+            """Drop the cached document for this ID"""
+            key = _key(self, id)
+            if key in _inflight(self):
+                _inflight(self)[key][1] = True
+            _collection_stats[self.collection.name]['invalidations'] += 1
+            self._forget(id)
+            await _backend().delete(key)
+        
+        async def prime(self, docs: List[Dict[str, Any]]):
+            """Cache documents loaded elsewhere (e.g. during startup warm-up)"""
+            for doc in docs:
+                await _backend().set(_key(self, doc['id']), doc, ttl_seconds)
+        
+        @functools.wraps(update_where)
+        async def invalidating_update_where(self, id: str, *args, **kwargs):
+            try:
+                return await update_where(self, id, *args, **kwargs)
+            finally:
+                await self.invalidate(id)
+        
+        @functools.wraps(delete)
+        async def invalidating_delete(self, id: str, session: Any = None) -> bool:
+            try:
+                return await delete(self, id, session=session)
+            finally:
+                await self.invalidate(id)
+        
+        @functools.wraps(delete_many)
+        async def invalidating_delete_many(self, query: Dict[str, Any], session: Any = None) -> int:
+            ids = [doc['id'] async for doc in self.collection.find(query, {'id': 1}, session=session) if 'id' in doc]
+            try:
+                return await delete_many(self, query, session=session)
+            finally:
+                for id in ids:
+                    await self.invalidate(id)
+        
+        cls.find_by_id = cached_find_by_id
+        cls.update_where = invalidating_update_where
+        cls.delete = invalidating_delete
+        cls.delete_many = invalidating_delete_many
+        cls.invalidate = invalidate
+        cls.prime = prime
+        return cls
+    
+    return decorate
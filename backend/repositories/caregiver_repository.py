@@ -1,29 +1,126 @@
 from .base import BaseRepository
+from .indexes import IndexSpec
+from .cache import cached_repository
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from datetime import datetime
 
 
+@cached_repository(ttl_seconds=300)
 class CaregiverRepository(BaseRepository):
+    batch_loads = True
+    
+    indexes = [
+        # One caregiver profile per user, even across concurrent invitation batches
+        IndexSpec([('user_id', 1)], unique=True),
+    ]
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'caregivers')
     
     async def find_by_user_id(self, user_id: str) -> Dict[str, Any]:
         """Find caregiver by user ID"""
         return await self.find_one({'user_id': user_id})
+    
+    async def find_by_user_ids(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Find caregivers for many user IDs in one query. Returns {user_id: caregiver}."""
+        unique = list(dict.fromkeys(user_ids))
+        if not unique:
+            return {}
+        caregivers = await self.find_many({'user_id': {'$in': unique}}, limit=len(unique))
+        return {caregiver['user_id']: caregiver for caregiver in caregivers}
 
 
 class CaregiverMemberRepository(BaseRepository):
+    indexes = [
+        IndexSpec([('member_id', 1), ('caregiver_id', 1)]),
+        # Also serves caregiver_id-only lookups; `id` suffix serves keyset pagination
+        IndexSpec([('caregiver_id', 1), ('invitation_status', 1), ('id', 1)]),
+    ]
+    
+    PAGE_SORT = [('id', 1)]
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'caregiver_members')
+        self._access_listeners: List[Callable[[Optional[str]], Any]] = []
+    
+    def on_access_change(self, listener: Callable[[Optional[str]], Any]):
+        """Register a callback invoked with the caregiver ID (None = any) when relationships change"""
+        self._access_listeners.append(listener)
+    
+    def _notify_access_change(self, caregiver_id: Optional[str]):
+        for listener in self._access_listeners:
+            listener(caregiver_id)
+    
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create relationship"""
+        created = await super().create(data)
+        self._notify_access_change(data.get('caregiver_id'))
+        return created
+    
+    async def create_many(self, docs: List[Dict[str, Any]], session: Any = None) -> List[Dict[str, Any]]:
+        """Create relationships in one insert"""
+        created = await super().create_many(docs, session=session)
+        for caregiver_id in {doc.get('caregiver_id') for doc in docs}:
+            self._notify_access_change(caregiver_id)
+        return created
+    
+    async def update_where(
+        self,
+        id: str,
+        conditions: Dict[str, Any],
+        data: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Update relationship (e.g. can_view_* flags) and revoke cached permissions"""
+        updated = await super().update_where(id, conditions, data, projection=projection)
+        if updated is not None:
+            self._notify_access_change(updated.get('caregiver_id'))
+        return updated
+    
+    async def delete(self, id: str) -> bool:
+        """Delete relationship and revoke cached permissions"""
+        self._forget(id)
+        doc = await self.collection.find_one_and_delete({'id': id}, projection={'caregiver_id': 1})
+        if doc is None:
+            return False
+        self._notify_access_change(doc.get('caregiver_id'))
+        return True
+    
+    async def delete_many(self, query: Dict[str, Any], session: Any = None) -> int:
+        """Delete relationships and revoke all cached permissions"""
+        deleted = await super().delete_many(query, session=session)
+        self._notify_access_change(None)
+        return deleted
     
     async def find_by_member(self, member_id: str) -> List[Dict[str, Any]]:
         """Find all caregivers for a member"""
         return await self.find_many({'member_id': member_id})
     
+    async def find_by_member_with_caregivers(self, member_id: str) -> List[Dict[str, Any]]:
+        """Find all caregivers for a member, each joined with its caregiver profile"""
+        return await self.find_with_lookup(
+            {'member_id': member_id},
+            from_collection='caregivers',
+            local_field='caregiver_id',
+            as_field='caregiver'
+        )
+    
     async def find_by_caregiver(self, caregiver_id: str) -> List[Dict[str, Any]]:
         """Find all members for a caregiver"""
         return await self.find_many({'caregiver_id': caregiver_id})
     
+    async def find_accepted_page(
+        self,
+        caregiver_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page of a caregiver's accepted relationships"""
+        return await self.find_page(
+            {'caregiver_id': caregiver_id, 'invitation_status': 'accepted'}, self.PAGE_SORT, limit=limit, cursor=cursor
+        )
+    
     async def find_relationship(self, member_id: str, caregiver_id: str) -> Dict[str, Any]:
         """Find specific member-caregiver relationship"""
         return await self.find_one({
@@ -31,14 +128,32 @@ class CaregiverMemberRepository(BaseRepository):
             'caregiver_id': caregiver_id
         })
     
+    async def count_by_member(self, member_id: str, invitation_status: str = 'accepted') -> int:
+        """Number of caregivers with a relationship in `invitation_status`"""
+        return await self.count({'member_id': member_id, 'invitation_status': invitation_status})
+    
+    async def find_caregiver_ids_for_member(self, member_id: str, caregiver_ids: List[str]) -> List[str]:
+        """Which of `caregiver_ids` already have a relationship with the member"""
+        if not caregiver_ids:
+            return []
+        cursor = self.collection.find(
+            {'member_id': member_id, 'caregiver_id': {'$in': caregiver_ids}},
+            {'caregiver_id': 1}
+        )
+        return [doc['caregiver_id'] for doc in await cursor.to_list(length=len(caregiver_ids))]
+    
     async def accept_invitation(self, relationship_id: str) -> bool:
         """Accept a caregiver invitation"""
-        from datetime import datetime
-        result = await self.collection.update_one(
+        self._forget(relationship_id)
+        doc = await self.collection.find_one_and_update(
             {'id': relationship_id},
             {'$set': {
                 'invitation_status': 'accepted',
                 'accepted_at': datetime.utcnow()
-            }}
+            }},
+            projection={'caregiver_id': 1}
         )
-        return result.modified_count > 0
+        if doc is None:
+            return False
+        self._notify_access_change(doc.get('caregiver_id'))
+        return True
@@ -1,9 +1,16 @@
 from .base import BaseRepository
+from .indexes import IndexSpec
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List, Dict, Any
 
 
 class ConsentRepository(BaseRepository):
+    indexes = [
+        IndexSpec([('member_id', 1), ('granted_at', -1)]),
+        IndexSpec([('member_id', 1), ('consent_type', 1)]),
+        IndexSpec([('member_id', 1), ('updated_at', 1), ('id', 1)]),
+    ]
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'consents')
     
@@ -15,6 +22,34 @@ class ConsentRepository(BaseRepository):
             doc.pop('_id', None)
         return docs
     
+    async def latest_by_members(
+        self,
+        member_ids: List[str],
+        consent_types: List[str]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Most recent consent record of each type for many members in one aggregation
+        (a later record supersedes earlier grants or revocations).
+        Returns {member_id: {consent_type: {'granted', 'revoked_at'}}}.
+        """
+        if not member_ids:
+            return {}
+        rows = await self.collection.aggregate([
+            {'$match': {'member_id': {'$in': member_ids}, 'consent_type': {'$in': consent_types}}},
+            {'$sort': {'member_id': 1, 'granted_at': -1}},
+            {'$group': {
+                '_id': {'member_id': '$member_id', 'consent_type': '$consent_type'},
+                'granted': {'$first': '$granted'},
+                'revoked_at': {'$first': '$revoked_at'},
+            }},
+        ]).to_list(length=None)
+        
+        latest: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for row in rows:
+            key = row.pop('_id')
+            latest.setdefault(key['member_id'], {})[key['consent_type']] = row
+        return latest
+    
     async def find_active_consent(
         self,
         member_id: str,
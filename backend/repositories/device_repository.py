@@ -1,9 +1,17 @@
 from .base import BaseRepository
+from .indexes import IndexSpec
+from .cache import cached_repository
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List, Dict, Any
 
 
+@cached_repository(ttl_seconds=300)
 class DeviceRepository(BaseRepository):
+    indexes = [
+        IndexSpec([('member_id', 1)]),
+        IndexSpec([('member_id', 1), ('updated_at', 1), ('id', 1)]),
+    ]
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'device_accounts')
     
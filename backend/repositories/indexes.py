@@ -0,0 +1,118 @@
+from typing import List, Dict, Any, Tuple, Sequence, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IndexSpec:
+    """
+    Declarative description of a collection index.
+    Repositories list these in their `indexes` attribute.
+    """
+    
+    def __init__(
+        self,
+        keys: Sequence[Tuple[str, int]],
+        unique: bool = False,
+        sparse: bool = False,
+        expire_after_seconds: int = None,
+        name: str = None
+    ):
+        self.keys = [(field, direction) for field, direction in keys]
+        self.unique = unique
+        self.sparse = sparse
+        self.expire_after_seconds = expire_after_seconds
+        # Same naming scheme MongoDB uses, so pre-existing indexes match
+        self.name = name or '_'.join(f"{field}_{direction}" for field, direction in self.keys)
+    
+    @property
+    def fields(self) -> List[str]:
+        return [field for field, _ in self.keys]
+    
+    def options(self) -> Dict[str, Any]:
+        """Keyword arguments for create_index"""
+        options = {'name': self.name, 'background': True}
+        if self.unique:
+            options['unique'] = True
+        if self.sparse:
+            options['sparse'] = True
+        if self.expire_after_seconds is not None:
+            options['expireAfterSeconds'] = self.expire_after_seconds
+        return options
+    
+    def covers(self, equality_fields: Iterable[str], sort_fields: Sequence[str] = ()) -> bool:
+        """
+        True if a query with the given equality fields (and optional sort/range
+        fields, in order) can be served from this index without a collection scan.
+        """
+        equality = set(equality_fields)
+        fields = self.fields
+        prefix = fields[:len(equality)]
+        if set(prefix) != equality:
+            return False
+        rest = fields[len(equality):]
+        return list(sort_fields) == rest[:len(sort_fields)]
+    
+    def __repr__(self) -> str:
+        return f"IndexSpec({self.name})"
+
+
+def _live_key(info: Dict[str, Any]) -> Tuple[Tuple[str, int], ...]:
+    return tuple((field, int(direction)) for field, direction in info['key'])
+
+
+async def index_drift(repository) -> Dict[str, Any]:
+    """
+    Compare a repository's declared indexes with the live index_information().
+    """
+    live = await repository.collection.index_information()
+    live_by_key = {_live_key(info): (name, info) for name, info in live.items() if name != '_id_'}
+    declared = repository.declared_indexes()
+    declared_keys = {tuple(spec.keys) for spec in declared}
+    
+    missing, mismatched = [], []
+    for spec in declared:
+        entry = live_by_key.get(tuple(spec.keys))
+        if entry is None:
+            missing.append(spec.name)
+        elif bool(entry[1].get('unique')) != spec.unique:
+            mismatched.append(spec.name)
+    
+    unexpected = [name for key, (name, _) in live_by_key.items() if key not in declared_keys]
+    
+    return {
+        'collection': repository.collection.name,
+        'missing': missing,
+        'mismatched': mismatched,
+        'unexpected': unexpected,
+    }
+
+
+async def ensure_indexes(repositories: Iterable[Any], apply: bool = True) -> List[Dict[str, Any]]:
+    """
+    Report index drift for each repository and, if `apply`, build missing indexes.
+    Build failures (e.g. duplicate keys on a unique index) are logged and reported,
+    never raised, so this is safe to run as a background startup task.
+    """
+    reports = []
+    for repository in repositories:
+        report = await index_drift(repository)
+        report['created'] = []
+        report['errors'] = {}
+        
+        if apply and report['missing']:
+            for spec in repository.declared_indexes():
+                if spec.name not in report['missing']:
+                    continue
+                try:
+                    await repository.collection.create_index(spec.keys, **spec.options())
+                    report['created'].append(spec.name)
+                except Exception as e:
+                    report['errors'][spec.name] = str(e)
+                    logger.error(f"Failed to build index {report['collection']}.{spec.name}: {e}")
+        
+        for field in ('mismatched', 'unexpected'):
+            if report[field]:
+                logger.warning(f"Index drift on {report['collection']} ({field}): {report[field]}")
+        reports.append(report)
+    return reports
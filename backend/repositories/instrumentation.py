@@ -0,0 +1,242 @@
+from contextvars import ContextVar
+from pymongo import monitoring
+from typing import Optional, Dict, Any, Tuple
+import asyncio
+import bisect
+import functools
+import inspect
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Latency bucket upper bounds in milliseconds
+BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+    
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+    
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket containing the p-th percentile"""
+        if not self.count:
+            return None
+        threshold = self.count * p
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= threshold:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': dict(zip([str(b) for b in BUCKETS_MS] + ['inf'], self.counts)),
+        }
+
+
+class QueryMetrics:
+    """Latency histograms keyed by (source, collection, operation)"""
+    
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self.collscans = 0
+    
+    def observe(self, source: str, collection: str, operation: str, ms: float):
+        key = (source, collection, operation)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(ms)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {'collscans_sampled': self.collscans}
+        with self._lock:
+            for (source, collection, operation), histogram in sorted(self._histograms.items()):
+                report.setdefault(source, {}).setdefault(collection, {})[operation] = histogram.snapshot()
+        return report
+
+
+query_metrics = QueryMetrics()
+
+
+def instrument_class(cls):
+    """Wrap every public coroutine method defined on cls with latency timing"""
+    for name, fn in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.iscoroutinefunction(fn):
+            continue
+        if getattr(fn, '__instrumented__', False):
+            continue
+        setattr(cls, name, _timed(name, fn))
+    return cls
+
+
+# Nesting depth of instrumented repository calls in the current task
+_call_depth: ContextVar[int] = ContextVar('repository_call_depth', default=0)
+
+
+def _timed(name: str, fn):
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        depth = _call_depth.get()
+        token = _call_depth.set(depth + 1)
+        try:
+            if depth:
+                # Inside another repository method (e.g. update -> update_where): only the outermost call is timed
+                return await fn(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return await fn(self, *args, **kwargs)
+            finally:
+                ms = (time.perf_counter() - started) * 1000
+                query_metrics.observe('repository', self.collection.name, name, ms)
+        finally:
+            _call_depth.reset(token)
+    
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def filter_shape(value: Any) -> Any:
+    """Replace literal values in a filter with '?', keeping field names and operators"""
+    if isinstance(value, dict):
+        return {k: filter_shape(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [filter_shape(v) for v in value]
+        if all(s == '?' for s in shapes):
+            return ['?'] if shapes else []
+        return shapes
+    return '?'
+
+
+def _find_collscan(plan: Any) -> bool:
+    if isinstance(plan, dict):
+        if plan.get('stage') == 'COLLSCAN':
+            return True
+        return any(_find_collscan(v) for v in plan.values())
+    if isinstance(plan, list):
+        return any(_find_collscan(v) for v in plan)
+    return False
+
+
+# Commands whose collection is the value of the command-name key
+_COLLECTION_COMMANDS = {
+    'find', 'aggregate', 'count', 'distinct', 'insert', 'update',
+    'delete', 'findAndModify', 'createIndexes', 'listIndexes'
+}
+_EXPLAINABLE = {'find', 'aggregate', 'count', 'distinct'}
+# Session/topology fields that explain rejects
+_COMMAND_ENVELOPE = {'lsid', '$db', '$clusterTime', '$readPreference', 'txnNumber', 'autocommit', 'startTransaction'}
+
+
+def _command_filter(name: str, command: Dict[str, Any]) -> Any:
+    if name in ('find', 'count', 'distinct'):
+        return command.get('filter', command.get('query'))
+    if name == 'aggregate':
+        pipeline = command.get('pipeline') or []
+        return pipeline[0].get('$match') if pipeline and '$match' in pipeline[0] else None
+    if name == 'findAndModify':
+        return command.get('query')
+    if name in ('update', 'delete'):
+        statements = command.get('updates') or command.get('deletes') or []
+        return statements[0].get('q') if statements else None
+    return None
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """
+    Driver-level command monitoring. Pass to AsyncIOMotorClient(event_listeners=[...])
+    so every command is timed, including raw `.collection` calls outside repositories.
+    
+    Commands slower than `slow_ms` are logged with their filter shape. When
+    `explain_sample_rate` > 0 a random sample of reads is re-run through
+    explain(queryPlanner) and plans containing COLLSCAN are logged.
+    """
+    
+    def __init__(self, slow_ms: float = 100, explain_sample_rate: float = 0.0):
+        self.slow_ms = slow_ms
+        self.explain_sample_rate = explain_sample_rate
+        self._pending: Dict[Tuple[int, Any], Tuple[str, str, Any]] = {}
+        self._db = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def attach(self, db):
+        """Enable explain sampling against db; call from the running event loop"""
+        self._db = db
+        self._loop = asyncio.get_running_loop()
+    
+    def started(self, event):
+        name = event.command_name
+        if name not in _COLLECTION_COMMANDS:
+            return
+        command = event.command
+        collection = str(command.get(name))
+        shape = filter_shape(_command_filter(name, command))
+        self._pending[(event.request_id, event.connection_id)] = (name, collection, shape)
+        
+        if (
+            name in _EXPLAINABLE
+            and self.explain_sample_rate > 0
+            and self._db is not None
+            and random.random() < self.explain_sample_rate
+        ):
+            explained = {k: v for k, v in command.items() if k not in _COMMAND_ENVELOPE}
+            self._loop.call_soon_threadsafe(self._schedule_explain, collection, explained, shape)
+    
+    def succeeded(self, event):
+        self._finish(event)
+    
+    def failed(self, event):
+        self._finish(event)
+    
+    def _finish(self, event):
+        entry = self._pending.pop((event.request_id, event.connection_id), None)
+        if entry is None:
+            return
+        name, collection, shape = entry
+        ms = event.duration_micros / 1000
+        query_metrics.observe('command', collection, name, ms)
+        if ms >= self.slow_ms:
+            logger.warning(f"Slow query {collection}.{name} took {ms:.1f} ms, filter={shape}")
+    
+    def _schedule_explain(self, collection: str, command: Dict[str, Any], shape: Any):
+        asyncio.ensure_future(self._explain(collection, command, shape))
+    
+    async def _explain(self, collection: str, command: Dict[str, Any], shape: Any):
+        try:
+            result = await self._db.command({'explain': command, 'verbosity': 'queryPlanner'})
+        except Exception as e:
+            logger.debug(f"explain failed for {collection}: {e}")
+            return
+        if _find_collscan(result.get('queryPlanner') or result.get('stages') or result):
+            query_metrics.collscans += 1
+            logger.warning(f"COLLSCAN plan on {collection}, filter={shape}")
+
+
+query_monitor = QueryMonitor(
+    slow_ms=float(os.getenv("SLOW_QUERY_MS", "100")),
+    explain_sample_rate=float(os.getenv("QUERY_EXPLAIN_SAMPLE_RATE", "0"))
+)
@@ -0,0 +1,109 @@
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Tuple
+import asyncio
+
+
+class RequestLoader:
+    """
+    Request-scoped identity map for find_by_id.
+    
+    Lookups issued in the same event-loop tick are coalesced per collection into
+    one find_by_ids ($in) query, and results (including misses) are memoized for
+    the rest of the request.
+    """
+    
+    def __init__(self):
+        self._memo: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        self._futures: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._batches: Dict[str, Tuple[Any, Dict[str, asyncio.Future]]] = {}
+        self._tasks = set()
+        self.queries = 0
+    
+    async def load(self, repository, id: str) -> Optional[Dict[str, Any]]:
+        collection = repository.collection.name
+        key = (collection, id)
+        
+        if key in self._memo:
+            doc = self._memo[key]
+        else:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._schedule(repository, id)
+            doc = await asyncio.shield(future)
+        return dict(doc) if doc is not None else None
+    
+    def _schedule(self, repository, id: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        collection = repository.collection.name
+        batch = self._batches.get(collection)
+        if batch is not None and id in batch[1]:
+            # Forgotten but not yet queried: the pending read is still fresh
+            future = self._futures[(collection, id)] = batch[1][id]
+            return future
+        
+        future = loop.create_future()
+        self._futures[(collection, id)] = future
+        
+        if batch is None:
+            self._batches[collection] = (repository, {})
+            # Runs after every task already ready in this tick has queued its ID
+            loop.call_soon(self._start_dispatch, collection)
+        self._batches[collection][1][id] = future
+        return future
+    
+    def _start_dispatch(self, collection: str):
+        task = asyncio.ensure_future(self._dispatch(collection))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _dispatch(self, collection: str):
+        repository, batch = self._batches.pop(collection)
+        self.queries += 1
+        try:
+            docs = await repository.find_by_ids(list(batch))
+        except Exception as e:
+            for id, future in batch.items():
+                self._futures.pop((collection, id), None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for id, future in batch.items():
+            key = (collection, id)
+            doc = docs.get(id)
+            # A write during the batch forgets the key; don't memoize stale data
+            if self._futures.pop(key, None) is future:
+                self._memo[key] = doc
+            if not future.done():
+                future.set_result(doc)
+    
+    def forget(self, collection: str, id: Optional[str] = None):
+        """Drop memoized documents after a write (all of the collection if no ID)"""
+        if id is None:
+            for key in [k for k in self._memo if k[0] == collection]:
+                del self._memo[key]
+            for key in [k for k in self._futures if k[0] == collection]:
+                del self._futures[key]
+        else:
+            self._memo.pop((collection, id), None)
+            self._futures.pop((collection, id), None)
+
+
+_current_loader: ContextVar[Optional[RequestLoader]] = ContextVar('request_loader', default=None)
+
+
+def current_loader() -> Optional[RequestLoader]:
+    """Loader for the request being handled, if one was started"""
+    return _current_loader.get()
+
+
+def start_request_scope() -> RequestLoader:
+    """Attach a fresh loader to the current task's context"""
+    loader = RequestLoader()
+    _current_loader.set(loader)
+    return loader
+
+
+async def use_request_loader():
+    """FastAPI dependency enabling batched, memoized repository reads for a request"""
+    start_request_scope()
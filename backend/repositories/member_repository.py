@@ -1,9 +1,21 @@
 from .base import BaseRepository
+from .indexes import IndexSpec
+from .cache import cached_repository
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 
+@cached_repository(ttl_seconds=120)
 class MemberRepository(BaseRepository):
+    batch_loads = True
+    
+    indexes = [
+        IndexSpec([('user_id', 1)]),
+        IndexSpec([('org_id', 1), ('created_at', -1), ('id', -1)]),
+    ]
+    
+    PAGE_SORT = [('created_at', -1), ('id', -1)]
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'members')
     
@@ -15,10 +27,20 @@ class MemberRepository(BaseRepository):
         """Find all members in an organization"""
         return await self.find_many({'org_id': org_id}, limit=limit, skip=skip)
     
+    async def find_page_by_org(
+        self,
+        org_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page of an organization's members, newest first"""
+        return await self.find_page({'org_id': org_id}, self.PAGE_SORT, limit=limit, cursor=cursor)
+    
     async def pause_data_sharing(self, member_id: str, paused_until: Any) -> bool:
         """Pause data sharing for member"""
         result = await self.collection.update_one(
             {'id': member_id},
             {'$set': {'data_sharing_paused_until': paused_until}}
         )
+        await self.invalidate(member_id)
         return result.modified_count > 0
@@ -0,0 +1,101 @@
+from .base import BaseRepository
+from .indexes import IndexSpec
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+
+
+class MemberStatusRepository(BaseRepository):
+    """
+    One document per member holding its current tier, latest risk event and
+    activity timestamps, kept up to date on writes so reads are point lookups.
+    """
+    
+    indexes = [
+        IndexSpec([('member_id', 1)], unique=True),
+        IndexSpec([('org_id', 1), ('tier', 1), ('member_id', 1)]),
+        IndexSpec([('org_id', 1), ('member_id', 1)]),
+    ]
+    
+    PAGE_SORT = [('member_id', 1)]
+    
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, 'member_status')
+    
+    async def find_by_member(self, member_id: str) -> Optional[Dict[str, Any]]:
+        """Current status for a member"""
+        return await self.find_one({'member_id': member_id})
+    
+    async def find_by_members(self, member_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Current status for many members in one query, keyed by member_id"""
+        if not member_ids:
+            return {}
+        docs = await self.find_many({'member_id': {'$in': member_ids}}, limit=len(member_ids))
+        return {doc['member_id']: doc for doc in docs}
+    
+    async def find_roster(
+        self,
+        org_id: str,
+        tier: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page of an organization's member statuses, optionally one tier"""
+        query = {'org_id': org_id}
+        if tier:
+            query['tier'] = tier
+        return await self.find_page(query, self.PAGE_SORT, limit=limit, cursor=cursor)
+    
+    async def record_risk_event(self, event: Dict[str, Any], open_statuses: List[str]):
+        """Make event the member's current risk"""
+        now = datetime.utcnow()
+        fields = {
+            'org_id': event['org_id'],
+            'tier': event['tier'],
+            'score': event['score'],
+            'latest_event': event,
+            'last_analysis_at': event.get('detected_at', now),
+            'updated_at': now,
+        }
+        update: Dict[str, Any] = {'$set': fields}
+        if event.get('status') in open_statuses:
+            fields['open_alert_id'] = event['id']
+        else:
+            update['$unset'] = {'open_alert_id': ''}
+        await self.collection.update_one({'member_id': event['member_id']}, update, upsert=True)
+    
+    async def record_event_update(self, event: Dict[str, Any], open_statuses: List[str]):
+        """Refresh the copy of an updated event if it is the member's latest"""
+        update: Dict[str, Any] = {'$set': {'latest_event': event, 'updated_at': datetime.utcnow()}}
+        if event.get('status') not in open_statuses:
+            update['$unset'] = {'open_alert_id': ''}
+        await self.collection.update_one(
+            {'member_id': event['member_id'], 'latest_event.id': event['id']},
+            update
+        )
+    
+    async def record_analysis(self, member_id: str, org_id: str, analyzed_at: datetime):
+        """Record an analysis run that raised no risk event"""
+        await self.collection.update_one(
+            {'member_id': member_id},
+            {'$set': {'org_id': org_id, 'last_analysis_at': analyzed_at, 'updated_at': datetime.utcnow()}},
+            upsert=True
+        )
+    
+    async def record_samples(self, last_sample_at: Dict[str, datetime]):
+        """
+        Advance last_sample_at for each member ({member_id: newest sample
+        timestamp}) with one unordered bulk write
+        """
+        if not last_sample_at:
+            return
+        now = datetime.utcnow()
+        await self.collection.bulk_write([
+            UpdateOne(
+                {'member_id': member_id},
+                {'$max': {'last_sample_at': timestamp}, '$set': {'updated_at': now}},
+                upsert=True
+            )
+            for member_id, timestamp in last_sample_at.items()
+        ], ordered=False)
@@ -0,0 +1,687 @@
+"""
+In-memory stand-in for the subset of the Motor API the repositories use.
+
+Lets the full application (repositories, services and the raw `.collection`
+calls in server.py) run without MongoDB for local load tests, benchmarks and
+CI. Supports equality/dotted-path filters, $in/$nin/$ne/$exists, range
+operators, $or/$and/$nor, sort/skip/limit, projections, the common update
+operators and the aggregation stages used in this codebase. Optional simulated
+latency is applied per operation.
+"""
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne, UpdateMany
+from typing import Optional, List, Dict, Any, Tuple, Iterable
+from datetime import datetime
+import asyncio
+import copy
+
+
+_MISSING = object()
+
+
+# ==================== FILTERS ====================
+
+def get_path(doc: Any, path: str) -> Any:
+    """Resolve a dotted path; returns _MISSING if absent"""
+    value = doc
+    for part in path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list) and part.isdigit():
+            index = int(part)
+            value = value[index] if index < len(value) else _MISSING
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _type_rank(value: Any) -> int:
+    # Approximates BSON comparison order
+    if value is None or value is _MISSING:
+        return 0
+    if isinstance(value, bool):
+        return 5
+    if isinstance(value, (int, float)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    if isinstance(value, dict):
+        return 3
+    if isinstance(value, list):
+        return 4
+    if isinstance(value, datetime):
+        return 6
+    return 7
+
+
+def sort_key(value: Any) -> Tuple[int, Any]:
+    rank = _type_rank(value)
+    if rank in (0, 3, 4, 7):
+        return (rank, str(value) if rank else 0)
+    return (rank, value)
+
+
+def _compare(a: Any, b: Any) -> Optional[int]:
+    """Compare values of the same BSON type class; None if incomparable"""
+    if a is _MISSING or _type_rank(a) != _type_rank(b):
+        return None
+    if a is None:
+        return 0
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        return None
+
+
+def _values_at(doc: Dict[str, Any], path: str) -> List[Any]:
+    """Candidate values for a path, expanding arrays like MongoDB does"""
+    value = get_path(doc, path)
+    if isinstance(value, list):
+        return [value] + value
+    return [value]
+
+
+def _match_operator(op: str, candidates: List[Any], arg: Any) -> bool:
+    if op == '$eq':
+        return any(_equal(v, arg) for v in candidates)
+    if op == '$ne':
+        return not any(_equal(v, arg) for v in candidates)
+    if op == '$in':
+        return any(_equal(v, a) for v in candidates for a in arg)
+    if op == '$nin':
+        return not any(_equal(v, a) for v in candidates for a in arg)
+    if op == '$exists':
+        present = any(v is not _MISSING for v in candidates)
+        return present if arg else not present
+    if op in ('$gt', '$gte', '$lt', '$lte'):
+        for v in candidates:
+            result = _compare(v, arg)
+            if result is None:
+                continue
+            if (
+                (op == '$gt' and result > 0) or (op == '$gte' and result >= 0)
+                or (op == '$lt' and result < 0) or (op == '$lte' and result <= 0)
+            ):
+                return True
+        return False
+    raise NotImplementedError(f"Unsupported query operator {op}")
+
+
+def _equal(value: Any, expected: Any) -> bool:
+    if expected is None:
+        return value is None or value is _MISSING
+    if value is _MISSING:
+        return False
+    return value == expected
+
+
+def matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """True if doc satisfies a MongoDB-style filter"""
+    for key, condition in query.items():
+        if key == '$or':
+            if not any(matches(doc, q) for q in condition):
+                return False
+        elif key == '$and':
+            if not all(matches(doc, q) for q in condition):
+                return False
+        elif key == '$nor':
+            if any(matches(doc, q) for q in condition):
+                return False
+        else:
+            candidates = _values_at(doc, key)
+            if isinstance(condition, dict) and condition and all(k.startswith('$') for k in condition):
+                if not all(_match_operator(op, candidates, arg) for op, arg in condition.items()):
+                    return False
+            elif not _match_operator('$eq', candidates, condition):
+                return False
+    return True
+
+
+def sort_documents(docs: List[Dict[str, Any]], sort: Iterable[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    for field, direction in reversed(list(sort)):
+        docs.sort(key=lambda d: sort_key(get_path(d, field)), reverse=direction < 0)
+    return docs
+
+
+def _normalize_sort(key_or_list: Any, direction: Optional[int] = None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [(k, d) for k, d in key_or_list]
+
+
+# ==================== PROJECTION ====================
+
+def _delete_path(doc: Dict[str, Any], path: str):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        target = target.get(part) if isinstance(target, dict) else None
+        if target is None:
+            return
+    if isinstance(target, dict):
+        target.pop(parts[-1], None)
+
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+def project(doc: Dict[str, Any], projection: Optional[Any]) -> Dict[str, Any]:
+    """Apply an inclusion or exclusion projection to a copy of doc"""
+    if not projection:
+        return copy.deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    
+    include = {k: v for k, v in projection.items() if k != '_id' and v}
+    if include:
+        result = {}
+        if projection.get('_id', 1) and '_id' in doc:
+            result['_id'] = doc['_id']
+        for field, spec in include.items():
+            value = evaluate(doc, spec) if not isinstance(spec, (bool, int)) else get_path(doc, field)
+            if value is not _MISSING:
+                _set_path(result, field, copy.deepcopy(value))
+        return result
+    
+    result = copy.deepcopy(doc)
+    for field, spec in projection.items():
+        if not spec:
+            _delete_path(result, field)
+    return result
+
+
+# ==================== EXPRESSIONS / AGGREGATION ====================
+
+def evaluate(doc: Dict[str, Any], expr: Any) -> Any:
+    """Evaluate the aggregation expressions used by our pipelines"""
+    if isinstance(expr, str) and expr.startswith('$'):
+        value = get_path(doc, expr[1:])
+        return None if value is _MISSING else value
+    if isinstance(expr, dict):
+        if len(expr) == 1:
+            op, arg = next(iter(expr.items()))
+            if op == '$dateToString':
+                date = evaluate(doc, arg['date'])
+                return date.strftime(arg.get('format', '%Y-%m-%dT%H:%M:%S.%LZ')) if date else None
+            if op == '$cond':
+                if isinstance(arg, list):
+                    arg = {'if': arg[0], 'then': arg[1], 'else': arg[2]}
+                return evaluate(doc, arg['then'] if evaluate(doc, arg['if']) else arg['else'])
+            if op == '$eq':
+                return evaluate(doc, arg[0]) == evaluate(doc, arg[1])
+            if op == '$in':
+                return evaluate(doc, arg[0]) in evaluate(doc, arg[1])
+            if op == '$size':
+                return len(evaluate(doc, arg) or [])
+            if op == '$ifNull':
+                value = evaluate(doc, arg[0])
+                return value if value is not None else evaluate(doc, arg[1])
+            if op == '$literal':
+                return arg
+            if op.startswith('$'):
+                raise NotImplementedError(f"Unsupported expression operator {op}")
+        return {k: evaluate(doc, v) for k, v in expr.items()}
+    if isinstance(expr, list):
+        return [evaluate(doc, v) for v in expr]
+    return expr
+
+
+def _accumulate(op: str, values: List[Any]) -> Any:
+    present = [v for v in values if v is not None]
+    if op == '$sum':
+        return sum(v for v in present if isinstance(v, (int, float)))
+    if op == '$avg':
+        numbers = [v for v in present if isinstance(v, (int, float))]
+        return sum(numbers) / len(numbers) if numbers else None
+    if op == '$min':
+        return min(present, key=sort_key) if present else None
+    if op == '$max':
+        return max(present, key=sort_key) if present else None
+    if op == '$first':
+        return values[0] if values else None
+    if op == '$last':
+        return values[-1] if values else None
+    if op == '$push':
+        return list(values)
+    if op == '$addToSet':
+        result = []
+        for v in values:
+            if v not in result:
+                result.append(v)
+        return result
+    raise NotImplementedError(f"Unsupported accumulator {op}")
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def run_pipeline(docs: List[Dict[str, Any]], pipeline: List[Dict[str, Any]], database: 'InMemoryDatabase') -> List[Dict[str, Any]]:
+    for stage in pipeline:
+        (name, spec), = stage.items()
+        if name == '$match':
+            docs = [d for d in docs if matches(d, spec)]
+        elif name == '$sort':
+            docs = sort_documents(list(docs), _normalize_sort(spec))
+        elif name == '$skip':
+            docs = docs[spec:]
+        elif name == '$limit':
+            docs = docs[:spec]
+        elif name == '$project':
+            docs = [project(d, spec) for d in docs]
+        elif name in ('$addFields', '$set'):
+            docs = [{**d, **{k: evaluate(d, v) for k, v in spec.items()}} for d in docs]
+        elif name == '$lookup':
+            foreign = database[spec['from']]._documents
+            joined = []
+            for d in docs:
+                local = get_path(d, spec['localField'])
+                local_values = local if isinstance(local, list) else [local]
+                matched = [
+                    copy.deepcopy(f) for f in foreign
+                    if any(_equal(get_path(f, spec['foreignField']), v) for v in local_values)
+                ]
+                joined.append({**d, spec['as']: matched})
+            docs = joined
+        elif name == '$unwind':
+            path = spec if isinstance(spec, str) else spec['path']
+            preserve = isinstance(spec, dict) and spec.get('preserveNullAndEmptyArrays', False)
+            field = path[1:]
+            unwound = []
+            for d in docs:
+                value = get_path(d, field)
+                if isinstance(value, list) and value:
+                    for item in value:
+                        copy_ = copy.deepcopy(d)
+                        _set_path(copy_, field, item)
+                        unwound.append(copy_)
+                elif value not in (_MISSING, None) and not isinstance(value, list):
+                    unwound.append(d)
+                elif preserve:
+                    copy_ = copy.deepcopy(d)
+                    _delete_path(copy_, field)
+                    unwound.append(copy_)
+            docs = unwound
+        elif name == '$group':
+            groups: Dict[Any, Dict[str, Any]] = {}
+            members: Dict[Any, List[Dict[str, Any]]] = {}
+            for d in docs:
+                key_value = evaluate(d, spec['_id'])
+                key = _freeze(key_value)
+                if key not in groups:
+                    groups[key] = {'_id': key_value}
+                    members[key] = []
+                members[key].append(d)
+            result = []
+            for key, group in groups.items():
+                for field, accumulator in spec.items():
+                    if field == '_id':
+                        continue
+                    (op, expr), = accumulator.items()
+                    group[field] = _accumulate(op, [evaluate(d, expr) for d in members[key]])
+                result.append(group)
+            docs = result
+        elif name == '$count':
+            docs = [{spec: len(docs)}] if docs else []
+        elif name == '$facet':
+            docs = [{
+                field: run_pipeline([copy.deepcopy(d) for d in docs], sub_pipeline, database)
+                for field, sub_pipeline in spec.items()
+            }]
+        else:
+            raise NotImplementedError(f"Unsupported aggregation stage {name}")
+    return docs
+
+
+def apply_update(doc: Dict[str, Any], update: Dict[str, Any], inserting: bool = False) -> bool:
+    """Apply MongoDB update operators to doc in place; True if it changed"""
+    before = copy.deepcopy(doc)
+    for op, fields in update.items():
+        for path, value in fields.items():
+            current = get_path(doc, path)
+            if op == '$set':
+                _set_path(doc, path, copy.deepcopy(value))
+            elif op == '$setOnInsert':
+                if inserting:
+                    _set_path(doc, path, copy.deepcopy(value))
+            elif op == '$unset':
+                _delete_path(doc, path)
+            elif op == '$inc':
+                _set_path(doc, path, (0 if current is _MISSING else current) + value)
+            elif op == '$max':
+                if current is _MISSING or sort_key(value) > sort_key(current):
+                    _set_path(doc, path, value)
+            elif op == '$min':
+                if current is _MISSING or sort_key(value) < sort_key(current):
+                    _set_path(doc, path, value)
+            elif op == '$push':
+                items = value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+                _set_path(doc, path, (current if isinstance(current, list) else []) + list(items))
+            else:
+                raise NotImplementedError(f"Unsupported update operator {op}")
+    return doc != before
+
+
+def upsert_seed(filter: Dict[str, Any]) -> Dict[str, Any]:
+    """Initial document for an upsert: the filter's plain equality fields"""
+    return {
+        k: v for k, v in filter.items()
+        if not k.startswith('$') and not (isinstance(v, dict) and any(op.startswith('$') for op in v))
+    }
+
+
+# ==================== RESULTS / CURSORS ====================
+
+class InsertOneResult:
+    def __init__(self, inserted_id: Any):
+        self.inserted_id = inserted_id
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids: List[Any]):
+        self.inserted_ids = inserted_ids
+
+
+class UpdateResult:
+    def __init__(self, matched_count: int, modified_count: int, upserted_id: Any = None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+
+class BulkWriteResult:
+    def __init__(self, matched_count: int, modified_count: int):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+
+
+class InMemoryCursor:
+    def __init__(self, collection: 'InMemoryCollection', query: Dict[str, Any], projection: Any = None):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._buffer: Optional[List[Dict[str, Any]]] = None
+    
+    def sort(self, key_or_list: Any, direction: Optional[int] = None) -> 'InMemoryCursor':
+        self._sort.extend(_normalize_sort(key_or_list, direction))
+        return self
+    
+    def skip(self, skip: int) -> 'InMemoryCursor':
+        self._skip = skip
+        return self
+    
+    def limit(self, limit: int) -> 'InMemoryCursor':
+        self._limit = limit
+        return self
+    
+    def _results(self) -> List[Dict[str, Any]]:
+        docs = self._collection._select(self._query, self._sort)
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        return [project(d, self._projection) for d in docs]
+    
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        await self._collection._delay()
+        docs = self._results()
+        return docs[:length] if length else docs
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._buffer is None:
+            self._buffer = await self.to_list()
+        if not self._buffer:
+            raise StopAsyncIteration
+        return self._buffer.pop(0)
+
+
+class InMemoryAggregateCursor:
+    def __init__(self, collection: 'InMemoryCollection', pipeline: List[Dict[str, Any]]):
+        self._collection = collection
+        self._pipeline = pipeline
+    
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        await self._collection._delay()
+        docs = run_pipeline(
+            [copy.deepcopy(d) for d in self._collection._documents],
+            self._pipeline,
+            self._collection.database
+        )
+        return docs[:length] if length else docs
+
+
+# ==================== COLLECTION / DATABASE ====================
+
+class InMemoryCollection:
+    def __init__(self, database: 'InMemoryDatabase', name: str):
+        self.database = database
+        self.name = name
+        self._documents: List[Dict[str, Any]] = []
+        self._indexes: Dict[str, Dict[str, Any]] = {'_id_': {'key': [('_id', 1)], 'v': 2}}
+    
+    async def _delay(self):
+        if self.database.latency_ms:
+            await asyncio.sleep(self.database.latency_ms / 1000)
+    
+    def _select(self, query: Dict[str, Any], sort: Iterable[Tuple[str, int]] = ()) -> List[Dict[str, Any]]:
+        """Documents matching query, optionally sorted (no copies)"""
+        docs = [d for d in self._documents if matches(d, query or {})]
+        if sort:
+            docs = sort_documents(docs, sort)
+        return docs
+    
+    def _check_unique(self, doc: Dict[str, Any], ignore: Optional[Dict[str, Any]] = None):
+        for name, info in self._indexes.items():
+            if not info.get('unique'):
+                continue
+            fields = [f for f, _ in info['key']]
+            values = [get_path(doc, f) for f in fields]
+            if info.get('sparse') and all(v is _MISSING for v in values):
+                continue
+            for other in self._documents:
+                if other is ignore:
+                    continue
+                if [get_path(other, f) for f in fields] == values:
+                    from pymongo.errors import DuplicateKeyError
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {name}")
+    
+    def _insert(self, doc: Dict[str, Any]) -> Any:
+        if '_id' not in doc:
+            doc['_id'] = ObjectId()
+        stored = copy.deepcopy(doc)
+        self._check_unique(stored)
+        self._documents.append(stored)
+        return doc['_id']
+    
+    async def insert_one(self, document: Dict[str, Any], session: Any = None) -> InsertOneResult:
+        await self._delay()
+        return InsertOneResult(self._insert(document))
+    
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True, session: Any = None) -> InsertManyResult:
+        await self._delay()
+        return InsertManyResult([self._insert(d) for d in documents])
+    
+    async def find_one(self, filter: Optional[Dict[str, Any]] = None, projection: Any = None, session: Any = None, sort: Any = None) -> Optional[Dict[str, Any]]:
+        await self._delay()
+        docs = self._select(filter or {}, _normalize_sort(sort) if sort else ())
+        return project(docs[0], projection) if docs else None
+    
+    def find(self, filter: Optional[Dict[str, Any]] = None, projection: Any = None, session: Any = None) -> InMemoryCursor:
+        return InMemoryCursor(self, filter or {}, projection)
+    
+    def aggregate(self, pipeline: List[Dict[str, Any]], session: Any = None, **kwargs) -> InMemoryAggregateCursor:
+        return InMemoryAggregateCursor(self, pipeline)
+    
+    def _upsert_document(self, filter: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        doc = upsert_seed(filter)
+        apply_update(doc, update, inserting=True)
+        self._insert(doc)
+        return self._documents[-1]
+    
+    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False, session: Any = None) -> UpdateResult:
+        await self._delay()
+        docs = self._select(filter)
+        if not docs:
+            if upsert:
+                return UpdateResult(0, 0, self._upsert_document(filter, update)['_id'])
+            return UpdateResult(0, 0)
+        modified = apply_update(docs[0], update)
+        return UpdateResult(1, int(modified))
+    
+    async def update_many(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False, session: Any = None) -> UpdateResult:
+        await self._delay()
+        docs = self._select(filter)
+        if not docs and upsert:
+            return UpdateResult(0, 0, self._upsert_document(filter, update)['_id'])
+        modified = sum(int(apply_update(d, update)) for d in docs)
+        return UpdateResult(len(docs), modified)
+    
+    async def bulk_write(self, requests: List[Any], ordered: bool = True, session: Any = None) -> BulkWriteResult:
+        """pymongo UpdateOne/UpdateMany requests applied in one round trip"""
+        await self._delay()
+        matched = modified = 0
+        for request in requests:
+            if not isinstance(request, (UpdateOne, UpdateMany)):
+                raise NotImplementedError(f"bulk_write does not support {type(request).__name__}")
+            # pymongo keeps the request's arguments in private attributes
+            docs = self._select(request._filter)
+            if isinstance(request, UpdateOne):
+                docs = docs[:1]
+            if not docs and request._upsert:
+                self._upsert_document(request._filter, request._doc)
+                continue
+            matched += len(docs)
+            modified += sum(int(apply_update(d, request._doc)) for d in docs)
+        return BulkWriteResult(matched, modified)
+    
+    async def find_one_and_update(
+        self,
+        filter: Dict[str, Any],
+        update: Dict[str, Any],
+        projection: Any = None,
+        sort: Any = None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        session: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        await self._delay()
+        docs = self._select(filter, _normalize_sort(sort) if sort else ())
+        if not docs:
+            if not upsert:
+                return None
+            doc = self._upsert_document(filter, update)
+            return project(doc, projection) if return_document == ReturnDocument.AFTER else None
+        doc = docs[0]
+        before = project(doc, projection)
+        apply_update(doc, update)
+        return project(doc, projection) if return_document == ReturnDocument.AFTER else before
+    
+    async def find_one_and_delete(self, filter: Dict[str, Any], projection: Any = None, session: Any = None) -> Optional[Dict[str, Any]]:
+        await self._delay()
+        docs = self._select(filter)
+        if not docs:
+            return None
+        self._documents.remove(docs[0])
+        return project(docs[0], projection)
+    
+    async def delete_one(self, filter: Dict[str, Any], session: Any = None) -> DeleteResult:
+        await self._delay()
+        docs = self._select(filter)
+        if docs:
+            self._documents.remove(docs[0])
+        return DeleteResult(len(docs[:1]))
+    
+    async def delete_many(self, filter: Dict[str, Any], session: Any = None) -> DeleteResult:
+        await self._delay()
+        before = len(self._documents)
+        self._documents = [d for d in self._documents if not matches(d, filter)]
+        return DeleteResult(before - len(self._documents))
+    
+    async def count_documents(self, filter: Dict[str, Any], session: Any = None, **kwargs) -> int:
+        await self._delay()
+        return len(self._select(filter))
+    
+    async def create_index(self, keys: Any, name: Optional[str] = None, **kwargs) -> str:
+        keys = _normalize_sort(keys, 1)
+        name = name or '_'.join(f"{f}_{d}" for f, d in keys)
+        info = {'key': keys, 'v': 2}
+        for option in ('unique', 'sparse', 'expireAfterSeconds'):
+            if kwargs.get(option) is not None:
+                info[option] = kwargs[option]
+        self._indexes[name] = info
+        return name
+    
+    async def index_information(self) -> Dict[str, Dict[str, Any]]:
+        return copy.deepcopy(self._indexes)
+    
+    async def drop(self):
+        self._documents = []
+
+
+class InMemoryDatabase:
+    """Collections are created on first access, as in MongoDB"""
+    
+    def __init__(self, name: str = 'aegis', latency_ms: float = 0.0, client: Any = None):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.client = client
+        self._collections: Dict[str, InMemoryCollection] = {}
+    
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = InMemoryCollection(self, name)
+        return self._collections[name]
+    
+    def __getattr__(self, name: str) -> InMemoryCollection:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+    
+    async def list_collection_names(self) -> List[str]:
+        return list(self._collections)
+    
+    async def command(self, command: Any, **kwargs) -> Dict[str, Any]:
+        name = next(iter(command)) if isinstance(command, dict) else command
+        if name == 'ping':
+            return {'ok': 1.0}
+        raise NotImplementedError(f"Unsupported command {name}")
+
+
+class InMemoryClient:
+    """Drop-in for AsyncIOMotorClient when DB_BACKEND=memory"""
+    
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self._databases: Dict[str, InMemoryDatabase] = {}
+        self.admin = self['admin']
+    
+    def __getitem__(self, name: str) -> InMemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = InMemoryDatabase(name, self.latency_ms, client=self)
+        return self._databases[name]
+    
+    def close(self):
+        pass
@@ -1,18 +1,25 @@
 from .base import BaseRepository
+from .indexes import IndexSpec
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
+import asyncio
 
 
 class MetricRepository(BaseRepository):
+    # Time-series access paths
+    indexes = [
+        IndexSpec([('member_id', 1), ('type', 1), ('timestamp', -1)]),
+        IndexSpec([('member_id', 1), ('timestamp', -1)]),
+        IndexSpec([('member_id', 1), ('ingested_at', 1), ('id', 1)]),
+    ]
+    
+    # Samples are immutable once ingested
+    SYNC_FIELD = 'ingested_at'
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'metric_samples')
     
-    async def create_indexes(self):
-        """Create indexes for efficient time-series queries"""
-        await self.collection.create_index([('member_id', 1), ('type', 1), ('timestamp', -1)])
-        await self.collection.create_index([('member_id', 1), ('timestamp', -1)])
-    
     async def find_by_member_and_type(
         self,
         member_id: str,
@@ -65,6 +72,82 @@ class MetricRepository(BaseRepository):
             doc.pop('_id', None)
         return docs
     
+    async def latest_by_members(
+        self,
+        member_ids: List[str],
+        metric_types: List[str],
+        since: datetime
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Most recent sample of each type for many members in one aggregation.
+        Returns {member_id: {type: {'value_num', 'unit', 'timestamp'}}}.
+        """
+        if not member_ids:
+            return {}
+        rows = await self.collection.aggregate([
+            {'$match': {
+                'member_id': {'$in': member_ids},
+                'type': {'$in': metric_types},
+                'timestamp': {'$gte': since}
+            }},
+            # Matches the (member_id, type, timestamp) index so $first needs no in-memory sort
+            {'$sort': {'member_id': 1, 'type': 1, 'timestamp': -1}},
+            {'$group': {
+                '_id': {'member_id': '$member_id', 'type': '$type'},
+                'value_num': {'$first': '$value_num'},
+                'unit': {'$first': '$unit'},
+                'timestamp': {'$first': '$timestamp'},
+            }},
+        ]).to_list(length=None)
+        
+        latest: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for row in rows:
+            key = row.pop('_id')
+            latest.setdefault(key['member_id'], {})[key['type']] = row
+        return latest
+    
+    async def version_marker(self, member_id: str, since: datetime, metric_type: Optional[str] = None) -> Tuple[Any, Any]:
+        """
+        Changes whenever the member's samples since `since` change: the latest
+        ingested_at (new or backfilled samples) and the oldest timestamp still in
+        the window (samples ageing out). Two index seeks, for ETags.
+        """
+        window: Dict[str, Any] = {'member_id': member_id, 'timestamp': {'$gte': since}}
+        if metric_type:
+            window['type'] = metric_type
+        return tuple(await asyncio.gather(
+            # Any type: coarser than needed with metric_type, but stays on the (member_id, ingested_at) index
+            self.max_value({'member_id': member_id}, 'ingested_at'),
+            self.max_value(window, 'timestamp', direction=1),
+        ))
+    
+    async def daily_summary(self, member_id: str, since: datetime) -> List[Dict[str, Any]]:
+        """
+        Per-day aggregates of each metric type since `since` (UTC days), computed
+        server-side so the client gets one point per type per day instead of raw samples.
+        Rows are {'type', 'day' ('YYYY-MM-DD'), 'avg', 'min', 'max', 'count'}, oldest day first.
+        """
+        rows = await self.collection.aggregate([
+            {'$match': {'member_id': member_id, 'timestamp': {'$gte': since}}},
+            {'$group': {
+                '_id': {
+                    'type': '$type',
+                    'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$timestamp'}}
+                },
+                'avg': {'$avg': '$value_num'},
+                'min': {'$min': '$value_num'},
+                'max': {'$max': '$value_num'},
+                'count': {'$sum': 1},
+            }},
+            {'$sort': {'_id.type': 1, '_id.day': 1}},
+        ]).to_list(length=None)
+        
+        for row in rows:
+            key = row.pop('_id')
+            row['type'] = key['type']
+            row['day'] = key['day']
+        return rows
+    
     async def bulk_create(self, samples: List[Dict[str, Any]]) -> int:
         """Bulk insert metric samples"""
         if not samples:
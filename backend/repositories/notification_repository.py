@@ -0,0 +1,123 @@
+from .base import BaseRepository
+from .indexes import IndexSpec
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateMany, UpdateOne
+from typing import List, Dict, Any, Tuple
+from datetime import datetime, timedelta
+import uuid
+
+
+class NotificationOutboxRepository(BaseRepository):
+    """
+    Persistent push outbox (PushNotificationLog documents). Dispatchers claim
+    due notifications with a lease, so several workers can drain it safely and
+    a crashed worker's batch is picked up again once the lease expires. Sent
+    and failed notifications are TTL-deleted `retention_days` after completion.
+    """
+    
+    indexes = [
+        IndexSpec([('status', 1), ('provider', 1), ('next_attempt_at', 1)]),
+        IndexSpec([('status', 1), ('claimed_until', 1)]),
+        # claim_batch re-reads what it won by claim id
+        IndexSpec([('claim', 1)], sparse=True),
+        IndexSpec([('data.member_id', 1)], sparse=True),
+    ]
+    
+    def __init__(self, db: AsyncIOMotorDatabase, retention_days: int = 30):
+        super().__init__(db, 'notification_outbox')
+        self.retention_days = retention_days
+    
+    def declared_indexes(self) -> List[IndexSpec]:
+        # Only sent and failed rows have completed_at, so pending ones never expire
+        ttl = IndexSpec([('completed_at', 1)], expire_after_seconds=self.retention_days * 86400)
+        return super().declared_indexes() + [ttl]
+    
+    async def enqueue_many(self, notifications: List[Dict[str, Any]]) -> int:
+        """Add notifications to the outbox"""
+        if not notifications:
+            return 0
+        result = await self.collection.insert_many(notifications, ordered=False)
+        return len(result.inserted_ids)
+    
+    async def claim_batch(self, provider: str, limit: int, lease_seconds: float) -> List[Dict[str, Any]]:
+        """Lease up to `limit` due notifications for a provider (three round trips per batch)"""
+        now = datetime.utcnow()
+        due = {'status': 'pending', 'provider': provider, 'next_attempt_at': {'$lte': now}}
+        cursor = self.collection.find(due, {'id': 1}).sort('next_attempt_at', 1).limit(limit)
+        ids = [doc['id'] for doc in await cursor.to_list(length=limit)]
+        if not ids:
+            return []
+        
+        claim = str(uuid.uuid4())
+        await self.collection.update_many(
+            {**due, 'id': {'$in': ids}},
+            {'$set': {
+                'status': 'sending',
+                'claim': claim,
+                'claimed_until': now + timedelta(seconds=lease_seconds)
+            }}
+        )
+        # Another worker may have won some of them
+        docs = await self.collection.find({'claim': claim}).to_list(length=limit)
+        for doc in docs:
+            doc.pop('_id', None)
+        return docs
+    
+    async def record_outcomes(
+        self,
+        sent: List[str],
+        retries: List[Tuple[str, int, datetime, str]],
+        failures: List[Tuple[str, int, str]]
+    ):
+        """
+        Record a sent batch's results in one unordered bulk write:
+        `sent` ids, `retries` as (id, attempts, next_attempt_at, error) and
+        `failures` as (id, attempts, error). Sent and failed rows get
+        `completed_at`, from which they expire after the retention period.
+        """
+        now = datetime.utcnow()
+        release = {'claim': '', 'claimed_until': ''}
+        requests = []
+        if sent:
+            requests.append(UpdateMany(
+                {'id': {'$in': sent}},
+                {'$set': {'status': 'sent', 'sent_at': now, 'completed_at': now}, '$unset': release}
+            ))
+        for id, attempts, next_attempt_at, error in retries:
+            requests.append(UpdateOne(
+                {'id': id},
+                {'$set': {
+                    'status': 'pending',
+                    'attempts': attempts,
+                    'next_attempt_at': next_attempt_at,
+                    'error_message': error
+                }, '$unset': release}
+            ))
+        for id, attempts, error in failures:
+            requests.append(UpdateOne(
+                {'id': id},
+                {'$set': {'status': 'failed', 'attempts': attempts, 'error_message': error, 'completed_at': now},
+                 '$unset': release}
+            ))
+        if requests:
+            await self.collection.bulk_write(requests, ordered=False)
+    
+    async def delete_for_member(self, member_id: str, session: Any = None) -> int:
+        """Remove every notification about a member (account deletion); pending ones are never sent"""
+        result = await self.collection.delete_many({'data.member_id': member_id}, session=session)
+        return result.deleted_count
+    
+    async def release_expired(self) -> int:
+        """Return notifications whose lease expired (worker crashed mid-send) to the queue"""
+        result = await self.collection.update_many(
+            {'status': 'sending', 'claimed_until': {'$lt': datetime.utcnow()}},
+            {'$set': {'status': 'pending'}, '$unset': {'claim': '', 'claimed_until': ''}}
+        )
+        return result.modified_count
+    
+    async def count_by_status(self) -> Dict[str, int]:
+        """Outbox depth per status"""
+        rows = await self.collection.aggregate([
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+        ]).to_list(length=None)
+        return {row['_id']: row['count'] for row in rows}
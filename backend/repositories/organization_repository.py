@@ -0,0 +1,11 @@
+from .base import BaseRepository
+from .cache import cached_repository
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+@cached_repository(ttl_seconds=600)
+class OrganizationRepository(BaseRepository):
+    batch_loads = True
+    
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, 'organizations')
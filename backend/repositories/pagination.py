@@ -0,0 +1,53 @@
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    """Raised when a page cursor cannot be decoded"""
+    pass
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque, URL-safe cursor for the sort-key values of the last row on a page"""
+    encoded = [{'$date': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(encoded, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Inverse of encode_cursor; checks the cursor carries `size` values"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return [
+            datetime.fromisoformat(v['$date']) if isinstance(v, dict) and '$date' in v else v
+            for v in values
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid page cursor")
+
+
+def keyset_filter(sort: List[Tuple[str, int]], values: List[Any]) -> Dict[str, Any]:
+    """
+    Filter selecting rows strictly after `values` in `sort` order, e.g. for
+    [('detected_at', -1), ('id', -1)]:
+        {'$or': [{'detected_at': {'$lt': t}}, {'detected_at': t, 'id': {'$lt': id}}]}
+    """
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        branch[field] = {'$lt' if direction < 0 else '$gt': values[i]}
+        branches.append(branch)
+    return {'$or': branches}
+
+
+def page_cursor(docs: List[Dict[str, Any]], sort: List[Tuple[str, int]], limit: int) -> Optional[str]:
+    """Cursor for the page after docs, or None if docs was the last page"""
+    if len(docs) <= limit:
+        return None
+    last = docs[limit - 1]
+    return encode_cursor([last.get(field) for field, _ in sort])
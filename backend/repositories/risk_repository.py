@@ -1,19 +1,31 @@
 from .base import BaseRepository
+from .indexes import IndexSpec
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
+import asyncio
 
 
 class RiskRepository(BaseRepository):
+    # Alert access paths; `id` suffix serves keyset pagination
+    indexes = [
+        IndexSpec([('member_id', 1), ('detected_at', -1), ('id', -1)]),
+        IndexSpec([('org_id', 1), ('status', 1), ('detected_at', -1), ('id', -1)]),
+        # Tier-filtered org queue pages, and its per-tier counts covered by the index
+        IndexSpec([('org_id', 1), ('status', 1), ('tier', 1), ('detected_at', -1), ('id', -1)]),
+        IndexSpec([('status', 1), ('tier', 1)]),
+        IndexSpec([('member_id', 1), ('status', 1)]),
+        IndexSpec([('member_id', 1), ('updated_at', 1), ('id', 1)]),
+    ]
+    
+    PAGE_SORT = [('detected_at', -1), ('id', -1)]
+    
+    # Workflow states that still need attention
+    OPEN_STATUSES = ['new', 'acknowledged', 'in_progress']
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'risk_events')
     
-    async def create_indexes(self):
-        """Create indexes for alert queries"""
-        await self.collection.create_index([('member_id', 1), ('detected_at', -1)])
-        await self.collection.create_index([('org_id', 1), ('status', 1), ('detected_at', -1)])
-        await self.collection.create_index([('status', 1), ('tier', 1)])
-    
     async def find_by_member(
         self,
         member_id: str,
@@ -48,6 +60,79 @@ class RiskRepository(BaseRepository):
             doc.pop('_id', None)
         return docs
     
+    async def find_page_by_member(
+        self,
+        member_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page of a member's risk events, newest first"""
+        return await self.find_page({'member_id': member_id}, self.PAGE_SORT, limit=limit, cursor=cursor)
+    
+    async def find_page_by_org(
+        self,
+        org_id: str,
+        status: str = None,
+        tier: str = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page of an organization's risk events, newest first"""
+        query = {'org_id': org_id}
+        if status:
+            query['status'] = status
+        if tier:
+            query['tier'] = tier
+        return await self.find_page(query, self.PAGE_SORT, limit=limit, cursor=cursor)
+    
+    async def find_org_queue(
+        self,
+        org_id: str,
+        statuses: List[str],
+        tier: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], Dict[str, int]]:
+        """
+        Triage queue for an organization: a keyset page of events in `statuses`
+        (optionally one tier), newest first, plus per-tier counts across all
+        those statuses (ignoring the tier filter and cursor). The page is an
+        index-backed find; the counts run concurrently as a separate $group.
+        Returns (docs, next_cursor, tier_counts).
+        """
+        query: Dict[str, Any] = {'org_id': org_id, 'status': {'$in': statuses}}
+        page_query = {**query, 'tier': tier} if tier else query
+        (docs, next_cursor), rows = await asyncio.gather(
+            self.find_page(page_query, self.PAGE_SORT, limit=limit, cursor=cursor),
+            self.collection.aggregate([
+                {'$match': query},
+                {'$group': {'_id': '$tier', 'count': {'$sum': 1}}},
+            ]).to_list(length=None)
+        )
+        tier_counts = {row['_id']: row['count'] for row in rows if row['_id']}
+        return docs, next_cursor, tier_counts
+    
+    async def count_by_members(self, member_ids: List[str], statuses: List[str]) -> Dict[str, int]:
+        """Events in `statuses` per member for many members in one aggregation"""
+        if not member_ids:
+            return {}
+        rows = await self.collection.aggregate([
+            {'$match': {'member_id': {'$in': member_ids}, 'status': {'$in': statuses}}},
+            {'$group': {'_id': '$member_id', 'count': {'$sum': 1}}},
+        ]).to_list(length=None)
+        return {row['_id']: row['count'] for row in rows}
+    
+    async def version_marker(self, member_id: str) -> Tuple[Any, Any]:
+        """
+        Changes whenever a member's events are created or updated: the latest
+        detected_at and latest updated_at (two index seeks, for ETags)
+        """
+        query = {'member_id': member_id}
+        return tuple(await asyncio.gather(
+            self.max_value(query, 'detected_at'),
+            self.max_value(query, 'updated_at'),
+        ))
+    
     async def get_latest_by_member(self, member_id: str) -> Dict[str, Any]:
         """Get latest risk event for a member"""
         cursor = self.collection.find({'member_id': member_id}).sort('detected_at', -1).limit(1)
@@ -0,0 +1,476 @@
+"""
+Embedded SQLite storage for the time-series collections (metric samples and
+risk events) on small on-prem deployments.
+
+SQLiteDatabase exposes the same collection API as Motor for the collections it
+knows about, so MetricRepository and RiskRepository run on it unchanged:
+    
+    store = SQLiteDatabase('/var/lib/aegis/metrics.db')
+    metric_repo = MetricRepository(store)
+
+Each collection is a WITHOUT ROWID table clustered on its main access path
+(e.g. member_id, type, timestamp for metrics), so range queries read documents
+straight from the primary key b-tree. Filters and sorts on known columns are
+pushed down to SQL; anything else is evaluated in Python with the in-memory
+backend's matcher. Writes run on a single dedicated writer thread (WAL mode,
+batched executemany); reads use a small pool of reader connections.
+"""
+from bson import ObjectId
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import Optional, List, Dict, Any, Tuple, Callable
+from datetime import datetime, timezone
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+
+from .memory import (
+    InsertOneResult, InsertManyResult, UpdateResult, DeleteResult,
+    matches, sort_documents, project, run_pipeline, apply_update, upsert_seed,
+    _normalize_sort
+)
+
+# Extracted columns per collection; the primary key doubles as the clustering order
+SCHEMAS: Dict[str, Dict[str, List[str]]] = {
+    'metric_samples': {
+        'columns': ['id', 'member_id', 'type', 'timestamp', 'ingested_at'],
+        'primary_key': ['member_id', 'type', 'timestamp', '_id'],
+    },
+    'risk_events': {
+        'columns': ['id', 'member_id', 'org_id', 'status', 'tier', 'detected_at', 'updated_at'],
+        'primary_key': ['member_id', 'detected_at', '_id'],
+    },
+}
+
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+_PUSHDOWN_OPERATORS = {'$gt': '>', '$gte': '>=', '$lt': '<', '$lte': '<='}
+
+
+def _utc(value: datetime) -> datetime:
+    # Stored naive in UTC, matching what Motor returns
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _to_sql(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _utc(value).strftime(_DATETIME_FORMAT)
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$date': _utc(value).strftime(_DATETIME_FORMAT)}
+    if isinstance(value, ObjectId):
+        return {'$oid': str(value)}
+    raise TypeError(f"Cannot store {type(value).__name__}")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if '$date' in obj:
+            return datetime.strptime(obj['$date'], _DATETIME_FORMAT)
+        if '$oid' in obj:
+            return ObjectId(obj['$oid'])
+    return obj
+
+
+def _scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, datetime, ObjectId)) and not isinstance(value, bool)
+
+
+class SQLiteCursor:
+    def __init__(self, collection: 'SQLiteCollection', query: Dict[str, Any], projection: Any = None):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._buffer: Optional[List[Dict[str, Any]]] = None
+    
+    def sort(self, key_or_list: Any, direction: Optional[int] = None) -> 'SQLiteCursor':
+        self._sort.extend(_normalize_sort(key_or_list, direction))
+        return self
+    
+    def skip(self, skip: int) -> 'SQLiteCursor':
+        self._skip = skip
+        return self
+    
+    def limit(self, limit: int) -> 'SQLiteCursor':
+        self._limit = limit
+        return self
+    
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        limit = min(filter(None, [self._limit, length]), default=0)
+        docs = await self._collection._read(
+            self._collection._select, self._query, self._sort, self._skip, limit
+        )
+        return [project(d, self._projection) for d in docs]
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._buffer is None:
+            self._buffer = await self.to_list()
+        if not self._buffer:
+            raise StopAsyncIteration
+        return self._buffer.pop(0)
+
+
+class SQLiteAggregateCursor:
+    def __init__(self, collection: 'SQLiteCollection', pipeline: List[Dict[str, Any]]):
+        self._collection = collection
+        self._pipeline = pipeline
+    
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        pipeline = list(self._pipeline)
+        # Push a leading $match down to SQL
+        query = pipeline.pop(0)['$match'] if pipeline and '$match' in pipeline[0] else {}
+        docs = await self._collection._read(self._collection._select, query, [], 0, 0)
+        docs = run_pipeline(docs, pipeline, None)
+        return docs[:length] if length else docs
+
+
+class SQLiteCollection:
+    def __init__(self, database: 'SQLiteDatabase', name: str):
+        if name not in SCHEMAS:
+            raise KeyError(f"SQLite store has no schema for collection '{name}'")
+        self.database = database
+        self.name = name
+        self.columns = SCHEMAS[name]['columns']
+        self.primary_key = SCHEMAS[name]['primary_key']
+        self._all_columns = list(dict.fromkeys(['_id'] + self.columns + self.primary_key))
+        self._indexes: Dict[str, Dict[str, Any]] = {
+            '_id_': {'key': [('_id', 1)], 'v': 2},
+        }
+    
+    # ----- execution -----
+    
+    async def _read(self, fn: Callable, *args) -> Any:
+        return await self.database._run(self.database._reader, fn, *args)
+    
+    async def _write(self, fn: Callable, *args) -> Any:
+        return await self.database._run(self.database._writer, fn, *args)
+    
+    def _create_table(self, conn: sqlite3.Connection):
+        columns = ', '.join(f'"{c}"' for c in self._all_columns)
+        primary_key = ', '.join(f'"{c}"' for c in self.primary_key)
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{self.name}" ({columns}, doc TEXT NOT NULL, '
+            f'PRIMARY KEY ({primary_key})) WITHOUT ROWID'
+        )
+        conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{self.name}__id_" ON "{self.name}" ("_id")')
+    
+    # ----- SQL translation -----
+    
+    def _where(self, query: Dict[str, Any]) -> Tuple[str, List[Any], bool]:
+        """SQL WHERE for the pushable part of query; also whether all of it was pushed"""
+        clauses, params, complete = self._clauses(query)
+        return (' AND '.join(clauses) or '1'), params, complete
+    
+    def _clauses(self, query: Dict[str, Any]) -> Tuple[List[str], List[Any], bool]:
+        """
+        AND-ed SQL conditions for the pushable part of query. `$and` is
+        flattened; an `$or` is pushed only when every branch is (keyset
+        continuations from find_page/find_changes), else left to Python.
+        """
+        clauses, params, complete = [], [], True
+        for key, condition in query.items():
+            if key == '$and':
+                for part in condition:
+                    part_clauses, part_params, part_complete = self._clauses(part)
+                    clauses.extend(part_clauses)
+                    params.extend(part_params)
+                    complete = complete and part_complete
+                continue
+            if key == '$or':
+                branches = [self._clauses(branch) for branch in condition]
+                if not branches or not all(branch_complete for _, _, branch_complete in branches):
+                    complete = False
+                    continue
+                clauses.append('(' + ' OR '.join(
+                    '(' + (' AND '.join(branch_clauses) or '1') + ')' for branch_clauses, _, _ in branches
+                ) + ')')
+                for _, branch_params, _ in branches:
+                    params.extend(branch_params)
+                continue
+            if key not in self._all_columns:
+                complete = False
+                continue
+            if isinstance(condition, dict):
+                if not condition or not all(
+                    (op in _PUSHDOWN_OPERATORS and _scalar(v) and v is not None)
+                    or (op == '$in' and all(_scalar(x) and x is not None for x in v))
+                    for op, v in condition.items()
+                ):
+                    complete = False
+                    continue
+                for op, value in condition.items():
+                    if op == '$in':
+                        if not value:
+                            clauses.append('0')
+                        else:
+                            clauses.append(f'"{key}" IN ({", ".join("?" * len(value))})')
+                            params.extend(_to_sql(v) for v in value)
+                    else:
+                        clauses.append(f'"{key}" {_PUSHDOWN_OPERATORS[op]} ?')
+                        params.append(_to_sql(value))
+            elif condition is None:
+                clauses.append(f'"{key}" IS NULL')
+            elif _scalar(condition):
+                clauses.append(f'"{key}" = ?')
+                params.append(_to_sql(condition))
+            else:
+                complete = False
+        return clauses, params, complete
+    
+    def _row(self, doc: Dict[str, Any]) -> List[Any]:
+        values = []
+        for column in self._all_columns:
+            value = _to_sql(doc.get(column))
+            if value is None and column in self.primary_key:
+                value = ''
+            values.append(value)
+        return values + [json.dumps(doc, default=_encode)]
+    
+    def _load(self, rows: List[Tuple[str]]) -> List[Dict[str, Any]]:
+        return [json.loads(row[0], object_hook=_decode) for row in rows]
+    
+    def _select(
+        self,
+        conn: sqlite3.Connection,
+        query: Dict[str, Any],
+        sort: List[Tuple[str, int]],
+        skip: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        where, params, complete = self._where(query or {})
+        sql = f'SELECT doc FROM "{self.name}" WHERE {where}'
+        sort_pushed = complete and all(field in self._all_columns for field, _ in sort)
+        if sort_pushed:
+            if sort:
+                sql += ' ORDER BY ' + ', '.join(f'"{f}" {"DESC" if d < 0 else "ASC"}' for f, d in sort)
+            if limit or skip:
+                sql += f' LIMIT {limit or -1} OFFSET {skip}'
+        
+        docs = self._load(conn.execute(sql, params).fetchall())
+        if sort_pushed:
+            return docs
+        
+        docs = [d for d in docs if matches(d, query or {})]
+        if sort:
+            docs = sort_documents(docs, sort)
+        docs = docs[skip:]
+        return docs[:limit] if limit else docs
+    
+    def _count(self, conn: sqlite3.Connection, query: Dict[str, Any]) -> int:
+        where, params, complete = self._where(query)
+        if complete:
+            return conn.execute(f'SELECT COUNT(*) FROM "{self.name}" WHERE {where}', params).fetchone()[0]
+        return len(self._select(conn, query, [], 0, 0))
+    
+    # ----- writes (writer thread) -----
+    
+    def _insert_rows(self, conn: sqlite3.Connection, docs: List[Dict[str, Any]]):
+        placeholders = ', '.join('?' * (len(self._all_columns) + 1))
+        columns = ', '.join(f'"{c}"' for c in self._all_columns)
+        try:
+            with conn:
+                conn.executemany(
+                    f'INSERT INTO "{self.name}" ({columns}, doc) VALUES ({placeholders})',
+                    [self._row(d) for d in docs]
+                )
+        except sqlite3.IntegrityError as e:
+            raise DuplicateKeyError(str(e))
+    
+    def _replace_row(self, conn: sqlite3.Connection, doc: Dict[str, Any]):
+        conn.execute(f'DELETE FROM "{self.name}" WHERE "_id" = ?', [_to_sql(doc['_id'])])
+        placeholders = ', '.join('?' * (len(self._all_columns) + 1))
+        columns = ', '.join(f'"{c}"' for c in self._all_columns)
+        conn.execute(f'INSERT INTO "{self.name}" ({columns}, doc) VALUES ({placeholders})', self._row(doc))
+    
+    def _update(
+        self,
+        conn: sqlite3.Connection,
+        query: Dict[str, Any],
+        update: Dict[str, Any],
+        many: bool,
+        upsert: bool,
+        sort: List[Tuple[str, int]] = ()
+    ) -> Tuple[int, int, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Returns (matched, modified, document before, document after) of the first match"""
+        with conn:
+            docs = self._select(conn, query, list(sort), 0, 0 if many else 1)
+            if not docs:
+                if not upsert:
+                    return 0, 0, None, None
+                doc = upsert_seed(query)
+                apply_update(doc, update, inserting=True)
+                doc.setdefault('_id', ObjectId())
+                self._replace_row(conn, doc)
+                return 0, 0, None, doc
+            
+            modified = 0
+            before = copy.deepcopy(docs[0])
+            for doc in docs:
+                if apply_update(doc, update):
+                    modified += 1
+                    self._replace_row(conn, doc)
+            return len(docs), modified, before, docs[0]
+    
+    def _delete(self, conn: sqlite3.Connection, query: Dict[str, Any], many: bool) -> List[Dict[str, Any]]:
+        with conn:
+            docs = self._select(conn, query, [], 0, 0 if many else 1)
+            conn.executemany(
+                f'DELETE FROM "{self.name}" WHERE "_id" = ?',
+                [[_to_sql(d['_id'])] for d in docs]
+            )
+            return docs
+    
+    # ----- Motor-compatible API -----
+    
+    async def insert_one(self, document: Dict[str, Any], session: Any = None) -> InsertOneResult:
+        document.setdefault('_id', ObjectId())
+        await self._write(self._insert_rows, [document])
+        return InsertOneResult(document['_id'])
+    
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True, session: Any = None) -> InsertManyResult:
+        for document in documents:
+            document.setdefault('_id', ObjectId())
+        await self._write(self._insert_rows, documents)
+        return InsertManyResult([d['_id'] for d in documents])
+    
+    async def find_one(self, filter: Optional[Dict[str, Any]] = None, projection: Any = None, session: Any = None, sort: Any = None) -> Optional[Dict[str, Any]]:
+        sort = _normalize_sort(sort) if sort else []
+        docs = await self._read(self._select, filter or {}, sort, 0, 1)
+        return project(docs[0], projection) if docs else None
+    
+    def find(self, filter: Optional[Dict[str, Any]] = None, projection: Any = None, session: Any = None) -> SQLiteCursor:
+        return SQLiteCursor(self, filter or {}, projection)
+    
+    def aggregate(self, pipeline: List[Dict[str, Any]], session: Any = None, **kwargs) -> SQLiteAggregateCursor:
+        return SQLiteAggregateCursor(self, pipeline)
+    
+    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False, session: Any = None) -> UpdateResult:
+        matched, modified, _, after = await self._write(self._update, filter, update, False, upsert)
+        return UpdateResult(matched, modified, after['_id'] if after and not matched else None)
+    
+    async def update_many(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False, session: Any = None) -> UpdateResult:
+        matched, modified, _, after = await self._write(self._update, filter, update, True, upsert)
+        return UpdateResult(matched, modified, after['_id'] if after and not matched else None)
+    
+    async def find_one_and_update(
+        self,
+        filter: Dict[str, Any],
+        update: Dict[str, Any],
+        projection: Any = None,
+        sort: Any = None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        session: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        sort = _normalize_sort(sort) if sort else []
+        _, _, before, after = await self._write(self._update, filter, update, False, upsert, sort)
+        doc = after if return_document == ReturnDocument.AFTER else before
+        return project(doc, projection) if doc is not None else None
+    
+    async def find_one_and_delete(self, filter: Dict[str, Any], projection: Any = None, session: Any = None) -> Optional[Dict[str, Any]]:
+        docs = await self._write(self._delete, filter, False)
+        return project(docs[0], projection) if docs else None
+    
+    async def delete_one(self, filter: Dict[str, Any], session: Any = None) -> DeleteResult:
+        return DeleteResult(len(await self._write(self._delete, filter, False)))
+    
+    async def delete_many(self, filter: Dict[str, Any], session: Any = None) -> DeleteResult:
+        return DeleteResult(len(await self._write(self._delete, filter, True)))
+    
+    async def count_documents(self, filter: Dict[str, Any], session: Any = None, **kwargs) -> int:
+        return await self._read(self._count, filter or {})
+    
+    async def create_index(self, keys: Any, name: Optional[str] = None, **kwargs) -> str:
+        """Build a secondary SQL index when all key fields are columns; always recorded"""
+        keys = _normalize_sort(keys, 1)
+        name = name or '_'.join(f"{f}_{d}" for f, d in keys)
+        info = {'key': keys, 'v': 2}
+        for option in ('unique', 'sparse', 'expireAfterSeconds'):
+            if kwargs.get(option) is not None:
+                info[option] = kwargs[option]
+        
+        if all(field in self._all_columns for field, _ in keys) and [f for f, _ in keys] != self.primary_key[:len(keys)]:
+            columns = ', '.join(f'"{f}" {"DESC" if d < 0 else "ASC"}' for f, d in keys)
+            unique = 'UNIQUE ' if info.get('unique') else ''
+            
+            def build(conn: sqlite3.Connection):
+                with conn:
+                    conn.execute(f'CREATE {unique}INDEX IF NOT EXISTS "{self.name}_{name}" ON "{self.name}" ({columns})')
+            await self._write(build)
+        
+        self._indexes[name] = info
+        return name
+    
+    async def index_information(self) -> Dict[str, Dict[str, Any]]:
+        return copy.deepcopy(self._indexes)
+
+
+class SQLiteDatabase:
+    """
+    Motor-compatible database handle over a single SQLite file.
+    Only collections listed in SCHEMAS are available.
+    """
+    
+    def __init__(self, path: str, reader_threads: int = 4):
+        self.path = path
+        self.name = path
+        self.client = None
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._collections: Dict[str, SQLiteCollection] = {}
+        # All writes are serialized on one thread; SQLite allows a single writer anyway
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._reader = ThreadPoolExecutor(max_workers=reader_threads, thread_name_prefix="sqlite-reader")
+        
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        for name in SCHEMAS:
+            self[name]._create_table(conn)
+        conn.commit()
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=5000')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    async def _run(self, executor: ThreadPoolExecutor, fn: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, lambda: fn(self._connection(), *args))
+    
+    def __getitem__(self, name: str) -> SQLiteCollection:
+        if name not in self._collections:
+            self._collections[name] = SQLiteCollection(self, name)
+        return self._collections[name]
+    
+    def __getattr__(self, name: str) -> SQLiteCollection:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+    
+    def close(self):
+        self._writer.shutdown(wait=True)
+        self._reader.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
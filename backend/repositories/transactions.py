@@ -0,0 +1,39 @@
+from pymongo.errors import OperationFailure
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Clients found not to support transactions (standalone mongod), by id()
+_unsupported = set()
+
+
+def _transactions_unsupported(error: OperationFailure) -> bool:
+    # IllegalOperation on a standalone server: "Transaction numbers are only
+    # allowed on a replica set member or mongos"
+    return error.code == 20 or 'Transaction numbers' in str(error)
+
+
+async def run_in_transaction(db: Any, work: Callable[[Optional[Any]], Awaitable[T]]) -> T:
+    """
+    Run `await work(session)` in a multi-document transaction, retrying
+    transient errors. When the deployment cannot run transactions (standalone
+    MongoDB, the in-memory and SQLite backends) `work(None)` runs without one;
+    callers should then order their writes so a partial failure is harmless.
+    """
+    client = getattr(db, 'client', None)
+    if client is None or not hasattr(client, 'start_session') or id(client) in _unsupported:
+        return await work(None)
+    
+    try:
+        async with await client.start_session() as session:
+            return await session.with_transaction(work)
+    except OperationFailure as e:
+        if not _transactions_unsupported(e):
+            raise
+        logger.warning("MongoDB deployment does not support transactions; writing without one")
+        _unsupported.add(id(client))
+    # The first write in the transaction was rejected, so nothing was written
+    return await work(None)
@@ -1,16 +1,67 @@
 from .base import BaseRepository
+from .indexes import IndexSpec
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List
 
 
 class UserRepository(BaseRepository):
+    batch_loads = True
+    
+    # Fields whose change must revoke any cached authentication state
+    SECURITY_FIELDS = frozenset({'is_active', 'role', 'org_id', 'hashed_password'})
+    
+    indexes = [
+        IndexSpec([('email', 1)], unique=True),
+        IndexSpec([('reset_token', 1)], sparse=True),
+        IndexSpec([('verification_token', 1)], sparse=True),
+        IndexSpec([('oauth_provider', 1), ('oauth_sub', 1)], sparse=True),
+    ]
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'users')
+        self._security_listeners: List[Callable[[str], Any]] = []
+    
+    def on_security_change(self, listener: Callable[[str], Any]):
+        """Register a callback invoked with the user ID when security fields change"""
+        self._security_listeners.append(listener)
+    
+    def _notify_security_change(self, user_id: str):
+        for listener in self._security_listeners:
+            listener(user_id)
+    
+    async def update(
+        self,
+        id: str,
+        data: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Update user, invalidating cached principals on security changes"""
+        security_change = not self.SECURITY_FIELDS.isdisjoint(data)
+        if security_change:
+            # Invalidate before the write so no request re-caches stale state
+            self._notify_security_change(id)
+        result = await super().update(id, data, projection=projection)
+        if security_change:
+            self._notify_security_change(id)
+        return result
+    
+    async def delete(self, id: str, session: Any = None) -> bool:
+        """Delete user and invalidate cached principals"""
+        self._notify_security_change(id)
+        return await super().delete(id, session=session)
     
     async def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Find user by email"""
         return await self.find_one({'email': email})
     
+    async def find_by_emails(self, emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Find users for many emails in one query. Returns {email: user}."""
+        unique = list(dict.fromkeys(emails))
+        if not unique:
+            return {}
+        users = await self.find_many({'email': {'$in': unique}}, limit=len(unique))
+        return {user['email']: user for user in users}
+    
     async def find_by_oauth(self, provider: str, oauth_sub: str) -> Optional[Dict[str, Any]]:
         """Find user by OAuth provider and subject"""
         return await self.find_one({
@@ -1,77 +1,67 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, Header, status
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Header, Query, Request, Response, WebSocket, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 
 # Import models
 from models import (
     User, UserCreate, UserLogin, UserResponse, UserRole,
     Member, MemberCreate, MemberResponse,
     MetricSample, MetricSampleCreate, MetricSampleBulkCreate, MetricType,
-    RiskEvent, RiskEventCreate, RiskEventResponse, RiskEventUpdate, RiskTier,
+    RiskEvent, RiskEventCreate, RiskEventResponse, RiskEventUpdate, RiskTier, MemberStatus,
     Consent, ConsentCreate, ConsentType,
     DeviceAccount, DeviceAccountCreate
 )
 
-# Import repositories
-from repositories import (
-    UserRepository, MemberRepository, MetricRepository,
-    RiskRepository, ConsentRepository, DeviceRepository
-)
-
-# Import services
-from services import AuthService, MemberService, MetricService, RiskService
+# Import repositories and the dependency container
+from repositories import RiskRepository, cache_stats, query_metrics, InvalidCursor
+from container import Container
 
 # Import additional models
-from models import Caregiver, CaregiverCreate, CaregiverInvite, CaregiverOnMember
+from models import Caregiver, CaregiverCreate, CaregiverInvite, CaregiverOnMember, CaregiverBatchInvite, AuditAction
+
+from utils.password_hasher import password_hasher, PasswordHasherBusy
+from utils.fast_json import fast_json_response, prepare_fast_json
+from utils.etag import make_etag, etag_matches, etag_headers, not_modified
+from utils.compression import CompressionMiddleware
+from repositories.loader import use_request_loader
+from repositories.transactions import run_in_transaction
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
-# Initialize repositories
-user_repo = UserRepository(db)
-member_repo = MemberRepository(db)
-metric_repo = MetricRepository(db)
-risk_repo = RiskRepository(db)
-consent_repo = ConsentRepository(db)
-device_repo = DeviceRepository(db)
-
-# Import caregiver repository
-from repositories.caregiver_repository import CaregiverRepository, CaregiverMemberRepository
-caregiver_repo = CaregiverRepository(db)
-caregiver_member_repo = CaregiverMemberRepository(db)
-
-# Initialize services
-auth_service = AuthService(user_repo)
-member_service = MemberService(member_repo, consent_repo)
-metric_service = MetricService(metric_repo)
-risk_service = RiskService(risk_repo, metric_repo)
-
-# Create the main app
-app = FastAPI(
-    title="Aegis AI Wellness API",
-    description="Proactive wellness monitoring platform API",
-    version="1.0.0"
-)
+# Repositories and services, each built on first use (importing needs no MONGO_URL)
+container = Container()
+
+ALERT_STREAM_HEARTBEAT_SECONDS = float(os.environ.get('ALERT_STREAM_HEARTBEAT_SECONDS', '15'))
 
 # Security
 security = HTTPBearer()
 
-# Create API router
-api_router = APIRouter(prefix="/api")
+
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed auth load quickly instead of queueing behind bcrypt"""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+# Create API router; every request gets its own batched, memoized repository loader
+api_router = APIRouter(prefix="/api", dependencies=[Depends(use_request_loader)])
 
 
 # ==================== AUTH DEPENDENCY ====================
@@ -79,12 +69,36 @@ api_router = APIRouter(prefix="/api")
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    user = await auth_service.get_current_user(token)
+    user = await container.auth_service.get_current_user(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     return user
 
 
+async def require_member_access(user: User, member_id: str, permission: str):
+    """
+    Caregivers need an accepted relationship granting `permission` (e.g. 'can_view_alerts'),
+    and the member must not have withheld caregiver access or paused data sharing
+    """
+    if user.role != UserRole.CAREGIVER:
+        return
+    if not await container.caregiver_permissions.can(user.id, member_id, permission):
+        raise HTTPException(status_code=403, detail="Caregiver access not granted for this member")
+    if not await container.consent_snapshots.allows_caregivers(member_id):
+        raise HTTPException(status_code=403, detail="Member has paused or withheld data sharing")
+
+
+def audit(request: Request, action: AuditAction, user: Optional[User] = None, **kwargs):
+    """Record an audit event with the caller's address and user agent (never blocks)"""
+    container.audit_logger.record(
+        action,
+        user,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get('user-agent'),
+        **kwargs
+    )
+
+
 # ==================== AUTH ROUTES ====================
 
 class TokenResponse(BaseModel):
@@ -98,7 +112,7 @@ class TokenResponse(BaseModel):
 async def register(user_create: UserCreate):
     """Register a new user"""
     try:
-        user, access_token, refresh_token = await auth_service.register_user(user_create)
+        user, access_token, refresh_token = await container.auth_service.register_user(user_create)
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -109,16 +123,18 @@ async def register(user_create: UserCreate):
 
 
 @api_router.post("/auth/login", response_model=TokenResponse)
-async def login(user_login: UserLogin):
+async def login(user_login: UserLogin, request: Request):
     """Login with email and password"""
     try:
-        user, access_token, refresh_token = await auth_service.login_user(user_login)
+        user, access_token, refresh_token = await container.auth_service.login_user(user_login)
+        audit(request, AuditAction.LOGIN, user, resource_type="user", resource_id=user.id)
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
             user=UserResponse(**user.dict())
         )
     except ValueError as e:
+        audit(request, AuditAction.LOGIN, user_email=user_login.email, success=False, error_message=str(e))
         raise HTTPException(status_code=401, detail=str(e))
 
 
@@ -130,7 +146,7 @@ class RefreshTokenRequest(BaseModel):
 async def refresh_token(request: RefreshTokenRequest):
     """Refresh access token"""
     try:
-        access_token = await auth_service.refresh_access_token(request.refresh_token)
+        access_token = await container.auth_service.refresh_access_token(request.refresh_token)
         return {"access_token": access_token, "token_type": "bearer"}
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
@@ -143,7 +159,7 @@ class PasswordResetRequest(BaseModel):
 @api_router.post("/auth/password-reset-request")
 async def request_password_reset(request: PasswordResetRequest):
     """Request password reset (generates token)"""
-    token = await auth_service.request_password_reset(request.email)
+    token = await container.auth_service.request_password_reset(request.email)
     # In production, send email with token
     return {"message": "If email exists, reset instructions will be sent", "token": token}
 
@@ -154,19 +170,42 @@ class PasswordResetConfirm(BaseModel):
 
 
 @api_router.post("/auth/password-reset-confirm")
-async def confirm_password_reset(request: PasswordResetConfirm):
+async def confirm_password_reset(request: PasswordResetConfirm, http_request: Request):
     """Reset password with token"""
     try:
-        await auth_service.reset_password(request.reset_token, request.new_password)
+        await container.auth_service.reset_password(request.reset_token, request.new_password)
+        audit(http_request, AuditAction.PASSWORD_RESET)
         return {"message": "Password reset successful"}
     except ValueError as e:
+        audit(http_request, AuditAction.PASSWORD_RESET, success=False, error_message=str(e))
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_me(current_user: User = Depends(get_current_user)):
     """Get current user profile"""
-    return UserResponse(**current_user.dict())
+    # The principal carries only authorization fields
+    user_data = await container.user_repo.find_by_id(current_user.id)
+    if not user_data:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserResponse(**user_data)
+
+
+class PushTokenRequest(BaseModel):
+    token: str
+    provider: str = "expo"
+
+
+@api_router.put("/auth/me/push-token")
+async def register_push_token(
+    request: PushTokenRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Register the device's push token for alert notifications"""
+    if request.provider not in container.push_providers:
+        raise HTTPException(status_code=400, detail=f"Unsupported push provider: {request.provider}")
+    await container.user_repo.update(current_user.id, {'push_token': request.token, 'push_provider': request.provider})
+    return {"message": "Push token registered"}
 
 
 # ==================== MEMBER ROUTES ====================
@@ -174,31 +213,118 @@ async def get_me(current_user: User = Depends(get_current_user)):
 @api_router.post("/members", response_model=MemberResponse, status_code=status.HTTP_201_CREATED)
 async def create_member(
     member_create: MemberCreate,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """Create a new member profile"""
-    member = await member_service.create_member(member_create)
+    member = await container.member_service.create_member(member_create)
+    audit(request, AuditAction.CREATE_MEMBER, current_user, resource_type="member", resource_id=member.id, org_id=member.org_id)
     return MemberResponse(**member.dict())
 
 
 @api_router.get("/members/me", response_model=MemberResponse)
 async def get_my_member_profile(current_user: User = Depends(get_current_user)):
     """Get current user's member profile"""
-    member = await member_service.get_member_by_user(current_user.id)
+    member = await container.member_service.get_member_by_user(current_user.id)
     if not member:
         raise HTTPException(status_code=404, detail="Member profile not found")
     return MemberResponse(**member.dict())
 
 
+class DailyMetric(BaseModel):
+    type: str
+    day: str  # YYYY-MM-DD (UTC)
+    avg: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    count: int
+
+
+class DeviceSyncStatus(BaseModel):
+    id: str
+    device_type: str
+    device_name: Optional[str] = None
+    is_active: bool
+    last_sync_at: Optional[datetime] = None
+    last_sync_status: Optional[str] = None
+
+
+class MemberHome(BaseModel):
+    member: MemberResponse
+    current_risk: Optional[RiskEvent] = None
+    metrics: List[DailyMetric]
+    devices: List[DeviceSyncStatus]
+    caregiver_count: int
+
+
+@api_router.get("/members/me/home", response_model=MemberHome)
+async def get_my_home(
+    days: int = Query(7, ge=1, le=31),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Everything the app's home screen needs in one round trip: profile, current
+    risk, daily metric summaries, device sync status and caregiver count.
+    """
+    member = await container.member_service.get_member_by_user(current_user.id)
+    if not member:
+        raise HTTPException(status_code=404, detail="Member profile not found")
+    
+    risk, metrics, devices, caregiver_count = await asyncio.gather(
+        container.risk_service.get_latest_member_risk(member.id),
+        container.metric_service.get_daily_summary(member.id, days=days),
+        container.device_repo.find_by_member(member.id),
+        container.caregiver_member_repo.count_by_member(member.id)
+    )
+    return MemberHome(
+        member=MemberResponse(**member.dict()),
+        current_risk=risk,
+        metrics=[DailyMetric(**m) for m in metrics],
+        devices=[DeviceSyncStatus(**d) for d in devices],
+        caregiver_count=caregiver_count
+    )
+
+
+class MemberSync(BaseModel):
+    metrics: List[MetricSample]
+    alerts: List[RiskEvent]
+    consents: List[Consent]
+    devices: List[DeviceSyncStatus]
+    cursor: str
+    has_more: bool
+
+
+@api_router.get("/members/{member_id}/sync", response_model=MemberSync)
+async def sync_member(
+    member_id: str,
+    since: Optional[str] = None,
+    days: int = Query(7, ge=1, le=90),
+    limit: int = Query(1000, ge=1, le=5000),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Metrics, alerts, consents and devices changed since the `since` cursor.
+    Without a cursor returns the last `days` of metrics and alerts plus all
+    consents and devices. Pass the returned cursor next time; repeat
+    immediately while `has_more` is true.
+    """
+    await require_member_access(current_user, member_id, 'can_view_metrics')
+    await require_member_access(current_user, member_id, 'can_view_alerts')
+    changes = await container.sync_service.changes(member_id, cursor=since, days=days, limit=limit)
+    return fast_json_response(MemberSync, changes)
+
+
 @api_router.get("/members/{member_id}", response_model=MemberResponse)
 async def get_member(
     member_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """Get member by ID"""
-    member = await member_service.get_member(member_id)
+    member = await container.member_service.get_member(member_id)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
+    audit(request, AuditAction.VIEW_MEMBER, current_user, resource_type="member", resource_id=member_id, org_id=member.org_id)
     return MemberResponse(**member.dict())
 
 
@@ -206,18 +332,16 @@ async def get_member(
 async def update_member(
     member_id: str,
     updates: dict,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """Update member profile"""
-    # Validate member exists
-    member = await member_service.get_member(member_id)
-    if not member:
-        raise HTTPException(status_code=404, detail="Member not found")
-    
-    # Update member
-    updated_member = await member_repo.update(member_id, updates)
+    updated_member = await container.member_repo.update(member_id, updates)
     if not updated_member:
-        raise HTTPException(status_code=400, detail="Update failed")
+        raise HTTPException(status_code=404, detail="Member not found")
+    audit(request, AuditAction.UPDATE_MEMBER, current_user, resource_type="member", resource_id=member_id, details={'fields': sorted(updates)})
+    # May change data_sharing_enabled
+    container.consent_snapshots.invalidate(member_id)
     
     return {"message": "Profile updated successfully", "member": updated_member}
 
@@ -232,9 +356,7 @@ async def pause_data_sharing(
     from datetime import timedelta
     paused_until = datetime.utcnow() + timedelta(hours=duration_hours)
     
-    await member_repo.update(member_id, {
-        'data_sharing_paused_until': paused_until
-    })
+    await container.member_service.pause_data_sharing(member_id, paused_until)
     
     return {
         "message": f"Data sharing paused for {duration_hours} hours",
@@ -248,9 +370,7 @@ async def resume_data_sharing(
     current_user: User = Depends(get_current_user)
 ):
     """Resume data sharing"""
-    await member_repo.update(member_id, {
-        'data_sharing_paused_until': None
-    })
+    await container.member_service.resume_data_sharing(member_id)
     
     return {"message": "Data sharing resumed"}
 
@@ -258,12 +378,13 @@ async def resume_data_sharing(
 @api_router.get("/members/{member_id}/export-data")
 async def export_member_data(
     member_id: str,
+    request: Request,
     format: str = "json",
     current_user: User = Depends(get_current_user)
 ):
     """Export all member data (GDPR compliance)"""
     # Get member profile
-    member = await member_service.get_member(member_id)
+    member = await container.member_service.get_member(member_id)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     
@@ -272,10 +393,10 @@ async def export_member_data(
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=365)  # Last year
     
-    metrics = await metric_repo.find_by_member(member_id, start_date, end_date, limit=10000)
-    alerts = await risk_repo.find_by_member(member_id, limit=1000)
-    consents = await consent_repo.find_by_member(member_id)
-    devices = await device_repo.find_by_member(member_id)
+    metrics = await container.metric_repo.find_by_member(member_id, start_date, end_date, limit=10000)
+    alerts = await container.risk_repo.find_by_member(member_id, limit=1000)
+    consents = await container.consent_repo.find_by_member(member_id)
+    devices = await container.device_repo.find_by_member(member_id)
     
     export_data = {
         "member_profile": member.dict(),
@@ -290,6 +411,10 @@ async def export_member_data(
         }
     }
     
+    audit(
+        request, AuditAction.EXPORT_DATA, current_user, resource_type="member", resource_id=member_id,
+        org_id=member.org_id, details={'metrics': len(metrics), 'alerts': len(alerts)}
+    )
     return export_data
 
 
@@ -297,25 +422,36 @@ async def export_member_data(
 async def delete_member_account(
     member_id: str,
     confirmation: str,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """Delete member account and all data"""
     if confirmation != "DELETE":
         raise HTTPException(status_code=400, detail="Confirmation required")
     
-    # Delete member data
-    await metric_repo.collection.delete_many({'member_id': member_id})
-    await risk_repo.collection.delete_many({'member_id': member_id})
-    await consent_repo.collection.delete_many({'member_id': member_id})
-    await device_repo.collection.delete_many({'member_id': member_id})
-    await caregiver_member_repo.collection.delete_many({'member_id': member_id})
+    # Time series first, outside the transaction: they can be large, may live in
+    # the separate metric store, and deleting them again on a retry is harmless
+    await container.metric_repo.delete_many({'member_id': member_id})
+    await container.risk_repo.delete_many({'member_id': member_id})
+    
+    async def delete_records(session):
+        # Member profile last: without a transaction, a retry still finds the account
+        await container.consent_repo.delete_many({'member_id': member_id}, session=session)
+        await container.device_repo.delete_many({'member_id': member_id}, session=session)
+        await container.caregiver_member_repo.delete_many({'member_id': member_id}, session=session)
+        await container.status_repo.delete_many({'member_id': member_id}, session=session)
+        await container.outbox_repo.delete_for_member(member_id, session=session)
+        await container.member_repo.delete(member_id, session=session)
     
-    # Delete member profile
-    await member_repo.delete(member_id)
+    await run_in_transaction(container.db, delete_records)
+    # Again after commit, in case a read re-cached the member mid-transaction
+    await container.member_repo.invalidate(member_id)
+    container.consent_snapshots.invalidate(member_id)
     
     # Deactivate user
-    await user_repo.update(current_user.id, {'is_active': False})
+    await container.user_repo.update(current_user.id, {'is_active': False})
     
+    audit(request, AuditAction.DELETE_MEMBER, current_user, resource_type="member", resource_id=member_id)
     return {"message": "Account deleted successfully"}
 
 
@@ -325,15 +461,20 @@ async def delete_member_account(
 async def grant_consent(
     member_id: str,
     consent_create: ConsentCreate,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """Grant or revoke consent"""
-    consent = await member_service.grant_consent(
+    consent = await container.member_service.grant_consent(
         member_id,
         consent_create.consent_type,
         consent_create.granted,
         consent_create.source
     )
+    audit(
+        request, AuditAction.GRANT_CONSENT if consent_create.granted else AuditAction.REVOKE_CONSENT, current_user,
+        resource_type="consent", resource_id=member_id, details={'consent_type': consent_create.consent_type.value}
+    )
     return consent
 
 
@@ -343,7 +484,7 @@ async def get_member_consents(
     current_user: User = Depends(get_current_user)
 ):
     """Get all consents for a member"""
-    consents = await member_service.get_member_consents(member_id)
+    consents = await container.member_service.get_member_consents(member_id)
     return consents
 
 
@@ -355,7 +496,9 @@ async def ingest_metric(
     current_user: User = Depends(get_current_user)
 ):
     """Ingest a single metric sample"""
-    sample = await metric_service.ingest_sample(sample_create)
+    if not await container.consent_snapshots.allows_collection(sample_create.member_id):
+        raise HTTPException(status_code=403, detail="Member has not consented to data collection")
+    sample = await container.metric_service.ingest_sample(sample_create)
     return sample
 
 
@@ -364,21 +507,40 @@ async def ingest_metrics_bulk(
     bulk_create: MetricSampleBulkCreate,
     current_user: User = Depends(get_current_user)
 ):
-    """Bulk ingest metric samples"""
-    count = await metric_service.ingest_samples_bulk(bulk_create.samples)
-    return {"ingested_count": count}
+    """
+    Bulk ingest metric samples. Samples for members without data collection
+    consent are skipped and counted in `rejected_count`.
+    """
+    snapshots = await container.consent_snapshots.get_many([s.member_id for s in bulk_create.samples])
+    allowed = [
+        s for s in bulk_create.samples
+        if s.member_id in snapshots and snapshots[s.member_id].collection_allowed
+    ]
+    count = await container.metric_service.ingest_samples_bulk(allowed)
+    return {"ingested_count": count, "rejected_count": len(bulk_create.samples) - len(allowed)}
 
 
 @api_router.get("/members/{member_id}/metrics", response_model=List[MetricSample])
 async def get_member_metrics(
     member_id: str,
+    request: Request,
     metric_type: Optional[str] = None,
     days: int = 7,
     current_user: User = Depends(get_current_user)
 ):
-    """Get metrics for a member"""
-    metrics = await metric_service.get_member_metrics(member_id, metric_type, days)
-    return metrics
+    """Get metrics for a member (conditional: honours If-None-Match)"""
+    await require_member_access(current_user, member_id, 'can_view_metrics')
+    marker = await container.metric_repo.version_marker(member_id, datetime.utcnow() - timedelta(days=days), metric_type)
+    etag = make_etag('metrics', member_id, metric_type, days, *marker)
+    audit(
+        request, AuditAction.VIEW_METRICS, current_user, resource_type="member", resource_id=member_id,
+        details={'metric_type': metric_type, 'days': days}
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    metrics = await container.metric_service.get_member_metric_rows(member_id, metric_type, days)
+    return fast_json_response(List[MetricSample], metrics, headers=etag_headers(etag))
 
 
 # ==================== RISK/ALERTS ROUTES ====================
@@ -390,11 +552,11 @@ async def analyze_member_risk(
 ):
     """Analyze member risk and create alert if needed"""
     # Get member to get org_id
-    member = await member_service.get_member(member_id)
+    member = await container.member_service.get_member(member_id)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     
-    risk_event = await risk_service.analyze_member_risk(member_id, member.org_id)
+    risk_event = await container.risk_service.analyze_member_risk(member_id, member.org_id)
     if not risk_event:
         raise HTTPException(status_code=200, detail="No risk detected, member is healthy")
     return risk_event
@@ -403,43 +565,278 @@ async def analyze_member_risk(
 @api_router.get("/members/{member_id}/alerts", response_model=List[RiskEvent])
 async def get_member_alerts(
     member_id: str,
+    request: Request,
     limit: int = 50,
     current_user: User = Depends(get_current_user)
 ):
-    """Get risk events/alerts for a member"""
-    alerts = await risk_service.get_member_alerts(member_id, limit)
-    return alerts
+    """Get risk events/alerts for a member (conditional: honours If-None-Match)"""
+    await require_member_access(current_user, member_id, 'can_view_alerts')
+    etag = make_etag('alerts', member_id, limit, *await container.risk_repo.version_marker(member_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    alerts = await container.risk_service.get_member_alert_rows(member_id, limit)
+    return fast_json_response(List[RiskEvent], alerts, headers=etag_headers(etag))
+
+
+class AlertPage(BaseModel):
+    items: List[RiskEvent]
+    next_cursor: Optional[str] = None
+
+
+@api_router.get("/members/{member_id}/alerts/page", response_model=AlertPage)
+async def get_member_alerts_page(
+    member_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Cursor-paginated alerts for a member, newest first; pass back `next_cursor` for the next page"""
+    await require_member_access(current_user, member_id, 'can_view_alerts')
+    alerts, next_cursor = await container.risk_repo.find_page_by_member(member_id, limit=limit, cursor=cursor)
+    return fast_json_response(AlertPage, {'items': alerts, 'next_cursor': next_cursor})
 
 
 @api_router.get("/members/{member_id}/current-risk", response_model=Optional[RiskEvent])
 async def get_current_risk(
     member_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
-    """Get latest risk status for a member"""
-    risk = await risk_service.get_latest_member_risk(member_id)
+    """Get latest risk status for a member (conditional: honours If-None-Match)"""
+    await require_member_access(current_user, member_id, 'can_view_alerts')
+    etag = make_etag('current-risk', member_id, *await container.risk_repo.version_marker(member_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    risk = await container.risk_service.get_latest_member_risk(member_id)
+    response.headers.update(etag_headers(etag))
     return risk
 
 
+async def can_watch_member(user: User, member_id: str) -> Optional[str]:
+    """
+    How `user` may watch the member's alerts: 'member' (the member themself),
+    'care_team' (care manager or org admin of the member's org) or 'caregiver'
+    (accepted, allowed to view alerts); None if not allowed
+    """
+    member = await container.member_repo.find_by_id(member_id)
+    if not member:
+        return None
+    if member['user_id'] == user.id:
+        return 'member'
+    if user.role in (UserRole.CARE_MANAGER, UserRole.ORG_ADMIN):
+        return 'care_team' if user.org_id == member['org_id'] else None
+    if (
+        await container.caregiver_permissions.can(user.id, member_id, 'can_view_alerts')
+        and await container.consent_snapshots.allows_caregivers(member_id)
+    ):
+        return 'caregiver'
+    return None
+
+
+async def still_watching(user: User, member_id: str, access: str) -> bool:
+    """
+    Re-checked before each stream delivery, so deleting the member, pausing
+    sharing or revoking a caregiver ends open streams. Reads the in-memory
+    consent snapshot and permission index (both invalidated by the writes
+    that change them), no database round trip while they are cached.
+    """
+    snapshot = await container.consent_snapshots.get(member_id)
+    if snapshot is None:
+        return False
+    if access != 'caregiver':
+        return True
+    return (
+        snapshot.allows_caregivers()
+        and await container.caregiver_permissions.can(user.id, member_id, 'can_view_alerts')
+    )
+
+
+@api_router.get("/members/{member_id}/alerts/stream")
+async def stream_member_alerts(
+    member_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Server-Sent Events stream of a member's new and updated alerts
+    (`risk_event.created` / `risk_event.updated`). Replaces polling current-risk.
+    """
+    access = await can_watch_member(current_user, member_id)
+    if not access:
+        raise HTTPException(status_code=403, detail="Not allowed to watch this member")
+    
+    subscription = container.alert_hub.subscribe(member_id)
+    
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), ALERT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected() or not await still_watching(current_user, member_id, access):
+                        break
+                    # Comment line keeps proxies from closing the idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                if not await still_watching(current_user, member_id, access):
+                    break
+                yield f"event: {message.type}\ndata: {message.payload}\n\n"
+        finally:
+            container.alert_hub.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@api_router.websocket("/ws/members/{member_id}/alerts")
+async def alerts_websocket(websocket: WebSocket, member_id: str, token: str = ""):
+    """
+    WebSocket variant of the alert stream. Browsers cannot set headers on
+    WebSockets, so the access token is passed as `?token=`.
+    """
+    user = await container.auth_service.get_current_user(token) if token else None
+    access = await can_watch_member(user, member_id) if user else None
+    if not access:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    subscription = container.alert_hub.subscribe(member_id)
+    
+    async def forward():
+        while True:
+            message = await subscription.get()
+            if not await still_watching(user, member_id, access):
+                await websocket.close(code=1008)
+                return
+            await websocket.send_text(message.to_json())
+    
+    sender = asyncio.create_task(forward())
+    try:
+        # Client messages are ignored; receiving is how a disconnect is noticed
+        while (await websocket.receive())['type'] != 'websocket.disconnect':
+            pass
+    finally:
+        sender.cancel()
+        container.alert_hub.unsubscribe(subscription)
+
+
 @api_router.patch("/alerts/{alert_id}", response_model=RiskEvent)
 async def update_alert(
     alert_id: str,
     update: RiskEventUpdate,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """Update alert status"""
-    alert_data = await risk_repo.find_by_id(alert_id)
-    if not alert_data:
-        raise HTTPException(status_code=404, detail="Alert not found")
-    
     update_data = update.dict(exclude_unset=True)
     if update.status == "acknowledged" and "acknowledged_at" not in update_data:
         update_data["acknowledged_at"] = datetime.utcnow()
     if update.status == "resolved" and "resolved_at" not in update_data:
         update_data["resolved_at"] = datetime.utcnow()
     
-    updated = await risk_repo.update(alert_id, update_data)
-    return RiskEvent(**updated)
+    updated = await container.risk_service.update_alert(alert_id, update_data)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    if update.status in ("acknowledged", "resolved"):
+        action = AuditAction.ACKNOWLEDGE_ALERT if update.status == "acknowledged" else AuditAction.RESOLVE_ALERT
+        audit(request, action, current_user, resource_type="alert", resource_id=alert_id, org_id=updated.org_id)
+    return updated
+
+
+# ==================== ORGANIZATION ROUTES ====================
+
+class MemberPage(BaseModel):
+    items: List[MemberResponse]
+    next_cursor: Optional[str] = None
+
+
+@api_router.get("/orgs/{org_id}/members", response_model=MemberPage)
+async def get_org_members(
+    org_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Cursor-paginated members of an organization, newest first (care team only)"""
+    if current_user.role not in (UserRole.CARE_MANAGER, UserRole.ORG_ADMIN) or current_user.org_id != org_id:
+        raise HTTPException(status_code=403, detail="Care team access required")
+    
+    members, next_cursor = await container.member_repo.find_page_by_org(org_id, limit=limit, cursor=cursor)
+    return MemberPage(items=[MemberResponse(**Member(**m).dict()) for m in members], next_cursor=next_cursor)
+
+
+class OrgAlert(RiskEvent):
+    member_name: Optional[str] = None
+
+
+class OrgAlertQueue(BaseModel):
+    items: List[OrgAlert]
+    next_cursor: Optional[str] = None
+    tier_counts: Dict[str, int]
+
+
+@api_router.get("/orgs/{org_id}/alerts", response_model=OrgAlertQueue)
+async def get_org_alerts(
+    org_id: str,
+    status: Optional[List[str]] = Query(None),
+    tier: Optional[RiskTier] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Care-team triage queue: the organization's alerts (open ones by default),
+    newest first, with per-tier counts and member names.
+    """
+    if current_user.role not in (UserRole.CARE_MANAGER, UserRole.ORG_ADMIN) or current_user.org_id != org_id:
+        raise HTTPException(status_code=403, detail="Care team access required")
+    
+    alerts, next_cursor, tier_counts = await container.risk_repo.find_org_queue(
+        org_id,
+        statuses=status or RiskRepository.OPEN_STATUSES,
+        tier=tier.value if tier else None,
+        limit=limit,
+        cursor=cursor
+    )
+    members = await container.member_repo.find_by_ids([a['member_id'] for a in alerts])
+    
+    items = []
+    for alert in alerts:
+        member = members.get(alert['member_id'])
+        name = f"{member.get('first_name', '')} {member.get('last_name', '')}".strip() if member else None
+        items.append(OrgAlert(**alert, member_name=name))
+    return OrgAlertQueue(items=items, next_cursor=next_cursor, tier_counts=tier_counts)
+
+
+class RosterPage(BaseModel):
+    items: List[MemberStatus]
+    next_cursor: Optional[str] = None
+
+
+@api_router.get("/orgs/{org_id}/roster", response_model=RosterPage)
+async def get_org_roster(
+    org_id: str,
+    tier: Optional[RiskTier] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Members of an organization with their current tier, from the materialized status collection"""
+    if current_user.role not in (UserRole.CARE_MANAGER, UserRole.ORG_ADMIN) or current_user.org_id != org_id:
+        raise HTTPException(status_code=403, detail="Care team access required")
+    
+    statuses, next_cursor = await container.status_repo.find_roster(
+        org_id, tier=tier.value if tier else None, limit=limit, cursor=cursor
+    )
+    return RosterPage(items=[MemberStatus(**s) for s in statuses], next_cursor=next_cursor)
 
 
 # ==================== DEVICE ROUTES ====================
@@ -450,12 +847,10 @@ async def connect_device(
     current_user: User = Depends(get_current_user)
 ):
     """Connect a health device/data source"""
-    device_data = device_create.dict()
-    device_data['connected_at'] = datetime.utcnow()
-    device_data['updated_at'] = datetime.utcnow()
-    device_data['is_active'] = True
+    # Build the full model so the stored document carries its id and sync timestamps
+    device_data = DeviceAccount(**device_create.dict(), is_active=True).dict()
     
-    created = await device_repo.create(device_data)
+    created = await container.device_repo.create(device_data)
     return DeviceAccount(**created)
 
 
@@ -465,7 +860,7 @@ async def get_member_devices(
     current_user: User = Depends(get_current_user)
 ):
     """Get all device accounts for a member"""
-    devices = await device_repo.find_by_member(member_id)
+    devices = await container.device_repo.find_by_member(member_id)
     return [DeviceAccount(**d) for d in devices]
 
 
@@ -481,11 +876,11 @@ async def invite_caregiver(
     import uuid
     
     # Check if user already exists
-    existing_user = await user_repo.find_by_email(invite.email)
+    existing_user = await container.user_repo.find_by_email(invite.email)
     
     if existing_user:
         # User exists, create caregiver profile if doesn't exist
-        caregiver_data = await caregiver_repo.find_by_user_id(existing_user['id'])
+        caregiver_data = await container.caregiver_repo.find_by_user_id(existing_user['id'])
         if not caregiver_data:
             caregiver_data = {
                 'id': str(uuid.uuid4()),
@@ -496,7 +891,7 @@ async def invite_caregiver(
                 'created_at': datetime.utcnow(),
                 'updated_at': datetime.utcnow()
             }
-            caregiver_data = await caregiver_repo.create(caregiver_data)
+            caregiver_data = await container.caregiver_repo.create(caregiver_data)
         
         caregiver_id = caregiver_data['id']
     else:
@@ -513,7 +908,7 @@ async def invite_caregiver(
             'created_at': datetime.utcnow(),
             'updated_at': datetime.utcnow()
         }
-        await user_repo.create(user_data)
+        await container.user_repo.create(user_data)
         
         caregiver_id = str(uuid.uuid4())
         caregiver_data = {
@@ -525,7 +920,7 @@ async def invite_caregiver(
             'created_at': datetime.utcnow(),
             'updated_at': datetime.utcnow()
         }
-        await caregiver_repo.create(caregiver_data)
+        await container.caregiver_repo.create(caregiver_data)
     
     # Create relationship
     relationship_data = {
@@ -539,7 +934,7 @@ async def invite_caregiver(
         'invitation_sent_at': datetime.utcnow(),
         'created_at': datetime.utcnow()
     }
-    relationship = await caregiver_member_repo.create(relationship_data)
+    relationship = await container.caregiver_member_repo.create(relationship_data)
     
     # TODO: Send email invitation
     
@@ -550,25 +945,60 @@ async def invite_caregiver(
     }
 
 
+class CaregiverInviteResult(BaseModel):
+    email: str
+    status: str  # "invited", "already_invited", "duplicate"
+    caregiver_id: Optional[str] = None
+    relationship_id: Optional[str] = None  # accepts the invitation; delivered by the caller
+    user_created: bool = False
+
+
+class CaregiverBatchInviteResponse(BaseModel):
+    invited: int
+    results: List[CaregiverInviteResult]
+
+
+@api_router.post("/members/{member_id}/caregivers/invite-batch", response_model=CaregiverBatchInviteResponse)
+async def invite_caregivers_batch(
+    member_id: str,
+    batch: CaregiverBatchInvite,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Invite up to 500 caregivers for a member in one request (facility onboarding).
+    Allowed for the member themself and care managers/org admins of the member's organization.
+    
+    No email or push is sent: each invited result carries the `relationship_id`
+    the caregiver accepts with (POST /caregivers/{relationship_id}/accept), and
+    the caller is responsible for delivering it.
+    """
+    member = await container.member_repo.find_by_id(member_id)
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    if member['user_id'] != current_user.id and not (
+        current_user.role in (UserRole.CARE_MANAGER, UserRole.ORG_ADMIN) and current_user.org_id == member['org_id']
+    ):
+        raise HTTPException(status_code=403, detail="Not allowed to invite caregivers for this member")
+    
+    try:
+        results = await container.caregiver_invitations.invite_batch(member_id, [i.dict() for i in batch.invites])
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return CaregiverBatchInviteResponse(
+        invited=sum(1 for r in results if r['status'] == 'invited'),
+        results=[CaregiverInviteResult(**r) for r in results]
+    )
+
+
 @api_router.get("/members/{member_id}/caregivers")
 async def get_member_caregivers(
     member_id: str,
     current_user: User = Depends(get_current_user)
 ):
     """Get all caregivers for a member"""
-    relationships = await caregiver_member_repo.find_by_member(member_id)
-    
-    # Enrich with caregiver details
-    enriched = []
-    for rel in relationships:
-        caregiver_data = await caregiver_repo.find_by_id(rel['caregiver_id'])
-        if caregiver_data:
-            enriched.append({
-                **rel,
-                'caregiver': caregiver_data
-            })
-    
-    return enriched
+    # Relationships joined with caregiver details in a single query
+    return await container.caregiver_member_repo.find_by_member_with_caregivers(member_id)
 
 
 @api_router.delete("/caregivers/{relationship_id}")
@@ -577,7 +1007,7 @@ async def remove_caregiver(
     current_user: User = Depends(get_current_user)
 ):
     """Remove a caregiver from care circle"""
-    success = await caregiver_member_repo.delete(relationship_id)
+    success = await container.caregiver_member_repo.delete(relationship_id)
     if not success:
         raise HTTPException(status_code=404, detail="Caregiver relationship not found")
     return {"message": "Caregiver removed successfully"}
@@ -589,12 +1019,101 @@ async def accept_caregiver_invitation(
     current_user: User = Depends(get_current_user)
 ):
     """Accept a caregiver invitation"""
-    success = await caregiver_member_repo.accept_invitation(relationship_id)
+    success = await container.caregiver_member_repo.accept_invitation(relationship_id)
     if not success:
         raise HTTPException(status_code=404, detail="Invitation not found")
     return {"message": "Invitation accepted"}
 
 
+# Vitals summarized on the caregiver dashboard
+DASHBOARD_VITALS = [MetricType.HRV.value, MetricType.RESTING_HR.value, MetricType.STEPS.value, MetricType.SLEEP_EFFICIENCY.value]
+
+
+class DashboardMember(BaseModel):
+    member_id: str
+    relationship_id: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    can_view_alerts: bool
+    can_view_metrics: bool
+    # Present only with can_view_alerts
+    tier: Optional[str] = None
+    score: Optional[float] = None
+    open_alerts: Optional[int] = None
+    # Present only with can_view_metrics
+    last_sample_at: Optional[datetime] = None
+    vitals: Optional[Dict[str, dict]] = None
+
+
+class CaregiverDashboard(BaseModel):
+    caregiver_id: str
+    members: List[DashboardMember]
+    next_cursor: Optional[str] = None
+
+
+@api_router.get("/caregivers/me/dashboard", response_model=CaregiverDashboard)
+async def get_caregiver_dashboard(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Members the caregiver has accepted access to, with current tier, open alert
+    count and latest vitals. A fixed number of queries per page regardless of
+    member count; pass back `next_cursor` for the next page. Members who paused
+    or withheld sharing are left off, so a page can hold fewer than `limit`.
+    """
+    caregiver = await container.caregiver_repo.find_by_user_id(current_user.id)
+    if not caregiver:
+        raise HTTPException(status_code=404, detail="Caregiver profile not found")
+    
+    relationships, next_cursor = await container.caregiver_member_repo.find_accepted_page(
+        caregiver['id'], limit=limit, cursor=cursor
+    )
+    # One member read serves both the consent check and the response
+    members = await container.member_repo.find_by_ids([r['member_id'] for r in relationships])
+    snapshots = await container.consent_snapshots.get_many(list(members), members=members)
+    relationships = [
+        r for r in relationships
+        if r['member_id'] in snapshots and snapshots[r['member_id']].allows_caregivers()
+    ]
+    member_ids = [r['member_id'] for r in relationships]
+    alert_ids = [r['member_id'] for r in relationships if r.get('can_view_alerts', True)]
+    metric_ids = [r['member_id'] for r in relationships if r.get('can_view_metrics', True)]
+    
+    statuses, open_alerts, vitals = await asyncio.gather(
+        container.status_repo.find_by_members(member_ids),
+        container.risk_repo.count_by_members(alert_ids, RiskRepository.OPEN_STATUSES),
+        container.metric_repo.latest_by_members(metric_ids, DASHBOARD_VITALS, datetime.utcnow() - timedelta(days=7)),
+    )
+    
+    items = []
+    for relationship in relationships:
+        member_id = relationship['member_id']
+        member = members.get(member_id)
+        if not member:
+            continue
+        member_status = statuses.get(member_id, {})
+        item = DashboardMember(
+            member_id=member_id,
+            relationship_id=relationship['id'],
+            first_name=member.get('first_name'),
+            last_name=member.get('last_name'),
+            can_view_alerts=relationship.get('can_view_alerts', True),
+            can_view_metrics=relationship.get('can_view_metrics', True),
+        )
+        if item.can_view_alerts:
+            item.tier = member_status.get('tier')
+            item.score = member_status.get('score')
+            item.open_alerts = open_alerts.get(member_id, 0)
+        if item.can_view_metrics:
+            item.last_sample_at = member_status.get('last_sample_at')
+            item.vitals = vitals.get(member_id, {})
+        items.append(item)
+    
+    return CaregiverDashboard(caregiver_id=caregiver['id'], members=items, next_cursor=next_cursor)
+
+
 # ==================== HEALTH CHECK ====================
 
 @api_router.get("/health")
@@ -607,17 +1126,34 @@ async def health_check():
     }
 
 
-# Include router
-app.include_router(api_router)
+@api_router.get("/health/stats")
+async def health_stats():
+    """Internal runtime metrics (no member data)"""
+    return {
+        "password_hasher": password_hasher.stats(),
+        "auth_cache": container.auth_service.principal_cache.stats(),
+        "repository_cache": cache_stats(),
+        "queries": query_metrics.snapshot(),
+        "alert_stream": container.alert_hub.stats(),
+        "push": container.notification_dispatcher.stats(),
+        "caregiver_permissions": container.caregiver_permissions.stats(),
+        "consent_snapshots": container.consent_snapshots.stats(),
+        "audit": container.audit_logger.stats(),
+    }
+
+
+# ==================== READINESS ====================
+
+@api_router.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the database is reachable and caches are primed"""
+    if not container.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting", "error": container.warm_up_error}
+        )
+    return {"status": "ready"}
 
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
 # Logging
 logging.basicConfig(
@@ -629,17 +1165,96 @@ logger = logging.getLogger(__name__)
 
 # ==================== STARTUP/SHUTDOWN ====================
 
-@app.on_event("startup")
-async def startup_event():
-    """Create indexes on startup"""
-    logger.info("Creating database indexes...")
-    await metric_repo.create_indexes()
-    await risk_repo.create_indexes()
-    logger.info("Aegis AI API started successfully")
+# INDEX_BUILD=background builds missing indexes after startup; set it to "off"
+# when deploys run `python manage_indexes.py --apply` instead
+INDEX_BUILD = os.environ.get('INDEX_BUILD', 'background')
+WARM_UP_RETRY_SECONDS = float(os.environ.get('WARM_UP_RETRY_SECONDS', '2'))
+
+# Response types served through fast_json_response; their serializers are
+# built during warm-up instead of on the first request
+FAST_JSON_TYPES = [List[MetricSample], List[RiskEvent], AlertPage, MemberSync]
+
+
+async def build_indexes():
+    """Build missing indexes and log drift without delaying startup"""
+    try:
+        reports = await container.build_indexes()
+        created = sum(len(r['created']) for r in reports)
+        logger.info(f"Index check complete ({created} indexes created)")
+    except Exception as e:
+        logger.error(f"Index check failed: {e}")
+
+
+async def warm_up():
+    """
+    Retry warm-up until the database answers (/api/ready reports ready from
+    then on), then build missing indexes if INDEX_BUILD=background
+    """
+    for type_ in FAST_JSON_TYPES:
+        prepare_fast_json(type_)
+    while True:
+        try:
+            await container.warm_up()
+            break
+        except Exception as e:
+            container.warm_up_error = str(e)
+            logger.warning(f"Warm-up failed, retrying in {WARM_UP_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(WARM_UP_RETRY_SECONDS)
+    if INDEX_BUILD == 'background':
+        await build_indexes()
+
+
+def create_app(app_container: Optional[Container] = None) -> FastAPI:
+    """
+    Build the ASGI app. Startup only starts background workers and schedules
+    warm-up, so the app serves /api/health immediately and /api/ready once warm. Routes use the module-level `container`; passing
+    one replaces it (one app per process).
+    """
+    global container
+    if app_container is not None:
+        container = app_container
+    
+    app = FastAPI(
+        title="Aegis AI Wellness API",
+        description="Proactive wellness monitoring platform API",
+        version="1.0.0"
+    )
+    app.add_exception_handler(PasswordHasherBusy, password_hasher_busy_handler)
+    app.add_exception_handler(InvalidCursor, invalid_cursor_handler)
+    app.include_router(api_router)
+    
+    # Compression (inside CORS; streaming responses are passed through)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+    )
+    
+    # CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag"],
+    )
+    
+    @app.on_event("startup")
+    async def startup_event():
+        """Start background workers and schedule warm-up (and the index build)"""
+        await container.start()
+        app.state.warm_up_task = asyncio.create_task(warm_up())
+        logger.info("Aegis AI API started successfully")
+    
+    @app.on_event("shutdown")
+    async def shutdown_db_client():
+        """Close database connection"""
+        app.state.warm_up_task.cancel()
+        await container.close()
+        password_hasher.shutdown()
+        logger.info("Database connection closed")
+    
+    return app
 
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    """Close database connection"""
-    client.close()
-    logger.info("Database connection closed")
+app = create_app()
@@ -2,5 +2,19 @@ from .auth_service import AuthService
 from .member_service import MemberService
 from .metric_service import MetricService
 from .risk_service import RiskService
+from .alert_hub import AlertHub, AlertBroker, InProcessBroker
+from .caregiver_permissions import CaregiverPermissionIndex
+from .caregiver_invitations import CaregiverInvitationService
+from .consent_snapshots import ConsentSnapshotCache
+from .sync_service import SyncService
+from .audit_logger import AuditLogger
+from .notification_dispatcher import (
+    NotificationDispatcher, RiskAlertNotifier, PushProvider, StubPushProvider, ExpoPushProvider
+)
 
-__all__ = ['AuthService', 'MemberService', 'MetricService', 'RiskService']
+__all__ = [
+    'AuthService', 'MemberService', 'MetricService', 'RiskService', 'SyncService',
+    'AlertHub', 'AlertBroker', 'InProcessBroker', 'CaregiverPermissionIndex', 'CaregiverInvitationService',
+    'ConsentSnapshotCache', 'AuditLogger',
+    'NotificationDispatcher', 'RiskAlertNotifier', 'PushProvider', 'StubPushProvider', 'ExpoPushProvider'
+]
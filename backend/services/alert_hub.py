@@ -0,0 +1,135 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Set, Callable, Any
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AlertMessage:
+    """A published alert change, serialized once and shared by every subscriber"""
+    
+    __slots__ = ('member_id', 'type', 'payload')
+    
+    def __init__(self, member_id: str, type: str, payload: str):
+        self.member_id = member_id
+        self.type = type
+        self.payload = payload  # JSON-encoded RiskEvent
+    
+    def to_json(self) -> str:
+        return f'{{"type": {json.dumps(self.type)}, "event": {self.payload}}}'
+
+
+class AlertBroker(ABC):
+    """
+    Fans published messages out to every worker's hub.
+    Implement over Redis pub/sub, NATS, etc. when running more than one worker.
+    """
+    
+    @abstractmethod
+    async def start(self, deliver: Callable[[AlertMessage], None]):
+        """Begin delivering messages (from any worker) to `deliver`"""
+    
+    @abstractmethod
+    async def publish(self, message: AlertMessage):
+        ...
+    
+    async def close(self):
+        pass
+
+
+class InProcessBroker(AlertBroker):
+    """Single-worker broker: publishing delivers directly to the local hub"""
+    
+    def __init__(self):
+        self._deliver: Optional[Callable[[AlertMessage], None]] = None
+    
+    async def start(self, deliver: Callable[[AlertMessage], None]):
+        self._deliver = deliver
+    
+    async def publish(self, message: AlertMessage):
+        if self._deliver is not None:
+            self._deliver(message)
+
+
+class Subscription:
+    """One connected client's bounded queue; the oldest message is dropped when full"""
+    
+    def __init__(self, member_id: str, max_queue: int):
+        self.member_id = member_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+    
+    def put(self, message: AlertMessage) -> bool:
+        """Enqueue message; True if an older message had to be dropped"""
+        dropped = False
+        if self.queue.full():
+            # Slow consumer: keep the newest state rather than blocking the publisher
+            self.queue.get_nowait()
+            self.dropped += 1
+            dropped = True
+        self.queue.put_nowait(message)
+        return dropped
+    
+    async def get(self) -> AlertMessage:
+        return await self.queue.get()
+
+
+class AlertHub:
+    """
+    In-process pub/sub for risk event changes, keyed by member ID.
+    
+    Subscribing costs one small queue; idle connections hold no database
+    resources. Publishing goes through the broker so subscribers on other
+    workers receive it too.
+    """
+    
+    def __init__(self, broker: Optional[AlertBroker] = None, max_queue: int = 100):
+        self.broker = broker or InProcessBroker()
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+    
+    async def start(self):
+        await self.broker.start(self._deliver)
+    
+    async def close(self):
+        await self.broker.close()
+    
+    def subscribe(self, member_id: str) -> Subscription:
+        subscription = Subscription(member_id, self.max_queue)
+        self._subscribers.setdefault(member_id, set()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.member_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.member_id]
+    
+    async def publish(self, member_id: str, type: str, payload: str):
+        """Publish a change for a member; failures are logged, never raised to the writer"""
+        self.published += 1
+        try:
+            await self.broker.publish(AlertMessage(member_id, type, payload))
+        except Exception as e:
+            logger.warning(f"Alert publish failed for member {member_id}: {e}")
+    
+    def _deliver(self, message: AlertMessage):
+        for subscription in list(self._subscribers.get(message.member_id, ())):
+            if subscription.put(message):
+                self.dropped += 1
+            self.delivered += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'connections': sum(len(s) for s in self._subscribers.values()),
+            'members': len(self._subscribers),
+            'published': self.published,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,318 @@
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import logging
+import os
+import threading
+
+from repositories.audit_repository import AuditLogRepository
+from models import AuditLog, AuditAction
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class AuditLogger:
+    """
+    Non-blocking audit trail.
+    
+    `record` only builds the event and puts it on a bounded in-memory queue, so
+    callers never wait on the database. A background task drains the queue in
+    batches of up to `batch_size` (or whatever arrived within `flush_interval`)
+    and writes each batch with one unordered bulk insert.
+    
+    When a write fails (e.g. MongoDB is unreachable) the batch is appended to
+    a local JSON-lines spill file, and so are events recorded while the queue
+    is full. Spill writes run on a worker thread through one buffered file
+    handle, never on the event loop. The spill file is replayed once writes
+    succeed again; events keep their ids, so a replay never duplicates what
+    already made it in.
+    """
+    
+    def __init__(
+        self,
+        audit_repo: AuditLogRepository,
+        spill_path: Optional[str] = None,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        retry_interval: float = 30.0,
+        maintenance_interval: float = 3600.0
+    ):
+        self.audit_repo = audit_repo
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.maintenance_interval = maintenance_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[List[Dict[str, Any]]] = None
+        # Events recorded while the queue was full, waiting to be spilled
+        self._overflow: List[Dict[str, Any]] = []
+        self._overflow_task: Optional[asyncio.Task] = None
+        self._spill_file = None
+        self._spill_lock = threading.Lock()
+        self._spill_pending = bool(self.spill_path and (self.spill_path.exists() or self._replay_path.exists()))
+        self._next_retry = 0.0
+        self._next_maintenance = 0.0
+        self.counters = {
+            'recorded': 0, 'written': 0, 'batches': 0, 'write_failures': 0,
+            'spilled': 0, 'replayed': 0, 'dropped': 0,
+        }
+    
+    # ----- producing -----
+    
+    def record(
+        self,
+        action: AuditAction,
+        user: Optional[Any] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        org_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        success: bool = True,
+        error_message: Optional[str] = None,
+        user_email: Optional[str] = None
+    ):
+        """Queue an audit event; never blocks and never raises for a full queue"""
+        event = AuditLog(
+            user_id=getattr(user, 'id', None),
+            user_email=getattr(user, 'email', None) or user_email,
+            user_role=getattr(user, 'role', None),
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            org_id=org_id if org_id is not None else getattr(user, 'org_id', None),
+            ip_address=ip_address,
+            user_agent=user_agent,
+            details=details,
+            success=success,
+            error_message=error_message
+        ).dict()
+        self.counters['recorded'] += 1
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Overloaded: keep the event on disk rather than wait or lose it
+            if self.spill_path is None:
+                self.counters['dropped'] += 1
+                return
+            self._overflow.append(event)
+            if self._overflow_task is None or self._overflow_task.done():
+                self._overflow_task = asyncio.create_task(self._spill_overflow())
+    
+    async def _spill_overflow(self):
+        while self._overflow:
+            events, self._overflow = self._overflow, []
+            if not await self._spill(events):
+                self.counters['dropped'] += len(events)
+    
+    # ----- consuming -----
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self, timeout: float = 10.0):
+        """Stop the flush loop, writing (or spilling) whatever is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._overflow_task is not None:
+            await asyncio.gather(self._overflow_task, return_exceptions=True)
+            self._overflow_task = None
+        if self._inflight:
+            # Duplicates from a partially completed insert are ignored
+            batch, self._inflight = self._inflight, None
+            await self._write(batch)
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        remaining = self._take(self._queue.qsize())
+        if remaining:
+            await self._spill(remaining)
+        await asyncio.to_thread(self._close_spill)
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                try:
+                    batch = [await asyncio.wait_for(self._queue.get(), self.retry_interval)]
+                except asyncio.TimeoutError:
+                    # Idle: still retry the spill file and drop old partitions
+                    await self._maintain()
+                    continue
+                # Taken off the queue: stop() writes it if cancelled before the write completes
+                self._inflight = batch
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    batch.extend(self._take(self.batch_size - len(batch)))
+                    remaining = deadline - loop.time()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                written = await self._write(batch)
+                self._inflight = None
+                if written:
+                    await self._maintain()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit flush failed: {e}")
+    
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        events = []
+        while len(events) < limit:
+            try:
+                events.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return events
+    
+    async def flush(self):
+        """Write everything currently queued (used on shutdown and in benchmarks)"""
+        while not self._queue.empty():
+            await self._write(self._take(self.batch_size))
+    
+    async def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        try:
+            self.counters['written'] += await self.audit_repo.insert_batch(batch)
+            self.counters['batches'] += 1
+            return True
+        except Exception as e:
+            self.counters['write_failures'] += 1
+            logger.warning(f"Audit write of {len(batch)} events failed, spilling to disk: {e}")
+            if not await self._spill(batch):
+                self.counters['dropped'] += len(batch)
+            return False
+    
+    async def _maintain(self):
+        """Replay spilled events and drop expired partitions, each at most once per interval"""
+        now = asyncio.get_running_loop().time()
+        if self._spill_pending and now >= self._next_retry:
+            self._next_retry = now + self.retry_interval
+            await self.replay_spill()
+        if now >= self._next_maintenance:
+            self._next_maintenance = now + self.maintenance_interval
+            try:
+                await self.audit_repo.drop_expired_partitions()
+            except Exception as e:
+                logger.error(f"Dropping expired audit partitions failed: {e}")
+    
+    # ----- spill file -----
+    
+    async def _spill(self, events: List[Dict[str, Any]]) -> bool:
+        """Append events to the spill file on a worker thread; False if they could not be kept"""
+        if self.spill_path is None:
+            return False
+        try:
+            await asyncio.to_thread(self._append_spill, events)
+        except OSError as e:
+            logger.error(f"Audit spill to {self.spill_path} failed: {e}")
+            return False
+        self.counters['spilled'] += len(events)
+        self._spill_pending = True
+        return True
+    
+    def _append_spill(self, events: List[Dict[str, Any]]):
+        lines = []
+        for event in events:
+            event.pop('_id', None)
+            lines.append(json.dumps(event, default=_json_default) + '\n')
+        with self._spill_lock:
+            if self._spill_file is None:
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8', buffering=1 << 16)
+            self._spill_file.writelines(lines)
+            # One flush per batch: the events survive a process crash
+            self._spill_file.flush()
+    
+    def _close_spill(self):
+        with self._spill_lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+    
+    def _rotate_spill(self) -> bool:
+        """Move the spill file aside for replay; False if there is none"""
+        with self._spill_lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+            if not self.spill_path.exists():
+                return False
+            os.replace(self.spill_path, self._replay_path)
+            return True
+    
+    @property
+    def _replay_path(self) -> Path:
+        return self.spill_path.with_name(self.spill_path.name + '.replay')
+    
+    async def replay_spill(self) -> int:
+        """Write spilled events to MongoDB; events that still fail are spilled again"""
+        if self.spill_path is None:
+            return 0
+        # Move the file aside so new spills during the replay go to a fresh one
+        # (a leftover .replay file is from an interrupted replay: finish it first)
+        replaying = self._replay_path
+        if not replaying.exists() and not await asyncio.to_thread(self._rotate_spill):
+            self._spill_pending = False
+            return 0
+        events = await asyncio.to_thread(self._read_spill, replaying)
+        
+        replayed = 0
+        for i in range(0, len(events), self.batch_size):
+            batch = events[i:i + self.batch_size]
+            try:
+                replayed += await self.audit_repo.insert_batch(batch)
+            except Exception as e:
+                logger.warning(f"Audit spill replay failed, keeping {len(events) - i} events: {e}")
+                await self._spill(events[i:])
+                self.counters['spilled'] -= len(events) - i
+                break
+        replaying.unlink()
+        self.counters['replayed'] += replayed
+        self._spill_pending = self.spill_path.exists()
+        if replayed:
+            logger.info(f"Replayed {replayed} spilled audit events")
+        return replayed
+    
+    @staticmethod
+    def _read_spill(path: Path) -> List[Dict[str, Any]]:
+        events = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                    event['timestamp'] = datetime.fromisoformat(event['timestamp'])
+                except (ValueError, KeyError) as e:
+                    # A torn last line from a crash mid-write
+                    logger.error(f"Skipping unreadable audit spill line: {e}")
+                    continue
+                events.append(event)
+        return events
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            'queued': self._queue.qsize(),
+            'spill_pending': self._spill_pending,
+        }
@@ -3,20 +3,37 @@ from datetime import datetime, timedelta
 from repositories import UserRepository
 from models import User, UserCreate, UserLogin, UserRole
 from utils.security import (
-    hash_password,
-    verify_password,
     create_access_token,
     create_refresh_token,
     decode_token,
     generate_verification_token,
     generate_reset_token
 )
+from utils.password_hasher import password_hasher
+from utils.cache import TTLCache
+import os
 import uuid
 
+# User fields a cached principal keeps: what authorization and auditing read
+PRINCIPAL_FIELDS = ('id', 'email', 'role', 'org_id', 'is_active')
+
 
 class AuthService:
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
+        # Verified principals keyed by user ID; dropped when security fields change
+        self.principal_cache = TTLCache(
+            max_size=int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+        )
+        # Bumped on every invalidation; a load that raced a write is not cached
+        self._generation = 0
+        self.user_repo.on_security_change(self.invalidate_principal)
+    
+    def invalidate_principal(self, user_id: str):
+        """Drop a cached principal (its security fields changed)"""
+        self._generation += 1
+        self.principal_cache.invalidate(user_id)
     
     async def register_user(self, user_create: UserCreate) -> Tuple[User, str, str]:
         """
@@ -29,10 +46,11 @@ class AuthService:
             raise ValueError("User with this email already exists")
         
         # Create user
+        hashed_password = await password_hasher.hash(user_create.password)
         user_data = {
             'id': str(uuid.uuid4()),
             'email': user_create.email,
-            'hashed_password': hash_password(user_create.password),
+            'hashed_password': hashed_password,
             'role': user_create.role,
             'first_name': user_create.first_name,
             'last_name': user_create.last_name,
@@ -66,7 +84,7 @@ class AuthService:
         user = User(**user_data)
         
         # Verify password
-        if not user.hashed_password or not verify_password(user_login.password, user.hashed_password):
+        if not user.hashed_password or not await password_hasher.verify(user_login.password, user.hashed_password):
             raise ValueError("Invalid credentials")
         
         # Check if user is active
@@ -135,8 +153,9 @@ class AuthService:
                 raise ValueError("Reset token has expired")
         
         # Update password
+        hashed_password = await password_hasher.hash(new_password)
         await self.user_repo.update(user_data['id'], {
-            'hashed_password': hash_password(new_password),
+            'hashed_password': hashed_password,
             'reset_token': None,
             'reset_token_expires': None
         })
@@ -210,15 +229,22 @@ class AuthService:
     
     async def get_current_user(self, token: str) -> Optional[User]:
         """
-        Get current user from access token.
+        Get the principal for an access token: a User carrying only
+        PRINCIPAL_FIELDS (read the user document for the full profile).
+        Inactive users get None.
         """
         payload = decode_token(token)
         if not payload or payload.get('type') != 'access':
             return None
         
         user_id = payload.get('sub')
-        user_data = await self.user_repo.find_by_id(user_id)
-        if not user_data:
-            return None
-        
-        return User(**user_data)
+        user = self.principal_cache.get(user_id)
+        if user is None:
+            generation = self._generation
+            user_data = await self.user_repo.find_by_id(user_id)
+            if not user_data:
+                return None
+            user = User(**{field: user_data[field] for field in PRINCIPAL_FIELDS if field in user_data})
+            if generation == self._generation:
+                self.principal_cache.set(user_id, user)
+        return user if user.is_active else None
@@ -0,0 +1,118 @@
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+import uuid
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from repositories import UserRepository
+from repositories.caregiver_repository import CaregiverRepository, CaregiverMemberRepository
+from repositories.transactions import run_in_transaction
+from models import Caregiver, CaregiverOnMember
+
+
+class CaregiverInvitationService:
+    """
+    Invites many caregivers to one member with a constant number of round trips:
+    one `$in` lookup each for users, caregivers and existing relationships, then
+    one insert per collection inside a transaction where the deployment supports it.
+    """
+    
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        caregiver_repo: CaregiverRepository,
+        caregiver_member_repo: CaregiverMemberRepository
+    ):
+        self.user_repo = user_repo
+        self.caregiver_repo = caregiver_repo
+        self.caregiver_member_repo = caregiver_member_repo
+    
+    async def invite_batch(self, member_id: str, invites: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Invite caregivers (dicts with email, first_name, last_name, relationship).
+        Emails are compared case-insensitively. Returns one result per invite,
+        in order, with status 'invited', 'already_invited' (relationship
+        exists) or 'duplicate' (email repeated in the batch).
+        Raises ValueError if a concurrent write created a conflicting user or caregiver.
+        """
+        now = datetime.utcnow()
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        typed = set()
+        for invite in invites:
+            typed.add(invite['email'].strip())
+            email = invite['email'].strip().lower()
+            results.append({
+                'email': email,
+                'status': 'duplicate' if email in seen else 'invited',
+                'caregiver_id': None,
+                'relationship_id': None,
+                'user_created': False,
+            })
+            seen.add(email)
+        
+        # Accounts registered with a mixed-case address are matched as typed
+        found = await self.user_repo.find_by_emails(list(seen | typed))
+        users = {email.lower(): user for email, user in found.items()}
+        caregivers = await self.caregiver_repo.find_by_user_ids([u['id'] for u in users.values()])
+        already = set(await self.caregiver_member_repo.find_caregiver_ids_for_member(
+            member_id, [c['id'] for c in caregivers.values()]
+        ))
+        
+        new_users, new_caregivers, new_relationships = [], [], []
+        for invite, result in zip(invites, results):
+            if result['status'] == 'duplicate':
+                continue
+            user = users.get(result['email'])
+            if user is None:
+                user = {
+                    'id': str(uuid.uuid4()),
+                    'email': result['email'],
+                    'role': 'caregiver',
+                    'first_name': invite['first_name'],
+                    'last_name': invite['last_name'],
+                    'is_active': True,
+                    'is_verified': False,
+                    'created_at': now,
+                    'updated_at': now
+                }
+                new_users.append(user)
+                result['user_created'] = True
+            
+            caregiver = caregivers.get(user['id'])
+            if caregiver is None:
+                caregiver = Caregiver(
+                    user_id=user['id'],
+                    first_name=invite['first_name'],
+                    last_name=invite['last_name'],
+                    relationship=invite.get('relationship'),
+                    created_at=now,
+                    updated_at=now
+                ).dict()
+                new_caregivers.append(caregiver)
+            result['caregiver_id'] = caregiver['id']
+            
+            if caregiver['id'] in already:
+                result['status'] = 'already_invited'
+                continue
+            relationship = CaregiverOnMember(
+                member_id=member_id,
+                caregiver_id=caregiver['id'],
+                invitation_sent_at=now,
+                created_at=now
+            ).dict()
+            new_relationships.append(relationship)
+            result['relationship_id'] = relationship['id']
+        
+        async def write(session):
+            # Relationships last: without a transaction, an interrupted batch leaves
+            # only users/caregivers, which a retry finds and reuses
+            await self.user_repo.create_many(new_users, session=session)
+            await self.caregiver_repo.create_many(new_caregivers, session=session)
+            await self.caregiver_member_repo.create_many(new_relationships, session=session)
+        
+        try:
+            await run_in_transaction(self.user_repo.db, write)
+        except (BulkWriteError, DuplicateKeyError):
+            # A user or caregiver was created concurrently (unique index); nothing to keep
+            raise ValueError("Invitees changed during the batch; retry it")
+        return results
@@ -0,0 +1,76 @@
+from typing import Optional, Dict, FrozenSet, Any
+from repositories.caregiver_repository import CaregiverRepository, CaregiverMemberRepository
+from utils.cache import TTLCache
+
+# Relationship flags a caregiver can be granted per member
+PERMISSION_FLAGS = ('can_view_alerts', 'can_view_metrics', 'can_add_notes')
+
+
+class CaregiverPermissionIndex:
+    """
+    In-memory index caregiver_id -> {member_id: granted flags} over accepted
+    relationships, loaded lazily per caregiver with one query.
+    
+    Local relationship writes invalidate entries immediately (via
+    CaregiverMemberRepository.on_access_change); the TTL bounds how long
+    another worker's writes can go unseen.
+    """
+    
+    def __init__(
+        self,
+        caregiver_repo: CaregiverRepository,
+        caregiver_member_repo: CaregiverMemberRepository,
+        ttl_seconds: float = 60,
+        max_size: int = 10000
+    ):
+        self.caregiver_repo = caregiver_repo
+        self.caregiver_member_repo = caregiver_member_repo
+        self._grants = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._caregiver_ids = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        # Bumped on every invalidation; a load that raced a write is not cached
+        self._generation = 0
+        caregiver_member_repo.on_access_change(self.invalidate)
+    
+    def invalidate(self, caregiver_id: Optional[str] = None):
+        """Drop one caregiver's grants, or all of them"""
+        self._generation += 1
+        if caregiver_id is None:
+            self._grants.clear()
+        else:
+            self._grants.invalidate(caregiver_id)
+    
+    async def grants_for_caregiver(self, caregiver_id: str) -> Dict[str, FrozenSet[str]]:
+        grants = self._grants.get(caregiver_id)
+        if grants is not None:
+            return grants
+        
+        generation = self._generation
+        relationships = await self.caregiver_member_repo.find_many(
+            {'caregiver_id': caregiver_id, 'invitation_status': 'accepted'}, limit=1000
+        )
+        grants = {
+            r['member_id']: frozenset(flag for flag in PERMISSION_FLAGS if r.get(flag, True))
+            for r in relationships
+        }
+        if generation == self._generation:
+            self._grants.set(caregiver_id, grants)
+        return grants
+    
+    async def grants_for_user(self, user_id: str) -> Dict[str, FrozenSet[str]]:
+        """Grants of the caregiver profile belonging to a user (empty if none)"""
+        caregiver_id = self._caregiver_ids.get(user_id)
+        if caregiver_id is None:
+            caregiver = await self.caregiver_repo.find_by_user_id(user_id)
+            if not caregiver:
+                return {}
+            caregiver_id = caregiver['id']
+            self._caregiver_ids.set(user_id, caregiver_id)
+        return await self.grants_for_caregiver(caregiver_id)
+    
+    async def can(self, user_id: str, member_id: str, permission: str) -> bool:
+        """Whether the user's caregiver profile holds `permission` for the member"""
+        grants = await self.grants_for_user(user_id)
+        return permission in grants.get(member_id, ())
+    
+    def stats(self) -> Dict[str, Any]:
+        return self._grants.stats()
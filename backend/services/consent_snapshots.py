@@ -0,0 +1,129 @@
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+
+from repositories import MemberRepository, ConsentRepository
+from utils.cache import TTLCache
+
+# Consent types the snapshot tracks
+SNAPSHOT_CONSENTS = ('data_collection', 'caregiver_access')
+
+
+class ConsentSnapshot:
+    """A member's consent and data-sharing state at load time"""
+    
+    __slots__ = ('collection_allowed', 'caregiver_access_allowed', 'sharing_enabled', 'paused_until')
+    
+    def __init__(
+        self,
+        collection_allowed: bool,
+        caregiver_access_allowed: bool,
+        sharing_enabled: bool,
+        paused_until: Optional[datetime]
+    ):
+        self.collection_allowed = collection_allowed
+        self.caregiver_access_allowed = caregiver_access_allowed
+        self.sharing_enabled = sharing_enabled
+        self.paused_until = paused_until
+    
+    def sharing_paused(self, now: Optional[datetime] = None) -> bool:
+        # Evaluated at check time, so a pause ends without invalidation
+        return self.paused_until is not None and self.paused_until > (now or datetime.utcnow())
+    
+    def allows_caregivers(self, now: Optional[datetime] = None) -> bool:
+        """Caregivers may read the member's data"""
+        return self.caregiver_access_allowed and self.sharing_enabled and not self.sharing_paused(now)
+
+
+class ConsentSnapshotCache:
+    """
+    In-memory per-member consent snapshots for enforcement on hot paths
+    (metric ingest, caregiver reads, alert streams), loaded with one member
+    query (find_by_ids, which bypasses the member cache) and one consent
+    aggregation per batch of misses.
+    
+    A consent type counts as withheld only when its latest record revokes it;
+    members with no record (onboarded before consents were captured) are
+    allowed. Local writes invalidate entries immediately via `invalidate`;
+    the TTL bounds how long another worker's writes can go unseen.
+    """
+    
+    def __init__(
+        self,
+        member_repo: MemberRepository,
+        consent_repo: ConsentRepository,
+        ttl_seconds: float = 60,
+        max_size: int = 50000
+    ):
+        self.member_repo = member_repo
+        self.consent_repo = consent_repo
+        self._snapshots = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        # Bumped on every invalidation; a load that raced a write is not cached
+        self._generation = 0
+    
+    def invalidate(self, member_id: Optional[str] = None):
+        """Drop one member's snapshot, or all of them"""
+        self._generation += 1
+        if member_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.invalidate(member_id)
+    
+    async def get_many(
+        self,
+        member_ids: List[str],
+        members: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, ConsentSnapshot]:
+        """
+        Snapshots for members that exist; unknown member IDs are absent.
+        `members` ({member_id: member}) are documents the caller already
+        loaded; misses are built from them instead of querying again.
+        """
+        snapshots: Dict[str, ConsentSnapshot] = {}
+        missing = []
+        for member_id in dict.fromkeys(member_ids):
+            snapshot = self._snapshots.get(member_id)
+            if snapshot is None:
+                missing.append(member_id)
+            else:
+                snapshots[member_id] = snapshot
+        if not missing:
+            return snapshots
+        
+        generation = self._generation
+        if members is None:
+            members = await self.member_repo.find_by_ids(missing)
+        else:
+            members = {member_id: members[member_id] for member_id in missing if member_id in members}
+        consents = await self.consent_repo.latest_by_members(list(members), list(SNAPSHOT_CONSENTS))
+        for member_id, member in members.items():
+            latest = consents.get(member_id, {})
+            snapshot = ConsentSnapshot(
+                collection_allowed=self._allowed(latest.get('data_collection')),
+                caregiver_access_allowed=self._allowed(latest.get('caregiver_access')),
+                sharing_enabled=member.get('data_sharing_enabled', True),
+                paused_until=member.get('data_sharing_paused_until')
+            )
+            snapshots[member_id] = snapshot
+            if generation == self._generation:
+                self._snapshots.set(member_id, snapshot)
+        return snapshots
+    
+    @staticmethod
+    def _allowed(record: Optional[Dict[str, Any]]) -> bool:
+        return record is None or (bool(record.get('granted')) and record.get('revoked_at') is None)
+    
+    async def get(self, member_id: str) -> Optional[ConsentSnapshot]:
+        return (await self.get_many([member_id])).get(member_id)
+    
+    async def allows_collection(self, member_id: str) -> bool:
+        """Metric samples may be stored for the member"""
+        snapshot = await self.get(member_id)
+        return snapshot is not None and snapshot.collection_allowed
+    
+    async def allows_caregivers(self, member_id: str) -> bool:
+        """Caregivers may currently read the member's data"""
+        snapshot = await self.get(member_id)
+        return snapshot is not None and snapshot.allows_caregivers()
+    
+    def stats(self) -> Dict[str, Any]:
+        return self._snapshots.stats()
@@ -1,23 +1,33 @@
 from typing import Optional, List
 from repositories import MemberRepository, ConsentRepository
 from models import Member, MemberCreate, Consent, ConsentCreate, ConsentType
+from .consent_snapshots import ConsentSnapshotCache
 from datetime import datetime
 
 
 class MemberService:
-    def __init__(self, member_repo: MemberRepository, consent_repo: ConsentRepository):
+    def __init__(
+        self,
+        member_repo: MemberRepository,
+        consent_repo: ConsentRepository,
+        consent_snapshots: Optional[ConsentSnapshotCache] = None
+    ):
         self.member_repo = member_repo
         self.consent_repo = consent_repo
+        self.consent_snapshots = consent_snapshots
+    
+    def _consent_changed(self, member_id: str):
+        if self.consent_snapshots:
+            self.consent_snapshots.invalidate(member_id)
     
     async def create_member(self, member_create: MemberCreate) -> Member:
         """
         Create a new member profile.
         """
-        member_data = member_create.dict()
-        member_data['created_at'] = datetime.utcnow()
-        member_data['updated_at'] = datetime.utcnow()
+        # Build the full model so the stored document carries its id and defaults
+        member = Member(**member_create.dict(exclude_none=True))
         
-        created = await self.member_repo.create(member_data)
+        created = await self.member_repo.create(member.dict())
         return Member(**created)
     
     async def get_member(self, member_id: str) -> Optional[Member]:
@@ -48,17 +58,34 @@ class MemberService:
         """
         Grant or revoke consent.
         """
-        consent_data = {
-            'member_id': member_id,
-            'consent_type': consent_type,
-            'granted': granted,
-            'source': source,
-            'granted_at': datetime.utcnow()
-        }
+        consent = Consent(
+            member_id=member_id,
+            consent_type=consent_type,
+            granted=granted,
+            source=source,
+            granted_at=datetime.utcnow()
+        )
         
-        created = await self.consent_repo.create(consent_data)
+        created = await self.consent_repo.create(consent.dict())
+        self._consent_changed(member_id)
         return Consent(**created)
     
+    async def pause_data_sharing(self, member_id: str, paused_until: datetime) -> bool:
+        """
+        Pause data sharing until the given time.
+        """
+        updated = await self.member_repo.pause_data_sharing(member_id, paused_until)
+        self._consent_changed(member_id)
+        return updated
+    
+    async def resume_data_sharing(self, member_id: str) -> bool:
+        """
+        End a data sharing pause.
+        """
+        updated = await self.member_repo.pause_data_sharing(member_id, None)
+        self._consent_changed(member_id)
+        return updated
+    
     async def get_member_consents(self, member_id: str) -> List[Consent]:
         """
         Get all consents for a member.
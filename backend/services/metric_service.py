@@ -1,21 +1,33 @@
-from typing import List, Optional
-from repositories import MetricRepository
+from typing import List, Dict, Optional
+from repositories import MetricRepository, MemberStatusRepository
 from models import MetricSample, MetricSampleCreate
 from datetime import datetime, timedelta
 
 
 class MetricService:
-    def __init__(self, metric_repo: MetricRepository):
+    def __init__(self, metric_repo: MetricRepository, status_repo: Optional[MemberStatusRepository] = None):
         self.metric_repo = metric_repo
+        self.status_repo = status_repo
+    
+    async def _record_last_samples(self, samples: List[dict]):
+        if not self.status_repo:
+            return
+        latest: Dict[str, datetime] = {}
+        for s in samples:
+            member_id, timestamp = s['member_id'], s['timestamp']
+            if member_id not in latest or timestamp > latest[member_id]:
+                latest[member_id] = timestamp
+        await self.status_repo.record_samples(latest)
     
     async def ingest_sample(self, sample_create: MetricSampleCreate) -> MetricSample:
         """
         Ingest a single metric sample.
         """
-        sample_data = sample_create.dict()
-        sample_data['ingested_at'] = datetime.utcnow()
+        # Build the full model so the stored document carries its id (sync keys on it)
+        sample_data = MetricSample(**sample_create.dict(), ingested_at=datetime.utcnow()).dict()
         
         created = await self.metric_repo.create(sample_data)
+        await self._record_last_samples([sample_data])
         return MetricSample(**created)
     
     async def ingest_samples_bulk(self, samples: List[MetricSampleCreate]) -> int:
@@ -26,12 +38,14 @@ class MetricService:
         if not samples:
             return 0
         
+        ingested_at = datetime.utcnow()
         samples_data = [
-            {**s.dict(), 'ingested_at': datetime.utcnow()}
+            MetricSample(**s.dict(), ingested_at=ingested_at).dict()
             for s in samples
         ]
         
         count = await self.metric_repo.bulk_create(samples_data)
+        await self._record_last_samples(samples_data)
         return count
     
     async def get_member_metrics(
@@ -43,6 +57,18 @@ class MetricService:
         """
         Get metrics for a member.
         """
+        metrics_data = await self.get_member_metric_rows(member_id, metric_type, days)
+        return [MetricSample(**m) for m in metrics_data]
+    
+    async def get_member_metric_rows(
+        self,
+        member_id: str,
+        metric_type: Optional[str] = None,
+        days: int = 7
+    ) -> List[Dict]:
+        """
+        Raw metric documents for a member, newest first (for fast serialization).
+        """
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         
@@ -55,7 +81,14 @@ class MetricService:
                 member_id, start_date, end_date
             )
         
-        return [MetricSample(**m) for m in metrics_data]
+        return metrics_data
+    
+    async def get_daily_summary(self, member_id: str, days: int = 7) -> List[Dict]:
+        """
+        Daily aggregates per metric type for the last `days` days.
+        """
+        since = datetime.utcnow() - timedelta(days=days)
+        return await self.metric_repo.daily_summary(member_id, since)
     
     async def get_latest_metric(
         self,
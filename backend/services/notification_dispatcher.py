@@ -0,0 +1,385 @@
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import asyncio
+import logging
+import random
+
+from repositories import NotificationOutboxRepository, OrganizationRepository
+from models import PushNotificationLog
+from .consent_snapshots import ConsentSnapshotCache
+
+logger = logging.getLogger(__name__)
+
+
+class PushResult:
+    """Outcome of sending one notification"""
+    
+    __slots__ = ('ok', 'retryable', 'error')
+    
+    def __init__(self, ok: bool, retryable: bool = False, error: Optional[str] = None):
+        self.ok = ok
+        self.retryable = retryable
+        self.error = error
+
+
+class PushProvider(ABC):
+    """
+    Sends batches of notifications through one push service.
+    `max_batch` is the provider's per-request limit and `max_concurrency`
+    the number of requests the dispatcher keeps in flight.
+    """
+    
+    max_batch: int = 100
+    max_concurrency: int = 4
+    
+    @abstractmethod
+    async def send_batch(self, notifications: List[Dict[str, Any]]) -> List[PushResult]:
+        """One result per notification, in order"""
+
+
+class StubPushProvider(PushProvider):
+    """Offline provider that records sends; can inject latency and failures for testing"""
+    
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        failure_rate: float = 0.0,
+        max_batch: int = 100,
+        max_concurrency: int = 4
+    ):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self.sent: List[Dict[str, Any]] = []
+        self.requests = 0
+    
+    async def send_batch(self, notifications: List[Dict[str, Any]]) -> List[PushResult]:
+        self.requests += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        results = []
+        for notification in notifications:
+            if random.random() < self.failure_rate:
+                results.append(PushResult(False, retryable=True, error="stub: simulated failure"))
+            else:
+                self.sent.append(notification)
+                results.append(PushResult(True))
+        return results
+
+
+class ExpoPushProvider(PushProvider):
+    """Expo push service (the mobile app registers Expo push tokens)"""
+    
+    URL = "https://exp.host/--/api/v2/push/send"
+    
+    def __init__(self, access_token: Optional[str] = None, max_concurrency: int = 6):
+        self.access_token = access_token
+        self.max_concurrency = max_concurrency
+    
+    def _post(self, messages: List[Dict[str, Any]]):
+        import requests
+        headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+        if self.access_token:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+        return requests.post(self.URL, json=messages, headers=headers, timeout=15)
+    
+    async def send_batch(self, notifications: List[Dict[str, Any]]) -> List[PushResult]:
+        messages = [
+            {
+                'to': n['push_token'],
+                'title': n['title'],
+                'body': n['body'],
+                'data': n.get('data') or {},
+                'channelId': 'risk-alerts' if n['notification_type'] == 'risk_alert' else 'default',
+            }
+            for n in notifications
+        ]
+        try:
+            response = await asyncio.to_thread(self._post, messages)
+        except Exception as e:
+            return [PushResult(False, retryable=True, error=str(e))] * len(notifications)
+        
+        if response.status_code == 429 or response.status_code >= 500:
+            return [PushResult(False, retryable=True, error=f"HTTP {response.status_code}")] * len(notifications)
+        if response.status_code >= 400:
+            return [PushResult(False, error=f"HTTP {response.status_code}: {response.text[:200]}")] * len(notifications)
+        
+        tickets = response.json().get('data', [])
+        results = []
+        for i in range(len(notifications)):
+            ticket = tickets[i] if i < len(tickets) else {}
+            if ticket.get('status') == 'ok':
+                results.append(PushResult(True))
+            else:
+                details = ticket.get('details') or {}
+                # DeviceNotRegistered etc. will never succeed; anything else may be transient
+                results.append(PushResult(
+                    False,
+                    retryable=details.get('error') not in ('DeviceNotRegistered', 'InvalidCredentials'),
+                    error=ticket.get('message', 'missing ticket')
+                ))
+        return results
+
+
+def quiet_hours_end(org: Optional[Dict[str, Any]], now: datetime) -> Optional[datetime]:
+    """
+    If `now` (naive UTC) falls inside the organization's alert quiet hours,
+    the naive UTC time they end; otherwise None.
+    """
+    if not org:
+        return None
+    start, end = org.get('alert_quiet_hours_start'), org.get('alert_quiet_hours_end')
+    if start is None or end is None or start == end:
+        return None
+    
+    try:
+        tz = ZoneInfo(org.get('timezone') or 'UTC')
+    except Exception:
+        tz = timezone.utc
+    local = now.replace(tzinfo=timezone.utc).astimezone(tz)
+    hour = local.hour
+    
+    # Windows may wrap midnight (e.g. 22 -> 7)
+    quiet = start <= hour < end if start < end else (hour >= start or hour < end)
+    if not quiet:
+        return None
+    
+    ends = local.replace(hour=end, minute=0, second=0, microsecond=0)
+    if ends <= local:
+        ends += timedelta(days=1)
+    return ends.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class NotificationDispatcher:
+    """
+    Drains the notification outbox in the background.
+    
+    Each provider gets its own loop that claims due notifications in batches of
+    the provider's `max_batch`, sends up to `max_concurrency` batches at once,
+    and reschedules failures with exponential backoff (with jitter) until
+    `max_attempts`. Notifications created during an organization's quiet hours
+    are deferred until the hours end.
+    """
+    
+    def __init__(
+        self,
+        outbox_repo: NotificationOutboxRepository,
+        org_repo: OrganizationRepository,
+        providers: Dict[str, PushProvider],
+        poll_interval: float = 2.0,
+        max_attempts: int = 5,
+        base_backoff_seconds: float = 5.0,
+        max_backoff_seconds: float = 900.0,
+        lease_seconds: float = 120.0
+    ):
+        self.outbox_repo = outbox_repo
+        self.org_repo = org_repo
+        self.providers = providers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self._wake = {name: asyncio.Event() for name in providers}
+        self._tasks: List[asyncio.Task] = []
+        self.counters = {'enqueued': 0, 'sent': 0, 'retried': 0, 'failed': 0, 'deferred': 0}
+    
+    # ----- producing -----
+    
+    async def enqueue(
+        self,
+        recipients: List[Dict[str, Any]],
+        title: str,
+        body: str,
+        notification_type: str,
+        org_id: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Queue one notification per recipient user document that has a push
+        token for a configured provider. Returns the number queued.
+        """
+        now = datetime.utcnow()
+        org = await self.org_repo.find_by_id(org_id) if org_id else None
+        deferred_until = quiet_hours_end(org, now)
+        
+        notifications = []
+        for user in recipients:
+            provider = user.get('push_provider') or 'expo'
+            if not user.get('push_token') or provider not in self.providers:
+                continue
+            notifications.append(PushNotificationLog(
+                user_id=user['id'],
+                push_token=user['push_token'],
+                provider=provider,
+                org_id=org_id,
+                title=title,
+                body=body,
+                data=data,
+                notification_type=notification_type,
+                next_attempt_at=deferred_until or now
+            ).dict())
+        
+        count = await self.outbox_repo.enqueue_many(notifications)
+        self.counters['enqueued'] += count
+        if deferred_until:
+            self.counters['deferred'] += count
+        else:
+            for notification in notifications:
+                self._wake[notification['provider']].set()
+        return count
+    
+    # ----- consuming -----
+    
+    def start(self):
+        for name, provider in self.providers.items():
+            self._tasks.append(asyncio.create_task(self._run(name, provider)))
+    
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+    
+    async def _run(self, name: str, provider: PushProvider):
+        while True:
+            try:
+                await self.outbox_repo.release_expired()
+                while await self.drain_once(name, provider):
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Push dispatch for {name} failed: {e}")
+            
+            wake = self._wake[name]
+            try:
+                await asyncio.wait_for(wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+    
+    async def drain_once(self, name: str, provider: PushProvider) -> int:
+        """Claim and send up to max_concurrency batches; returns notifications handled"""
+        claimed = await self.outbox_repo.claim_batch(
+            name, provider.max_batch * provider.max_concurrency, self.lease_seconds
+        )
+        if not claimed:
+            return 0
+        
+        batches = [claimed[i:i + provider.max_batch] for i in range(0, len(claimed), provider.max_batch)]
+        await asyncio.gather(*(self._send(provider, batch) for batch in batches))
+        return len(claimed)
+    
+    async def _send(self, provider: PushProvider, batch: List[Dict[str, Any]]):
+        try:
+            results = await provider.send_batch(batch)
+        except Exception as e:
+            results = [PushResult(False, retryable=True, error=str(e))] * len(batch)
+        
+        sent, retries, failures = [], [], []
+        orgs: Dict[str, Optional[Dict[str, Any]]] = {}
+        for notification, result in zip(batch, results):
+            attempts = notification.get('attempts', 0) + 1
+            if result.ok:
+                sent.append(notification['id'])
+            elif result.retryable and attempts < self.max_attempts:
+                retry_at = await self._retry_at(notification, attempts, orgs)
+                retries.append((notification['id'], attempts, retry_at, result.error))
+            else:
+                failures.append((notification['id'], attempts, result.error))
+        
+        await self.outbox_repo.record_outcomes(sent, retries, failures)
+        self.counters['sent'] += len(sent)
+        self.counters['retried'] += len(retries)
+        self.counters['failed'] += len(failures)
+    
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(self.max_backoff_seconds, self.base_backoff_seconds * 2 ** (attempts - 1))
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+    
+    async def _retry_at(
+        self,
+        notification: Dict[str, Any],
+        attempts: int,
+        orgs: Dict[str, Optional[Dict[str, Any]]]
+    ) -> datetime:
+        """Backoff from now, moved to the end of the organization's quiet hours if it falls inside them"""
+        retry_at = datetime.utcnow() + self._backoff(attempts)
+        org_id = notification.get('org_id')
+        if org_id and org_id not in orgs:
+            orgs[org_id] = await self.org_repo.find_by_id(org_id)
+        return quiet_hours_end(orgs.get(org_id), retry_at) or retry_at
+    
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.counters)
+
+
+class RiskAlertNotifier:
+    """
+    Queues push notifications to a member and their caregivers for yellow/red
+    risk events. Caregivers are only notified while the member's consent
+    snapshot allows caregiver access (not paused, disabled or revoked).
+    """
+    
+    NOTIFY_TIERS = ('yellow', 'red')
+    
+    def __init__(
+        self,
+        dispatcher: NotificationDispatcher,
+        user_repo,
+        member_repo,
+        caregiver_repo,
+        caregiver_member_repo,
+        consent_snapshots: ConsentSnapshotCache
+    ):
+        self.dispatcher = dispatcher
+        self.user_repo = user_repo
+        self.member_repo = member_repo
+        self.caregiver_repo = caregiver_repo
+        self.caregiver_member_repo = caregiver_member_repo
+        self.consent_snapshots = consent_snapshots
+    
+    async def notify(self, event: Dict[str, Any]) -> int:
+        """Queue notifications for a newly created risk event; returns the number queued"""
+        if event['tier'] not in self.NOTIFY_TIERS:
+            return 0
+        
+        member = await self.member_repo.find_by_id(event['member_id'])
+        if not member:
+            return 0
+        relationships = []
+        if await self.consent_snapshots.allows_caregivers(event['member_id']):
+            relationships = await self.caregiver_member_repo.find_many({
+                'member_id': event['member_id'],
+                'invitation_status': 'accepted',
+                'can_view_alerts': True
+            })
+        caregivers = await self.caregiver_repo.find_by_ids([r['caregiver_id'] for r in relationships])
+        users = await self.user_repo.find_by_ids([member['user_id']] + [c['user_id'] for c in caregivers.values()])
+        
+        data = {'type': 'risk_alert', 'alert_id': event['id'], 'member_id': event['member_id'], 'tier': event['tier']}
+        queued = 0
+        member_user = users.pop(member['user_id'], None)
+        if member_user:
+            queued += await self.dispatcher.enqueue(
+                [member_user],
+                title="Wellness check-in",
+                body="We noticed some changes in your recent wellness data. Tap to see details.",
+                notification_type='risk_alert',
+                org_id=event['org_id'],
+                data=data
+            )
+        if users:
+            queued += await self.dispatcher.enqueue(
+                list(users.values()),
+                title=f"{member['first_name']}: {event['tier']} wellness alert",
+                body=f"{member['first_name']}'s recent wellness data needs attention.",
+                notification_type='risk_alert',
+                org_id=event['org_id'],
+                data=data
+            )
+        return queued
@@ -1,9 +1,14 @@
 from typing import List, Dict, Any, Optional
-from repositories import RiskRepository, MetricRepository
+from repositories import RiskRepository, MetricRepository, MemberStatusRepository
 from models import RiskEvent, RiskEventCreate, RiskTier, RiskFactor, MetricType
 from datetime import datetime, timedelta
+import logging
 import statistics
 
+from .alert_hub import AlertHub
+
+logger = logging.getLogger(__name__)
+
 
 class RiskService:
     """
@@ -12,9 +17,19 @@ class RiskService:
     Future: Add 'llm' mode for AI-powered explanations.
     """
     
-    def __init__(self, risk_repo: RiskRepository, metric_repo: MetricRepository):
+    def __init__(
+        self,
+        risk_repo: RiskRepository,
+        metric_repo: MetricRepository,
+        status_repo: Optional[MemberStatusRepository] = None,
+        alert_hub: Optional[AlertHub] = None,
+        notifier=None
+    ):
         self.risk_repo = risk_repo
         self.metric_repo = metric_repo
+        self.status_repo = status_repo
+        self.alert_hub = alert_hub
+        self.notifier = notifier  # RiskAlertNotifier
         self.explanation_mode = "template"  # "template" | "llm"
     
     async def analyze_member_risk(self, member_id: str, org_id: str) -> Optional[RiskEvent]:
@@ -45,6 +60,8 @@ class RiskService:
         
         # If no factors, member is in good status
         if not factors:
+            if self.status_repo:
+                await self.status_repo.record_analysis(member_id, org_id, end_date)
             return None
         
         # Calculate composite risk score
@@ -57,20 +74,33 @@ class RiskService:
         # Suggest actions
         actions = self._suggest_actions(tier, factors)
         
-        # Create risk event
-        risk_data = {
-            'member_id': member_id,
-            'org_id': org_id,
-            'tier': tier,
-            'score': score,
-            'factors': [f.dict() for f in factors],
-            'explanation_text': explanation,
-            'suggested_actions': actions,
-            'detected_at': datetime.utcnow()
-        }
-        
-        created = await self.risk_repo.create(risk_data)
-        return RiskEvent(**created)
+        # Create risk event (full model so the stored document has its id and status)
+        risk_event = RiskEvent(
+            member_id=member_id,
+            org_id=org_id,
+            tier=tier,
+            score=score,
+            factors=factors,
+            explanation_text=explanation,
+            suggested_actions=actions,
+            detected_at=datetime.utcnow()
+        )
+        
+        created = await self.risk_repo.create(risk_event.dict())
+        created.pop('_id', None)
+        if self.status_repo:
+            await self.status_repo.record_risk_event(created, RiskRepository.OPEN_STATUSES)
+        
+        risk_event = RiskEvent(**created)
+        if self.alert_hub:
+            await self.alert_hub.publish(member_id, 'risk_event.created', risk_event.json())
+        if self.notifier:
+            try:
+                await self.notifier.notify(created)
+            except Exception as e:
+                # The event is stored; a lost push must not fail the analysis
+                logger.error(f"Queueing push notifications for {risk_event.id} failed: {e}")
+        return risk_event
     
     async def _analyze_hrv(self, member_id: str, start_date: datetime, end_date: datetime) -> Optional[RiskFactor]:
         """
@@ -269,14 +299,41 @@ class RiskService:
         """
         Get risk events/alerts for a member.
         """
-        alerts_data = await self.risk_repo.find_by_member(member_id, limit=limit)
+        alerts_data = await self.get_member_alert_rows(member_id, limit)
         return [RiskEvent(**a) for a in alerts_data]
     
+    async def get_member_alert_rows(self, member_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Raw risk event documents for a member, newest first (for fast serialization).
+        """
+        return await self.risk_repo.find_by_member(member_id, limit=limit)
+    
     async def get_latest_member_risk(self, member_id: str) -> Optional[RiskEvent]:
         """
         Get latest risk event for a member.
         """
+        if self.status_repo:
+            status = await self.status_repo.find_by_member(member_id)
+            if status and status.get('latest_event'):
+                return RiskEvent(**status['latest_event'])
+        
+        # Members without a status document yet (e.g. events created before it existed)
         alert_data = await self.risk_repo.get_latest_by_member(member_id)
         if not alert_data:
             return None
         return RiskEvent(**alert_data)
+    
+    async def update_alert(self, alert_id: str, update_data: Dict[str, Any]) -> Optional[RiskEvent]:
+        """
+        Update an alert's workflow fields and keep the member's status in sync.
+        """
+        updated = await self.risk_repo.update(alert_id, update_data)
+        if not updated:
+            return None
+        if self.status_repo:
+            await self.status_repo.record_event_update(updated, RiskRepository.OPEN_STATUSES)
+        
+        risk_event = RiskEvent(**updated)
+        if self.alert_hub:
+            await self.alert_hub.publish(risk_event.member_id, 'risk_event.updated', risk_event.json())
+        return risk_event
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests run against the in-memory backend; no MongoDB needed
+os.environ.setdefault('DB_BACKEND', 'memory')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def app_client(tmp_path):
+    """(TestClient, Container) for a fresh app on the in-memory backend"""
+    from fastapi.testclient import TestClient
+    from container import Container
+    import server
+    
+    container = Container({
+        'DB_BACKEND': 'memory',
+        'AUDIT_SPILL_PATH': str(tmp_path / 'audit_spill.jsonl'),
+        'SYNC_SETTLE_SECONDS': '0',
+    })
+    with TestClient(server.create_app(container)) as client:
+        yield client, container
+
+
+def register(client, email, role='member', **fields):
+    """Register a user; returns (auth headers, user)"""
+    r = client.post('/api/auth/register', json={
+        'email': email, 'password': 'Passw0rd!', 'first_name': 'Test', 'last_name': 'User', 'role': role, **fields
+    })
+    assert r.status_code == 201, r.text
+    body = r.json()
+    return {'Authorization': f"Bearer {body['access_token']}"}, body['user']
+
+
+def setup_caregiver(client, container):
+    """A member with an accepted caregiver allowed to view alerts; returns (member_id, relationship_id, token)"""
+    headers, user = register(client, 'member@example.com', org_id='org1')
+    member_id = client.post('/api/members', headers=headers, json={
+        'user_id': user['id'], 'org_id': 'org1', 'first_name': 'M', 'last_name': 'Ember'
+    }).json()['id']
+    caregiver_headers, caregiver_user = register(client, 'caregiver@example.com', role='caregiver')
+    client.portal.call(container.caregiver_repo.create, {
+        'id': 'cg1', 'user_id': caregiver_user['id'], 'first_name': 'Care', 'last_name': 'Giver'
+    })
+    client.portal.call(container.caregiver_member_repo.create, {
+        'id': 'rel1', 'member_id': member_id, 'caregiver_id': 'cg1',
+        'invitation_status': 'accepted', 'can_view_alerts': True
+    })
+    token = caregiver_headers['Authorization'].split()[1]
+    return member_id, 'rel1', token
+
+
+def member_with_metrics(client, samples=30):
+    """A member with `samples` hourly HRV samples; returns (member auth headers, member_id)"""
+    headers, user = register(client, 'member@example.com', org_id='org1')
+    member_id = client.post('/api/members', headers=headers, json={
+        'user_id': user['id'], 'org_id': 'org1', 'first_name': 'M', 'last_name': 'Ember'
+    }).json()['id']
+    now = datetime.utcnow()
+    r = client.post('/api/metrics/bulk', headers=headers, json={'samples': [
+        {'member_id': member_id, 'type': 'hrv', 'value_num': 40 + i, 'source': 'watch',
+         'timestamp': (now - timedelta(hours=i + 1)).isoformat()}
+        for i in range(samples)
+    ]})
+    assert r.json()['ingested_count'] == samples
+    return headers, member_id
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from conftest import setup_caregiver
+from services import AlertBroker
+
+
+def publish(client, container, member_id):
+    client.portal.call(container.alert_hub.publish, member_id, 'risk_event.updated', json.dumps({'id': 'r1'}))
+
+
+def test_websocket_closes_when_caregiver_access_is_revoked(app_client):
+    client, container = app_client
+    member_id, relationship_id, token = setup_caregiver(client, container)
+    
+    with client.websocket_connect(f'/api/ws/members/{member_id}/alerts?token={token}') as ws:
+        publish(client, container, member_id)
+        assert json.loads(ws.receive_text())['type'] == 'risk_event.updated'
+        
+        client.portal.call(container.caregiver_member_repo.update_where, relationship_id, {}, {'can_view_alerts': False})
+        publish(client, container, member_id)
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_text()
+        assert closed.value.code == 1008
+    assert container.alert_hub.stats()['connections'] == 0
+
+
+def test_event_stream_ends_when_caregiver_access_is_revoked(app_client):
+    client, container = app_client
+    member_id, relationship_id, token = setup_caregiver(client, container)
+    
+    async def stream():
+        # Raw ASGI: TestClient waits for the whole (endless) response body
+        chunks = []
+        requests = asyncio.Queue()
+        requests.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+        
+        async def receive():
+            # Blocks after the request: the client never disconnects
+            return await requests.get()
+        
+        async def send(message):
+            if message['type'] == 'http.response.body' and message.get('body'):
+                chunks.append(message['body'].decode())
+        
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': f'/api/members/{member_id}/alerts/stream',
+            'raw_path': b'', 'query_string': b'', 'root_path': '', 'http_version': '1.1', 'scheme': 'http',
+            'headers': [(b'authorization', f'Bearer {token}'.encode())],
+            'server': ('testserver', 80), 'client': ('testclient', 1), 'app': client.app,
+        }
+        response = asyncio.create_task(client.app(scope, receive, send))
+        await asyncio.sleep(0.05)
+        await container.alert_hub.publish(member_id, 'risk_event.updated', '{"id": "r1"}')
+        await asyncio.sleep(0.05)
+        await container.caregiver_member_repo.update_where(relationship_id, {}, {'can_view_alerts': False})
+        await container.alert_hub.publish(member_id, 'risk_event.updated', '{"id": "r2"}')
+        await asyncio.wait_for(response, 2)
+        return ''.join(chunks)
+    
+    body = client.portal.call(stream)
+    assert '"r1"' in body
+    assert '"r2"' not in body
+    assert container.alert_hub.stats()['connections'] == 0
+
+
+def test_websocket_closes_when_member_pauses_sharing(app_client):
+    client, container = app_client
+    member_id, _, token = setup_caregiver(client, container)
+    
+    with client.websocket_connect(f'/api/ws/members/{member_id}/alerts?token={token}') as ws:
+        publish(client, container, member_id)
+        assert json.loads(ws.receive_text())['type'] == 'risk_event.updated'
+        
+        client.portal.call(
+            container.member_service.pause_data_sharing, member_id, datetime.utcnow() + timedelta(hours=1)
+        )
+        publish(client, container, member_id)
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_text()
+        assert closed.value.code == 1008
+
+
+def test_broker_must_implement_start_and_publish():
+    class StartOnly(AlertBroker):
+        async def start(self, deliver):
+            pass
+    
+    with pytest.raises(TypeError, match='abstract'):
+        StartOnly()
@@ -0,0 +1,72 @@
+from datetime import datetime
+import asyncio
+import threading
+
+from models import AuditAction
+from repositories import AuditLogRepository
+from repositories.memory import InMemoryDatabase
+from services import AuditLogger
+
+
+class FlakyRepository:
+    """Audit repository that fails every write while `down`"""
+    
+    def __init__(self, repo):
+        self.repo = repo
+        self.down = True
+    
+    async def insert_batch(self, events):
+        if self.down:
+            raise ConnectionError("server selection timeout")
+        return await self.repo.insert_batch(events)
+    
+    async def drop_expired_partitions(self):
+        return []
+
+
+def test_full_queue_spills_off_the_event_loop(tmp_path):
+    spill_path = tmp_path / 'audit_spill.jsonl'
+    audit = AuditLogger(AuditLogRepository(InMemoryDatabase()), spill_path=str(spill_path), max_queue=1)
+    threads = []
+    append_spill = audit._append_spill
+    
+    def recording_append_spill(events):
+        threads.append(threading.current_thread())
+        append_spill(events)
+    
+    audit._append_spill = recording_append_spill
+    
+    async def run():
+        for i in range(3):
+            audit.record(AuditAction.LOGIN, resource_type='user', resource_id=str(i))
+        # record() returned without touching the file
+        assert not threads and not spill_path.exists()
+        await audit._overflow_task
+        spilled = audit.stats()['spilled']
+        await audit.stop()
+        return spilled
+    
+    assert asyncio.run(run()) == 2
+    assert threads and threading.main_thread() not in threads
+    # The queued event went to the database on stop()
+    assert len(spill_path.read_text().splitlines()) == 2
+
+
+def test_spilled_events_are_replayed_once_writes_succeed(tmp_path):
+    db = InMemoryDatabase()
+    repo = FlakyRepository(AuditLogRepository(db))
+    audit = AuditLogger(repo, spill_path=str(tmp_path / 'audit_spill.jsonl'), flush_interval=0.01)
+    
+    async def run():
+        audit.start()
+        for i in range(20):
+            audit.record(AuditAction.LOGIN, resource_type='user', resource_id=str(i))
+        while audit.stats()['spilled'] < 20:
+            await asyncio.sleep(0.01)
+        repo.down = False
+        assert await audit.replay_spill() == 20
+        await audit.stop()
+        return await db[AuditLogRepository.partition_name(datetime.utcnow())].count_documents({})
+    
+    assert asyncio.run(run()) == 20
+    assert not audit.stats()['spill_pending']
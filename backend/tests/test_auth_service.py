@@ -0,0 +1,86 @@
+import asyncio
+
+from container import Container
+from utils.security import create_access_token
+
+
+async def make_user(container) -> str:
+    """Store an active user; returns an access token for it"""
+    await container.user_repo.create({
+        'id': 'u1', 'email': 'auth@example.com', 'role': 'member', 'org_id': 'org1',
+        'hashed_password': 'secret-hash', 'reset_token': 'reset', 'is_active': True
+    })
+    return create_access_token({'sub': 'u1', 'role': 'member'})
+
+
+def test_principal_cache_keeps_only_authorization_fields():
+    container = Container({'DB_BACKEND': 'memory'})
+    auth = container.auth_service
+    
+    async def run():
+        token = await make_user(container)
+        user = await auth.get_current_user(token)
+        assert (user.id, user.role, user.org_id) == ('u1', 'member', 'org1')
+        cached = auth.principal_cache.get('u1')
+        assert cached.hashed_password is None and cached.reset_token is None
+    
+    asyncio.run(run())
+
+
+def test_principal_loaded_during_a_security_change_is_not_cached():
+    container = Container({'DB_BACKEND': 'memory'})
+    auth = container.auth_service
+    
+    async def run():
+        token = await make_user(container)
+        find_by_id = container.user_repo.find_by_id
+        
+        async def racing_find_by_id(id):
+            # Read the active user, then the account is disabled before the caller caches it
+            doc = await find_by_id(id)
+            await container.user_repo.update(id, {'is_active': False})
+            return doc
+        
+        container.user_repo.find_by_id = racing_find_by_id
+        assert await auth.get_current_user(token) is not None
+        container.user_repo.find_by_id = find_by_id
+        assert auth.principal_cache.get('u1') is None
+        assert await auth.get_current_user(token) is None
+    
+    asyncio.run(run())
+
+
+def test_org_move_refreshes_the_cached_principal():
+    container = Container({'DB_BACKEND': 'memory'})
+    auth = container.auth_service
+    
+    async def run():
+        token = await make_user(container)
+        assert (await auth.get_current_user(token)).org_id == 'org1'
+        await container.user_repo.update('u1', {'org_id': 'org2'})
+        assert (await auth.get_current_user(token)).org_id == 'org2'
+    
+    asyncio.run(run())
+
+
+def test_user_delete_runs_in_the_callers_session():
+    container = Container({'DB_BACKEND': 'memory'})
+    auth = container.auth_service
+    
+    async def run():
+        token = await make_user(container)
+        assert await auth.get_current_user(token) is not None
+        sessions = []
+        delete_one = container.user_repo.collection.delete_one
+        
+        async def recording_delete_one(query, session=None):
+            sessions.append(session)
+            return await delete_one(query, session=session)
+        
+        container.user_repo.collection.delete_one = recording_delete_one
+        session = object()
+        assert await container.user_repo.delete('u1', session=session)
+        assert sessions == [session]
+        assert await auth.get_current_user(token) is None
+    
+    asyncio.run(run())
@@ -0,0 +1,115 @@
+import asyncio
+
+from conftest import register, setup_caregiver
+from repositories.base import BaseRepository
+from repositories.memory import InMemoryDatabase
+
+
+class CallCounter:
+    """Counts calls to the named collection methods"""
+    
+    def __init__(self, collection, *names):
+        self.calls = {name: 0 for name in names}
+        for name in names:
+            setattr(collection, name, self._wrap(name, getattr(collection, name)))
+    
+    def _wrap(self, name, method):
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return method(*args, **kwargs)
+        return counted
+
+
+def make_repo(name='widgets'):
+    return BaseRepository(InMemoryDatabase(), name)
+
+
+def test_find_by_ids_is_one_query():
+    repo = make_repo()
+    
+    async def run():
+        for i in range(5):
+            await repo.create({'id': f'w{i}', 'name': f'widget {i}'})
+        counter = CallCounter(repo.collection, 'find')
+        found = await repo.find_by_ids(['w3', 'w1', 'w3', 'missing'])
+        empty = await repo.find_by_ids([])
+        return counter.calls, found, empty
+    
+    calls, found, empty = asyncio.run(run())
+    assert calls == {'find': 1}
+    assert sorted(found) == ['w1', 'w3']
+    assert found['w3'] == {'id': 'w3', 'name': 'widget 3'}
+    assert empty == {}
+
+
+def test_find_with_lookup_joins_in_one_aggregation():
+    db = InMemoryDatabase()
+    relationships = BaseRepository(db, 'caregiver_members')
+    caregivers = BaseRepository(db, 'caregivers')
+    
+    async def run():
+        await caregivers.create({'id': 'c1', 'first_name': 'Ann'})
+        await caregivers.create({'id': 'c2', 'first_name': 'Bob'})
+        for id, caregiver_id in [('r1', 'c1'), ('r2', 'c2'), ('r3', 'gone')]:
+            await relationships.create({'id': id, 'member_id': 'm1', 'caregiver_id': caregiver_id})
+        await relationships.create({'id': 'r4', 'member_id': 'm2', 'caregiver_id': 'c1'})
+        counter = CallCounter(relationships.collection, 'aggregate', 'find')
+        joined = await relationships.find_with_lookup(
+            {'member_id': 'm1'}, from_collection='caregivers', local_field='caregiver_id', as_field='caregiver'
+        )
+        return counter.calls, joined
+    
+    calls, joined = asyncio.run(run())
+    assert calls == {'aggregate': 1, 'find': 0}
+    # The relationship whose caregiver no longer exists is dropped
+    assert sorted((r['id'], r['caregiver']['first_name']) for r in joined) == [('r1', 'Ann'), ('r2', 'Bob')]
+    assert all('_id' not in r and '_id' not in r['caregiver'] for r in joined)
+
+
+def test_member_caregivers_route_returns_joined_profiles(app_client):
+    client, container = app_client
+    member_id, relationship_id, token = setup_caregiver(client, container)
+    r = client.get(f'/api/members/{member_id}/caregivers', headers={'Authorization': f'Bearer {token}'})
+    assert r.status_code == 200
+    assert [(c['id'], c['caregiver']['first_name']) for c in r.json()] == [(relationship_id, 'Care')]
+
+
+def test_update_is_one_atomic_round_trip():
+    repo = make_repo()
+    
+    async def run():
+        await repo.create({'id': 'w1', 'name': 'old', 'size': 3, 'status': 'new'})
+        counter = CallCounter(repo.collection, 'find', 'find_one', 'update_one', 'find_one_and_update')
+        updated = await repo.update('w1', {'name': 'new'}, projection={'name': 1, 'updated_at': 1})
+        unchanged = await repo.update('w1', {'name': 'new'})
+        missing = await repo.update('nope', {'name': 'x'})
+        return counter.calls, updated, unchanged, missing
+    
+    calls, updated, unchanged, missing = asyncio.run(run())
+    assert calls == {'find': 0, 'find_one': 0, 'update_one': 0, 'find_one_and_update': 3}
+    assert set(updated) == {'name', 'updated_at'} and updated['name'] == 'new'
+    # Writing the same value again still finds the document
+    assert unchanged['name'] == 'new' and unchanged['size'] == 3
+    assert missing is None
+
+
+def test_update_where_only_writes_when_conditions_match():
+    repo = make_repo()
+    
+    async def run():
+        await repo.create({'id': 'w1', 'status': 'new'})
+        skipped = await repo.update_where('w1', {'status': 'resolved'}, {'status': 'acknowledged'})
+        after_skip = await repo.find_by_id('w1')
+        applied = await repo.update_where('w1', {'status': 'new'}, {'status': 'acknowledged'})
+        return skipped, after_skip, applied
+    
+    skipped, after_skip, applied = asyncio.run(run())
+    assert skipped is None and after_skip['status'] == 'new'
+    assert applied['status'] == 'acknowledged'
+
+
+def test_patch_routes_answer_404_for_unknown_ids(app_client):
+    client, _ = app_client
+    headers, _ = register(client, 'manager@example.com', role='care_manager', org_id='org1')
+    assert client.patch('/api/members/nope', headers=headers, json={'first_name': 'X'}).status_code == 404
+    assert client.patch('/api/alerts/nope', headers=headers, json={'status': 'acknowledged'}).status_code == 404
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from conftest import register
+
+
+def setup_circle(client, container, count=3):
+    """A caregiver with accepted access to `count` members; returns (caregiver headers, member IDs)"""
+    member_ids = []
+    for i in range(count):
+        headers, user = register(client, f'member{i}@example.com', org_id='org1')
+        member_ids.append(client.post('/api/members', headers=headers, json={
+            'user_id': user['id'], 'org_id': 'org1', 'first_name': f'M{i}', 'last_name': 'Ember'
+        }).json()['id'])
+    caregiver_headers, caregiver_user = register(client, 'caregiver@example.com', role='caregiver')
+    client.portal.call(container.caregiver_repo.create, {
+        'id': 'cg1', 'user_id': caregiver_user['id'], 'first_name': 'Care', 'last_name': 'Giver'
+    })
+    for i, member_id in enumerate(member_ids):
+        client.portal.call(container.caregiver_member_repo.create, {
+            'id': f'rel{i}', 'member_id': member_id, 'caregiver_id': 'cg1', 'invitation_status': 'accepted'
+        })
+    return caregiver_headers, member_ids
+
+
+def test_dashboard_pages_through_every_member(app_client):
+    client, container = app_client
+    headers, member_ids = setup_circle(client, container, count=5)
+    client.portal.call(container.member_service.pause_data_sharing, member_ids[1], datetime.utcnow() + timedelta(days=1))
+    
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+        r = client.get('/api/caregivers/me/dashboard', headers=headers, params=params)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        seen += [m['member_id'] for m in body['members']]
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == [member_ids[i] for i in (0, 2, 3, 4)]
+
+
+def test_dashboard_reads_members_once(app_client):
+    client, container = app_client
+    headers, member_ids = setup_circle(client, container)
+    container.consent_snapshots.invalidate()
+    reads = []
+    find_by_ids = container.member_repo.find_by_ids
+    
+    async def counting_find_by_ids(ids):
+        reads.append(sorted(ids))
+        return await find_by_ids(ids)
+    
+    container.member_repo.find_by_ids = counting_find_by_ids
+    r = client.get('/api/caregivers/me/dashboard', headers=headers)
+    assert [m['first_name'] for m in r.json()['members']] == ['M0', 'M1', 'M2']
+    assert reads == [sorted(member_ids)]
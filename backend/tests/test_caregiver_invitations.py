@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from container import Container
+
+
+def invite(email):
+    return {'email': email, 'first_name': 'Care', 'last_name': 'Giver', 'relationship': 'daughter'}
+
+
+async def make_container():
+    container = Container({'DB_BACKEND': 'memory'})
+    await container.build_indexes()
+    return container
+
+
+def test_repeated_and_differently_cased_emails_are_one_invite():
+    async def run():
+        container = await make_container()
+        service = container.caregiver_invitations
+        await container.user_repo.create({'id': 'u-carol', 'email': 'Carol@Example.com', 'role': 'caregiver'})
+        
+        first = await service.invite_batch('m1', [
+            invite('Ann@Example.com'), invite(' ann@example.com '), invite('Carol@Example.com')
+        ])
+        again = await service.invite_batch('m1', [invite('ANN@example.com'), invite('Carol@Example.com ')])
+        return container, first, again
+    
+    container, first, again = asyncio.run(run())
+    assert [r['status'] for r in first] == ['invited', 'duplicate', 'invited']
+    assert [r['user_created'] for r in first] == [True, False, False]
+    assert [r['status'] for r in again] == ['already_invited', 'already_invited']
+    
+    users = asyncio.run(container.user_repo.find_many({}))
+    caregivers = asyncio.run(container.caregiver_repo.find_many({}))
+    relationships = asyncio.run(container.caregiver_member_repo.find_many({}))
+    assert sorted(u['email'] for u in users) == ['Carol@Example.com', 'ann@example.com']
+    assert len(caregivers) == 2 and len(relationships) == 2
+
+
+def test_concurrent_caregiver_conflict_fails_cleanly_and_retry_succeeds():
+    async def run():
+        container = await make_container()
+        service = container.caregiver_invitations
+        await container.user_repo.create({'id': 'u-bob', 'email': 'bob@example.com', 'role': 'caregiver'})
+        find_by_user_ids = container.caregiver_repo.find_by_user_ids
+        
+        async def racing_find_by_user_ids(user_ids):
+            # Another batch creates Bob's caregiver profile right after this lookup
+            found = await find_by_user_ids(user_ids)
+            await container.caregiver_repo.create({'id': 'cg-bob', 'user_id': 'u-bob', 'first_name': 'Bob'})
+            return found
+        
+        container.caregiver_repo.find_by_user_ids = racing_find_by_user_ids
+        with pytest.raises(ValueError):
+            await service.invite_batch('m1', [invite('new@example.com'), invite('bob@example.com')])
+        container.caregiver_repo.find_by_user_ids = find_by_user_ids
+        assert await container.caregiver_member_repo.find_many({}) == []
+        
+        results = await service.invite_batch('m1', [invite('new@example.com'), invite('bob@example.com')])
+        caregivers = await container.caregiver_repo.find_many({})
+        return results, caregivers
+    
+    results, caregivers = asyncio.run(run())
+    assert [r['status'] for r in results] == ['invited', 'invited']
+    assert results[1]['caregiver_id'] == 'cg-bob'
+    assert sorted(c['user_id'] for c in caregivers).count('u-bob') == 1
+    assert len(caregivers) == 2
@@ -0,0 +1,30 @@
+from conftest import setup_caregiver
+
+
+def alerts_status(client, member_id, headers):
+    return client.get(f'/api/members/{member_id}/alerts', headers=headers).status_code
+
+
+def test_relationship_changes_apply_before_the_cache_expires(app_client):
+    client, container = app_client
+    member_id, relationship_id, token = setup_caregiver(client, container)
+    headers = {'Authorization': f'Bearer {token}'}
+    relationships = container.caregiver_member_repo
+    
+    # Pending: each check below runs with the previous answer cached
+    client.portal.call(relationships.update_where, relationship_id, {}, {'invitation_status': 'pending'})
+    assert alerts_status(client, member_id, headers) == 403
+    
+    assert client.post(f'/api/caregivers/{relationship_id}/accept', headers=headers).status_code == 200
+    assert alerts_status(client, member_id, headers) == 200
+    hits = container.caregiver_permissions.stats()['hits']
+    assert alerts_status(client, member_id, headers) == 200
+    assert container.caregiver_permissions.stats()['hits'] == hits + 1
+    
+    client.portal.call(relationships.update_where, relationship_id, {}, {'can_view_alerts': False})
+    assert alerts_status(client, member_id, headers) == 403
+    client.portal.call(relationships.update_where, relationship_id, {}, {'can_view_alerts': True})
+    assert alerts_status(client, member_id, headers) == 200
+    
+    assert client.delete(f'/api/caregivers/{relationship_id}', headers=headers).status_code == 200
+    assert alerts_status(client, member_id, headers) == 403
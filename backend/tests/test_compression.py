@@ -0,0 +1,52 @@
+import gzip
+
+import pytest
+
+from conftest import member_with_metrics
+from utils import compression
+
+
+def test_large_bodies_are_gzipped_for_clients_that_accept_it(app_client):
+    client, _ = app_client
+    headers, member_id = member_with_metrics(client)
+    url = f'/api/members/{member_id}/metrics'
+    
+    plain = client.get(url, headers={**headers, 'Accept-Encoding': 'identity'})
+    assert 'content-encoding' not in plain.headers
+    assert len(plain.content) >= 1024
+    
+    r = client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert r.headers['content-encoding'] == 'gzip'
+    assert 'accept-encoding' in r.headers['vary'].lower()
+    assert int(r.headers['content-length']) < len(plain.content)
+    assert r.json() == plain.json()
+    assert r.headers['etag'].startswith('W/')
+    
+    refused = client.get(url, headers={**headers, 'Accept-Encoding': 'gzip;q=0'})
+    assert 'content-encoding' not in refused.headers
+
+
+def test_small_bodies_are_sent_uncompressed(app_client):
+    client, _ = app_client
+    headers, _ = member_with_metrics(client, samples=1)
+    r = client.get('/api/auth/me', headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert r.status_code == 200 and len(r.content) < 1024
+    assert 'content-encoding' not in r.headers
+
+
+def test_encoding_negotiation(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert compression._choose_encoding('gzip, deflate, br') == 'gzip'
+    assert compression._choose_encoding('br') is None
+    assert compression._choose_encoding('*') == 'gzip'
+    assert compression._choose_encoding('*;q=0, gzip;q=0') is None
+    assert gzip.decompress(compression._compress(b'x' * 2048, 'gzip', 6, 4)) == b'x' * 2048
+
+
+def test_brotli_is_preferred_when_installed(app_client):
+    pytest.importorskip('brotli')
+    client, _ = app_client
+    headers, member_id = member_with_metrics(client)
+    r = client.get(f'/api/members/{member_id}/metrics', headers={**headers, 'Accept-Encoding': 'gzip, br'})
+    assert r.headers['content-encoding'] == 'br'
+    assert compression._choose_encoding('gzip;q=0.5, br') == 'br'
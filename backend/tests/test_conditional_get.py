@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from conftest import member_with_metrics
+from utils.etag import make_etag
+
+
+def test_etags_are_weak_and_depend_on_every_part():
+    at = datetime(2026, 1, 1)
+    etag = make_etag('metrics', 'm1', None, 7, at)
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag('metrics', 'm1', None, 7, at)
+    assert etag != make_etag('metrics', 'm1', None, 30, at)
+    assert etag != make_etag('metrics', 'm1', None, 7, at + timedelta(microseconds=1))
+
+
+def test_matching_if_none_match_returns_304_until_data_changes(app_client):
+    client, _ = app_client
+    headers, member_id = member_with_metrics(client)
+    url = f'/api/members/{member_id}/metrics'
+    
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200 and len(first.json()) == 30
+    etag = first.headers['etag']
+    assert etag.startswith('W/') and first.headers['cache-control'] == 'private, no-cache'
+    
+    for if_none_match in (etag, etag[2:], f'W/"other", {etag}', '*'):
+        r = client.get(url, headers={**headers, 'If-None-Match': if_none_match})
+        assert r.status_code == 304, if_none_match
+        assert r.content == b'' and r.headers['etag'] == etag
+    assert client.get(url, headers={**headers, 'If-None-Match': 'W/"other"'}).status_code == 200
+    # A different query is a different representation
+    assert client.get(f'{url}?days=30', headers={**headers, 'If-None-Match': etag}).status_code == 200
+    
+    client.post('/api/metrics', headers=headers, json={
+        'member_id': member_id, 'type': 'hrv', 'value_num': 99, 'source': 'watch',
+        'timestamp': datetime.utcnow().isoformat()
+    })
+    r = client.get(url, headers={**headers, 'If-None-Match': etag})
+    assert r.status_code == 200 and r.headers['etag'] != etag and len(r.json()) == 31
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+from conftest import register, setup_caregiver
+from models import ConsentType
+
+
+def create_member(client, email, org_id='org1'):
+    headers, user = register(client, email, org_id=org_id)
+    r = client.post('/api/members', headers=headers, json={
+        'user_id': user['id'], 'org_id': org_id, 'first_name': 'M', 'last_name': 'Ember'
+    })
+    assert r.status_code == 201, r.text
+    return headers, r.json()['id']
+
+
+def sample(member_id, value=60):
+    return {'member_id': member_id, 'type': 'heart_rate', 'value_num': value, 'source': 'watch',
+            'timestamp': datetime.utcnow().isoformat()}
+
+
+def test_ingest_is_refused_without_collection_consent(app_client):
+    client, container = app_client
+    headers, member_id = create_member(client, 'member@example.com')
+    assert client.post('/api/metrics', headers=headers, json=sample(member_id)).status_code == 200
+    
+    r = client.post(f'/api/members/{member_id}/consents', headers=headers, json={
+        'member_id': member_id, 'consent_type': 'data_collection', 'granted': False
+    })
+    assert r.status_code == 200, r.text
+    r = client.post('/api/metrics', headers=headers, json=sample(member_id))
+    assert r.status_code == 403
+    assert client.post('/api/metrics', headers=headers, json=sample('no-such-member')).status_code == 403
+
+
+def test_bulk_ingest_counts_rejected_samples(app_client):
+    client, container = app_client
+    headers, allowed = create_member(client, 'allowed@example.com')
+    _, refused = create_member(client, 'refused@example.com')
+    client.portal.call(container.member_service.grant_consent, refused, ConsentType.DATA_COLLECTION, False)
+    
+    samples = [sample(allowed, 60), sample(refused, 61), sample(allowed, 62), sample('no-such-member', 63)]
+    r = client.post('/api/metrics/bulk', headers=headers, json={'samples': samples})
+    assert r.status_code == 200, r.text
+    assert r.json() == {'ingested_count': 2, 'rejected_count': 2}
+    stored = client.portal.call(container.metric_repo.find_many, {})
+    assert sorted(s['value_num'] for s in stored) == [60, 62]
+
+
+def queue_risk_alert(client, container, member_id):
+    """Push recipients (user IDs) queued for a red risk event"""
+    before = {n['id'] for n in client.portal.call(container.outbox_repo.find_many, {})}
+    client.portal.call(container.risk_notifier.notify, {
+        'id': f'risk-{len(before)}', 'member_id': member_id, 'org_id': 'org1', 'tier': 'red'
+    })
+    queued = client.portal.call(container.outbox_repo.find_many, {})
+    return sorted(n['user_id'] for n in queued if n['id'] not in before)
+
+
+def test_risk_alert_push_skips_caregivers_the_member_has_cut_off(app_client):
+    client, container = app_client
+    member_id, _, _ = setup_caregiver(client, container)
+    member_user_id = client.portal.call(container.member_repo.find_by_id, member_id)['user_id']
+    caregiver_user_id = client.portal.call(container.caregiver_repo.find_by_id, 'cg1')['user_id']
+    for user_id in (member_user_id, caregiver_user_id):
+        client.portal.call(container.user_repo.update, user_id, {'push_token': f'token-{user_id}'})
+    
+    assert queue_risk_alert(client, container, member_id) == sorted([member_user_id, caregiver_user_id])
+    
+    client.portal.call(container.member_service.pause_data_sharing, member_id, datetime.utcnow() + timedelta(hours=1))
+    assert queue_risk_alert(client, container, member_id) == [member_user_id]
+    
+    client.portal.call(container.member_service.resume_data_sharing, member_id)
+    client.portal.call(container.member_service.grant_consent, member_id, ConsentType.CAREGIVER_ACCESS, False)
+    assert queue_risk_alert(client, container, member_id) == [member_user_id]
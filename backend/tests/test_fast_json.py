@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ValidationError
+
+from models import MetricSample, RiskEvent
+from utils.fast_json import dump_json, fast_json_response
+
+AT = datetime(2026, 1, 1, 8, 30, 0, 125000)
+
+
+def rows():
+    return [
+        # Raw database rows: extra keys, whole-number floats, microseconds, non-ASCII text
+        {'_id': 'x', 'id': 's1', 'member_id': 'm1', 'type': 'hrv', 'value_num': 42, 'unit': 'ms',
+         'source': 'watch', 'timestamp': AT, 'ingested_at': AT, 'legacy_field': True},
+        {'id': 's2', 'member_id': 'm1', 'type': 'steps', 'value_json': {'note': 'café'}, 'source': 'phone',
+         'timestamp': AT.replace(microsecond=0), 'ingested_at': AT},
+    ]
+
+
+def test_output_matches_the_response_model_path_byte_for_byte():
+    app = FastAPI()
+    
+    @app.get('/default', response_model=List[MetricSample])
+    async def default():
+        return rows()
+    
+    @app.get('/fast', response_model=List[MetricSample])
+    async def fast():
+        return fast_json_response(List[MetricSample], rows())
+    
+    with TestClient(app) as client:
+        expected, actual = client.get('/default'), client.get('/fast')
+    assert actual.content == expected.content
+    assert actual.headers['content-type'] == 'application/json'
+    assert b'legacy_field' not in actual.content and b'"_id"' not in actual.content
+
+
+class Page(BaseModel):
+    items: List[MetricSample]
+    next_cursor: Optional[str] = None
+
+
+def test_rows_nested_in_a_page_model():
+    body = dump_json(Page, {'items': rows()})
+    assert body.startswith(b'{"items":[{"id":"s1"') and body.endswith(b'"next_cursor":null}')
+    assert b'"value_num":42.0' in body and b'"_id"' not in body
+
+
+def test_malformed_rows_raise_like_response_model_validation():
+    with pytest.raises(ValidationError):
+        dump_json(List[RiskEvent], [{'id': 'r1'}])
+
+
+def test_large_list_routes_keep_their_openapi_schema(app_client):
+    client, _ = app_client
+    schema = client.get('/openapi.json').json()
+    response = schema['paths']['/api/members/{member_id}/metrics']['get']['responses']['200']
+    assert response['content']['application/json']['schema']['items']['$ref'].endswith('/MetricSample')
@@ -0,0 +1,11 @@
+from benchmarks import import_time
+
+
+def test_server_imports_without_building_dependencies():
+    # run_once imports server in a fresh interpreter with no database settings
+    # and fails if the container built anything (e.g. a database client)
+    assert import_time.run_once() is not None
+
+
+def test_server_import_within_budget(capsys):
+    assert import_time.main(['--runs', '3']) == 0, capsys.readouterr().out
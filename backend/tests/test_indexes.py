@@ -0,0 +1,252 @@
+"""
+Every repository query must be served by a declared index.
+
+Each finder is run against the in-memory backend while the filters and sorts
+it sends are recorded; each recorded shape must then be covered (IndexSpec.covers)
+by one of the repository's declared indexes. Public repository methods that
+are neither listed in FINDERS nor in NOT_QUERIES fail the test, so a new
+finder cannot be added without checking its index.
+"""
+from datetime import datetime, timedelta
+import asyncio
+import inspect
+
+import pytest
+
+from container import Container
+from repositories.memory import InMemoryCollection
+
+NOW = datetime.utcnow()
+SINCE = NOW - timedelta(days=7)
+
+# repository attribute -> {method: (args, kwargs)}
+FINDERS = {
+    'user_repo': {
+        'update': (('u1', {'first_name': 'A'}), {}),
+        'delete': (('u1',), {}),
+        'find_by_email': (('a@example.com',), {}),
+        'find_by_emails': ((['a@example.com'],), {}),
+        'find_by_oauth': (('google', 'sub'), {}),
+        'find_by_reset_token': (('token',), {}),
+        'verify_email': (('u1',), {}),
+    },
+    'member_repo': {
+        'find_by_id': (('m1',), {}),
+        'find_by_user_id': (('u1',), {}),
+        'find_by_org': (('org1',), {}),
+        'find_page_by_org': (('org1',), {}),
+        'pause_data_sharing': (('m1', NOW), {}),
+        'update_where': (('m1', {'org_id': 'org1'}, {'first_name': 'A'}), {}),
+        'delete': (('m1',), {}),
+    },
+    'metric_repo': {
+        'find_by_member_and_type': (('m1', 'hrv', SINCE, NOW), {}),
+        'find_by_member': (('m1', SINCE, NOW), {}),
+        'get_latest_by_type': (('m1', 'hrv'), {}),
+        'latest_by_members': ((['m1'], ['hrv'], SINCE), {}),
+        'version_marker': (('m1', SINCE, 'hrv'), {}),
+        'daily_summary': (('m1', SINCE), {}),
+    },
+    'risk_repo': {
+        'find_by_member': (('m1',), {}),
+        'find_by_org_and_status': (('org1', 'new', 'red'), {}),
+        'find_page_by_member': (('m1',), {}),
+        'find_page_by_org': (('org1', 'new', 'red'), {}),
+        'find_org_queue': (('org1', ['new', 'acknowledged'], 'red'), {}),
+        'count_by_members': ((['m1'], ['new']), {}),
+        'version_marker': (('m1',), {}),
+        'get_latest_by_member': (('m1',), {}),
+    },
+    'consent_repo': {
+        'find_by_member': (('m1',), {}),
+        'latest_by_members': ((['m1'], ['data_collection']), {}),
+        'find_active_consent': (('m1', 'data_collection'), {}),
+    },
+    'device_repo': {
+        'find_by_id': (('d1',), {}),
+        'find_by_member': (('m1',), {}),
+        'find_active_devices': (('m1',), {}),
+        'update_where': (('d1', {}, {'is_active': False}), {}),
+        'delete': (('d1',), {}),
+    },
+    'org_repo': {
+        'find_by_id': (('org1',), {}),
+        'update_where': (('org1', {}, {'name': 'Org'}), {}),
+        'delete': (('org1',), {}),
+    },
+    'status_repo': {
+        'find_by_member': (('m1',), {}),
+        'find_by_members': ((['m1'],), {}),
+        'find_roster': (('org1', 'red'), {}),
+        'record_risk_event': (({'id': 'r1', 'member_id': 'm1', 'org_id': 'org1', 'tier': 'red', 'status': 'new',
+                                'score': 90.0, 'detected_at': NOW}, ['new']), {}),
+        'record_event_update': (({'id': 'r1', 'member_id': 'm1', 'org_id': 'org1', 'tier': 'red', 'status': 'resolved',
+                                  'score': 90.0, 'detected_at': NOW}, ['new']), {}),
+        'record_analysis': (('m1', 'org1', NOW), {}),
+        'record_samples': (({'m1': NOW},), {}),
+    },
+    'outbox_repo': {
+        'claim_batch': (('expo', 10, 60), {}),
+        'record_outcomes': ((['n1'], [('n2', 1, NOW, 'error')], [('n3', 1, 'error')]), {}),
+        'delete_for_member': (('m1',), {}),
+        'release_expired': ((), {}),
+    },
+    'caregiver_repo': {
+        'find_by_id': (('c1',), {}),
+        'find_by_user_id': (('u1',), {}),
+        'find_by_user_ids': ((['u1'],), {}),
+        'update_where': (('c1', {}, {'first_name': 'A'}), {}),
+        'delete': (('c1',), {}),
+    },
+    'caregiver_member_repo': {
+        'find_by_member': (('m1',), {}),
+        'find_by_member_with_caregivers': (('m1',), {}),
+        'find_by_caregiver': (('c1',), {}),
+        'find_accepted_page': (('c1',), {}),
+        'find_relationship': (('m1', 'c1'), {}),
+        'count_by_member': (('m1',), {}),
+        'find_caregiver_ids_for_member': (('m1', ['c1']), {}),
+        'accept_invitation': (('cm1',), {}),
+        'update_where': (('cm1', {}, {'can_view_alerts': True}), {}),
+        'delete': (('cm1',), {}),
+    },
+}
+
+# Public methods that issue no filtered query of their own (writes of new
+# documents, caller-supplied filters, cache maintenance, whole-collection stats)
+NOT_QUERIES = {
+    'create', 'create_many', 'bulk_create', 'enqueue_many',
+    'delete_many', 'invalidate', 'prime', 'count_by_status',
+}
+
+# Seed documents so finders that only query further after a first hit get there
+SEED = {
+    'notification_outbox': {'id': 'n1', 'status': 'pending', 'provider': 'expo', 'next_attempt_at': SINCE},
+    'caregiver_members': {'id': 'cm1', 'member_id': 'm1', 'caregiver_id': 'c1', 'invitation_status': 'pending'},
+    'member_status': {'member_id': 'm1', 'org_id': 'org1', 'tier': 'red'},
+}
+
+_RANGE_OPERATORS = {'$gt', '$gte', '$lt', '$lte'}
+
+
+def query_shape(query):
+    """(equality fields, range fields) of a filter; $or keyset continuations follow the sort"""
+    equality, ranges = set(), []
+    for field, value in (query or {}).items():
+        if field == '$and':
+            for clause in value:
+                clause_equality, clause_ranges = query_shape(clause)
+                equality |= clause_equality
+                ranges += clause_ranges
+        elif field.startswith('$'):
+            continue
+        elif isinstance(value, dict) and any(op.startswith('$') for op in value):
+            if '$in' in value or '$eq' in value:
+                equality.add(field)
+            elif _RANGE_OPERATORS & set(value):
+                ranges.append(field)
+        else:
+            equality.add(field)
+    return equality, ranges
+
+
+def served_by_index(specs, query, sort, strict=False):
+    """
+    True if some declared index serves the equality fields and then the sort
+    (or range). `strict` also requires every equality field to be an index
+    bound rather than a predicate applied to each fetched document.
+    """
+    equality, ranges = query_shape(query)
+    order = [field for field, _ in sort] or ranges
+    order = [field for field in order if field not in equality]
+    if not equality and not order:
+        return True
+    for spec in specs:
+        fields = spec.fields
+        prefix = 0
+        while prefix < len(fields) and fields[prefix] in equality:
+            prefix += 1
+        if strict and prefix < len(equality):
+            continue
+        if (prefix or order) and spec.covers(fields[:prefix], order):
+            return True
+    return False
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Record (collection, filter, sort) for every query the in-memory backend runs"""
+    calls = []
+    select = InMemoryCollection._select
+    aggregate = InMemoryCollection.aggregate
+    delete_many = InMemoryCollection.delete_many
+    
+    def recording_select(self, query, sort=()):
+        calls.append((self.name, query, list(sort)))
+        return select(self, query, sort)
+    
+    def recording_aggregate(self, pipeline, session=None, **kwargs):
+        if pipeline and '$match' in pipeline[0]:
+            sort = pipeline[1].get('$sort', {}) if len(pipeline) > 1 else {}
+            calls.append((self.name, pipeline[0]['$match'], list(sort.items())))
+        return aggregate(self, pipeline, session=session, **kwargs)
+    
+    async def recording_delete_many(self, filter, session=None):
+        calls.append((self.name, filter, []))
+        return await delete_many(self, filter, session=session)
+    
+    monkeypatch.setattr(InMemoryCollection, '_select', recording_select)
+    monkeypatch.setattr(InMemoryCollection, 'aggregate', recording_aggregate)
+    monkeypatch.setattr(InMemoryCollection, 'delete_many', recording_delete_many)
+    return calls
+
+
+def test_every_public_repository_method_is_checked():
+    container = Container({'DB_BACKEND': 'memory'})
+    for name in FINDERS:
+        assert getattr(container, name) in container.repositories
+    for repository in container.repositories:
+        name = next(attr for attr in FINDERS if getattr(container, attr) is repository)
+        for cls in type(repository).__mro__:
+            if cls.__name__ == 'BaseRepository':
+                break
+            for method, fn in vars(cls).items():
+                if method.startswith('_') or not inspect.iscoroutinefunction(fn) or method in NOT_QUERIES:
+                    continue
+                assert method in FINDERS[name], f"{type(repository).__name__}.{method} has no index check"
+
+
+@pytest.mark.parametrize('repo_name,method', [
+    (repo_name, method) for repo_name, methods in FINDERS.items() for method in methods
+])
+def test_finder_is_served_by_a_declared_index(recorded, repo_name, method):
+    container = Container({'DB_BACKEND': 'memory'})
+    repository = getattr(container, repo_name)
+    args, kwargs = FINDERS[repo_name][method]
+    
+    async def run():
+        for collection, doc in SEED.items():
+            await container.db[collection].insert_one(dict(doc))
+        recorded.clear()
+        await getattr(repository, method)(*args, **kwargs)
+    
+    asyncio.run(run())
+    
+    queries = [(query, sort) for collection, query, sort in recorded if collection == repository.collection.name]
+    assert queries, f"{method} issued no query against {repository.collection.name}"
+    specs = repository.declared_indexes()
+    for query, sort in queries:
+        assert served_by_index(specs, query, sort), (
+            f"{type(repository).__name__}.{method}: no declared index serves filter {query} sort {sort}"
+        )
+
+
+def test_org_queue_tier_filter_and_counts_are_index_bounds():
+    # The queue is read on every triage screen refresh: a tier filter or the
+    # per-tier counts must not fetch every queued event of the organization
+    repo = Container({'DB_BACKEND': 'memory'}).risk_repo
+    specs = repo.declared_indexes()
+    queued = {'org_id': 'org1', 'status': {'$in': repo.OPEN_STATUSES}}
+    assert served_by_index(specs, {**queued, 'tier': 'red'}, repo.PAGE_SORT, strict=True)
+    # Counts group by tier: covered when tier follows the bounds in one index
+    assert any(spec.fields[:3] == ['org_id', 'status', 'tier'] for spec in specs)
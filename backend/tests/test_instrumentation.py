@@ -0,0 +1,25 @@
+import asyncio
+
+from repositories import UserRepository, query_metrics
+from repositories.memory import InMemoryDatabase
+
+
+def counts(collection):
+    report = query_metrics.snapshot().get('repository', {}).get(collection, {})
+    return {operation: histogram['count'] for operation, histogram in report.items()}
+
+
+def test_nested_repository_calls_are_timed_once():
+    db = InMemoryDatabase()
+    repo = UserRepository(db)
+    repo.collection = db['users_instrumented']
+    
+    async def run():
+        await repo.create({'id': 'u1', 'email': 'a@example.com', 'role': 'member'})
+        # update -> BaseRepository.update -> update_where
+        await repo.update('u1', {'first_name': 'A'})
+        # Concurrent calls from outside a repository method are each timed
+        await asyncio.gather(repo.find_by_email('a@example.com'), repo.find_by_email('b@example.com'))
+    
+    asyncio.run(run())
+    assert counts('users_instrumented') == {'create': 1, 'update': 1, 'find_by_email': 2}
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from conftest import register
+
+
+def test_delete_account_removes_status_and_outbox(app_client):
+    client, container = app_client
+    headers, user = register(client, 'delete-me@example.com')
+    r = client.post('/api/members', headers=headers, json={
+        'user_id': user['id'], 'org_id': 'org1', 'first_name': 'Del', 'last_name': 'Member'
+    })
+    member_id = r.json()['id']
+    client.put('/api/auth/me/push-token', headers=headers, json={'token': 'ExponentPushToken[x]'})
+    
+    now = datetime.utcnow()
+    samples = [
+        {'member_id': member_id, 'type': metric, 'value_num': value, 'timestamp': (now - timedelta(hours=i)).isoformat(),
+         'source': 'manual'}
+        for i in range(48) for metric, value in [('hrv', 20 if i < 24 else 60), ('resting_hr', 90 if i < 24 else 60)]
+    ]
+    assert client.post('/api/metrics/bulk', headers=headers, json={'samples': samples}).status_code == 200
+    assert client.post(f'/api/members/{member_id}/analyze-risk', headers=headers).status_code == 200
+    # A notification still waiting out quiet hours
+    client.portal.call(container.outbox_repo.enqueue_many, [{
+        'id': 'pending-1', 'user_id': user['id'], 'status': 'pending', 'provider': 'expo',
+        'next_attempt_at': now + timedelta(hours=8), 'data': {'member_id': member_id}
+    }])
+    
+    outbox = {'data.member_id': member_id}
+    assert client.portal.call(container.status_repo.find_by_member, member_id) is not None
+    assert client.portal.call(container.outbox_repo.count, outbox) >= 1
+    
+    r = client.delete(f'/api/members/{member_id}/delete-account', headers=headers, params={'confirmation': 'DELETE'})
+    assert r.status_code == 200, r.text
+    
+    assert client.portal.call(container.status_repo.find_by_member, member_id) is None
+    assert client.portal.call(container.outbox_repo.count, outbox) == 0
+    assert client.portal.call(container.member_repo.find_by_id, member_id) is None
+    assert client.portal.call(container.metric_repo.count, {'member_id': member_id}) == 0
+    assert client.portal.call(container.risk_repo.count, {'member_id': member_id}) == 0
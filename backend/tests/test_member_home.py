@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from conftest import register
+
+
+def test_home_combines_profile_risk_metrics_devices_and_caregivers(app_client):
+    client, container = app_client
+    headers, user = register(client, 'member@example.com', org_id='org1')
+    member_id = client.post('/api/members', headers=headers, json={
+        'user_id': user['id'], 'org_id': 'org1', 'first_name': 'M', 'last_name': 'Ember'
+    }).json()['id']
+    
+    now = datetime.utcnow()
+    yesterday = (now - timedelta(days=1)).replace(hour=1, minute=0, second=0, microsecond=0)
+    earlier = yesterday - timedelta(days=1)
+    samples = [(yesterday, 40), (yesterday + timedelta(hours=1), 60), (earlier, 50), (now - timedelta(days=10), 99)]
+    client.post('/api/metrics/bulk', headers=headers, json={'samples': [
+        {'member_id': member_id, 'type': 'hrv', 'value_num': value, 'source': 'watch', 'timestamp': at.isoformat()}
+        for at, value in samples
+    ]})
+    client.portal.call(container.risk_repo.create, {
+        'id': 'r1', 'member_id': member_id, 'org_id': 'org1', 'tier': 'yellow', 'status': 'new', 'score': 55.0,
+        'factors': [], 'explanation_text': 'HRV trending down', 'detected_at': now, 'updated_at': now
+    })
+    client.portal.call(container.device_repo.create, {
+        'id': 'd1', 'member_id': member_id, 'device_type': 'apple_watch', 'is_active': True,
+        'last_sync_at': now, 'last_sync_status': 'ok'
+    })
+    for id, status in [('rel1', 'accepted'), ('rel2', 'pending')]:
+        client.portal.call(container.caregiver_member_repo.create, {
+            'id': id, 'member_id': member_id, 'caregiver_id': f'cg-{id}', 'invitation_status': status
+        })
+    
+    r = client.get('/api/members/me/home', headers=headers)
+    assert r.status_code == 200, r.text
+    home = r.json()
+    assert home['member']['id'] == member_id
+    assert home['current_risk']['id'] == 'r1'
+    assert [(m['day'], m['count'], m['avg'], m['min'], m['max']) for m in home['metrics']] == [
+        (f'{earlier:%Y-%m-%d}', 1, 50, 50, 50),
+        (f'{yesterday:%Y-%m-%d}', 2, 50, 40, 60),
+    ]
+    assert [(d['id'], d['last_sync_status']) for d in home['devices']] == [('d1', 'ok')]
+    assert home['caregiver_count'] == 1
+    
+    wider = client.get('/api/members/me/home', headers=headers, params={'days': 31}).json()
+    assert sum(m['count'] for m in wider['metrics']) == 4
+
+
+def test_home_needs_a_member_profile_and_bounded_days(app_client):
+    client, _ = app_client
+    headers, _ = register(client, 'nomember@example.com')
+    assert client.get('/api/members/me/home', headers=headers).status_code == 404
+    assert client.get('/api/members/me/home', headers=headers, params={'days': 0}).status_code == 422
+    assert client.get('/api/members/me/home', headers=headers, params={'days': 32}).status_code == 422
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+import asyncio
+
+from repositories import MemberStatusRepository
+from repositories.memory import InMemoryDatabase
+
+NOW = datetime(2026, 1, 1, 12)
+
+
+def test_record_samples_is_one_bulk_write_and_never_moves_back():
+    repo = MemberStatusRepository(InMemoryDatabase())
+    writes = []
+    bulk_write = repo.collection.bulk_write
+    
+    async def counting_bulk_write(requests, **kwargs):
+        writes.append((len(requests), kwargs.get('ordered')))
+        return await bulk_write(requests, **kwargs)
+    
+    repo.collection.bulk_write = counting_bulk_write
+    
+    async def run():
+        await repo.record_samples({'m1': NOW, 'm2': NOW, 'm3': NOW})
+        await repo.record_samples({'m1': NOW - timedelta(hours=1), 'm2': NOW + timedelta(hours=1)})
+        await repo.record_samples({})
+        return await repo.find_by_members(['m1', 'm2', 'm3'])
+    
+    statuses = asyncio.run(run())
+    assert writes == [(3, False), (2, False)]
+    assert statuses['m1']['last_sample_at'] == NOW
+    assert statuses['m2']['last_sample_at'] == NOW + timedelta(hours=1)
+    assert statuses['m3']['last_sample_at'] == NOW
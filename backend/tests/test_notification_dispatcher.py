@@ -0,0 +1,92 @@
+from datetime import datetime
+import asyncio
+
+import pytest
+
+from repositories import NotificationOutboxRepository, OrganizationRepository
+from repositories.memory import InMemoryDatabase
+from services import NotificationDispatcher, PushProvider
+from services.notification_dispatcher import PushResult, quiet_hours_end
+
+
+class ScriptedProvider(PushProvider):
+    """Answers each notification with the outcome named in its data"""
+    
+    OUTCOMES = {
+        'ok': PushResult(True),
+        'retry': PushResult(False, retryable=True, error='try later'),
+        'fail': PushResult(False, error='DeviceNotRegistered'),
+    }
+    
+    async def send_batch(self, notifications):
+        return [self.OUTCOMES[n['data']['outcome']] for n in notifications]
+
+
+def notification(id, outcome, org_id=None):
+    return {
+        'id': id, 'user_id': 'u1', 'push_token': 't', 'provider': 'expo', 'org_id': org_id,
+        'title': 'Check-in', 'body': 'b', 'data': {'outcome': outcome}, 'notification_type': 'risk_alert',
+        'status': 'pending', 'attempts': 0, 'next_attempt_at': datetime.utcnow()
+    }
+
+
+def make_dispatcher():
+    db = InMemoryDatabase()
+    outbox = NotificationOutboxRepository(db)
+    dispatcher = NotificationDispatcher(outbox, OrganizationRepository(db), {'expo': ScriptedProvider()})
+    return dispatcher, outbox
+
+
+def test_batch_outcomes_are_written_in_one_bulk_write():
+    dispatcher, outbox = make_dispatcher()
+    writes = []
+    bulk_write = outbox.collection.bulk_write
+    
+    async def counting_bulk_write(requests, **kwargs):
+        writes.append(len(requests))
+        return await bulk_write(requests, **kwargs)
+    
+    outbox.collection.bulk_write = counting_bulk_write
+    
+    async def run():
+        await outbox.enqueue_many([notification('n1', 'ok'), notification('n2', 'retry'), notification('n3', 'fail')])
+        assert await dispatcher.drain_once('expo', dispatcher.providers['expo']) == 3
+        return {doc['id']: doc for doc in await outbox.find_many({})}
+    
+    docs = asyncio.run(run())
+    assert writes == [3]
+    assert (docs['n1']['status'], docs['n2']['status'], docs['n3']['status']) == ('sent', 'pending', 'failed')
+    assert docs['n1']['completed_at'] and docs['n3']['completed_at']
+    assert 'completed_at' not in docs['n2'] and 'claim' not in docs['n2']
+    assert docs['n2']['attempts'] == 1
+
+
+def test_retry_is_moved_past_quiet_hours():
+    dispatcher, outbox = make_dispatcher()
+    hour = datetime.utcnow().hour
+    org = {'id': 'org1', 'name': 'Org', 'timezone': 'UTC',
+           'alert_quiet_hours_start': (hour - 1) % 24, 'alert_quiet_hours_end': (hour + 2) % 24}
+    
+    async def run():
+        await dispatcher.org_repo.create(dict(org))
+        await outbox.enqueue_many([notification('n1', 'retry', org_id='org1')])
+        await dispatcher.drain_once('expo', dispatcher.providers['expo'])
+        return await outbox.find_by_id('n1')
+    
+    doc = asyncio.run(run())
+    assert doc['status'] == 'pending'
+    assert doc['next_attempt_at'] == quiet_hours_end(org, datetime.utcnow())
+
+
+def test_completed_rows_have_a_ttl_index():
+    outbox = NotificationOutboxRepository(InMemoryDatabase(), retention_days=7)
+    ttl = [spec for spec in outbox.declared_indexes() if spec.expire_after_seconds is not None]
+    assert [(spec.fields, spec.expire_after_seconds) for spec in ttl] == [(['completed_at'], 7 * 86400)]
+
+
+def test_provider_must_implement_send_batch():
+    class Unfinished(PushProvider):
+        max_batch = 10
+    
+    with pytest.raises(TypeError, match='abstract'):
+        Unfinished()
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from conftest import register
+
+
+def test_org_members_requires_care_team_role(app_client):
+    client, _ = app_client
+    member_headers, member_user = register(client, 'member@example.com', org_id='org1')
+    client.post('/api/members', headers=member_headers, json={
+        'user_id': member_user['id'], 'org_id': 'org1', 'first_name': 'M', 'last_name': 'Ember'
+    })
+    manager_headers, _ = register(client, 'manager@example.com', role='care_manager', org_id='org1')
+    outsider_headers, _ = register(client, 'outsider@example.com', role='care_manager', org_id='org2')
+    
+    assert client.get('/api/orgs/org1/members', headers=member_headers).status_code == 403
+    assert client.get('/api/orgs/org1/members', headers=outsider_headers).status_code == 403
+    r = client.get('/api/orgs/org1/members', headers=manager_headers)
+    assert r.status_code == 200
+    assert [m['first_name'] for m in r.json()['items']] == ['M']
+
+
+def test_org_alert_queue_pages_and_counts(app_client):
+    client, container = app_client
+    manager_headers, _ = register(client, 'manager@example.com', role='care_manager', org_id='org1')
+    start = datetime(2026, 1, 1)
+    
+    def event(id, member_id, org_id, tier, status, hours):
+        at = start + timedelta(hours=hours)
+        return {'id': id, 'member_id': member_id, 'org_id': org_id, 'tier': tier, 'status': status, 'score': 50.0,
+                'factors': [], 'explanation_text': '', 'detected_at': at, 'updated_at': at}
+    
+    events = [
+        event(f'r{i}', 'm1', 'org1', tier, status, i)
+        for i, (tier, status) in enumerate([
+            ('red', 'new'), ('yellow', 'new'), ('red', 'acknowledged'), ('red', 'resolved'), ('yellow', 'new')
+        ])
+    ] + [event('other', 'm2', 'org2', 'red', 'new', 0)]
+    for doc in events:
+        client.portal.call(container.risk_repo.create, doc)
+    
+    r = client.get('/api/orgs/org1/alerts', headers=manager_headers, params={'limit': 2})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert [a['id'] for a in body['items']] == ['r4', 'r2']
+    assert body['tier_counts'] == {'red': 2, 'yellow': 2}
+    
+    r = client.get('/api/orgs/org1/alerts', headers=manager_headers, params={'limit': 2, 'cursor': body['next_cursor']})
+    assert [a['id'] for a in r.json()['items']] == ['r1', 'r0']
+    assert r.json()['next_cursor'] is None
+    
+    r = client.get('/api/orgs/org1/alerts', headers=manager_headers, params={'tier': 'red'})
+    assert [a['id'] for a in r.json()['items']] == ['r2', 'r0']
+    assert r.json()['tier_counts'] == {'red': 2, 'yellow': 2}
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import register
+from utils.password_hasher import PasswordHasher, PasswordHasherBusy, password_hasher
+
+
+def test_hash_and_verify_run_off_the_event_loop():
+    hasher = PasswordHasher(max_concurrency=2)
+    
+    async def run():
+        loop_thread = threading.get_ident()
+        threads = []
+        
+        def where():
+            threads.append(threading.get_ident())
+        
+        await hasher._run(where)
+        hashed = await hasher.hash('Passw0rd!')
+        return loop_thread, threads, hashed, await hasher.verify('Passw0rd!', hashed), await hasher.verify('nope', hashed)
+    
+    loop_thread, threads, hashed, good, bad = asyncio.run(run())
+    hasher.shutdown()
+    assert threads and threads[0] != loop_thread
+    assert hashed.startswith('$2') and good and not bad
+    assert hasher.stats()['completed'] == 4
+
+
+def test_requests_beyond_pool_and_queue_are_shed():
+    hasher = PasswordHasher(max_concurrency=1, max_queue=1)
+    release = threading.Event()
+    
+    async def run():
+        running = asyncio.create_task(hasher._run(release.wait))
+        waiting = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher._run(release.wait)
+        stats = hasher.stats()
+        release.set()
+        await asyncio.gather(running, waiting)
+        return stats
+    
+    busy = asyncio.run(run())
+    hasher.shutdown()
+    assert (busy['pending'], busy['rejected']) == (2, 1)
+    assert (hasher.stats()['pending'], hasher.stats()['completed']) == (0, 2)
+
+
+def test_saturated_hasher_answers_429_with_retry_after(app_client, monkeypatch):
+    client, _ = app_client
+    register(client, 'member@example.com')
+    monkeypatch.setattr(password_hasher, 'max_concurrency', 0)
+    monkeypatch.setattr(password_hasher, 'max_queue', 0)
+    
+    r = client.post('/api/auth/login', json={'email': 'member@example.com', 'password': 'Passw0rd!'})
+    assert r.status_code == 429
+    assert r.headers['retry-after'] == '1'
+    
+    monkeypatch.undo()
+    r = client.post('/api/auth/login', json={'email': 'member@example.com', 'password': 'Passw0rd!'})
+    assert r.status_code == 200
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from repositories.base import BaseRepository
+from repositories.cache import CacheBackend, InMemoryCacheBackend, cached_repository
+from repositories.memory import InMemoryDatabase
+
+
+class RecordingBackend(InMemoryCacheBackend):
+    def __init__(self):
+        super().__init__()
+        self.keys = []
+    
+    async def set(self, key, value, ttl_seconds):
+        self.keys.append(key)
+        await super().set(key, value, ttl_seconds)
+
+
+def test_backend_must_implement_every_method():
+    class GetOnly(CacheBackend):
+        async def get(self, key):
+            return None
+    
+    with pytest.raises(TypeError, match='abstract'):
+        GetOnly()
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_custom_backend_serves_cached_reads():
+    backend = RecordingBackend()
+    
+    @cached_repository(backend=backend)
+    class WidgetRepository(BaseRepository):
+        pass
+    
+    async def scenario():
+        repo = WidgetRepository(InMemoryDatabase(), 'widgets')
+        await repo.create({'id': 'w1', 'name': 'one'})
+        assert (await repo.find_by_id('w1'))['name'] == 'one'
+        assert (await repo.find_by_id('w1'))['name'] == 'one'
+        await repo.delete('w1')
+        return await repo.find_by_id('w1')
+    
+    assert asyncio.run(scenario()) is None
+    assert backend.keys == ['widgets:w1']
@@ -0,0 +1,73 @@
+import asyncio
+
+from repositories.base import BaseRepository
+from repositories.loader import current_loader, start_request_scope, use_request_loader
+from repositories.memory import InMemoryDatabase
+
+
+class WidgetRepository(BaseRepository):
+    batch_loads = True
+
+
+async def seeded_repo():
+    repo = WidgetRepository(InMemoryDatabase(), 'widgets')
+    for i in range(3):
+        await repo.create({'id': f'w{i}', 'name': f'widget {i}'})
+    reads = []
+    find_by_ids = repo.find_by_ids
+    
+    async def counting_find_by_ids(ids):
+        reads.append(sorted(ids))
+        return await find_by_ids(ids)
+    
+    repo.find_by_ids = counting_find_by_ids
+    return repo, reads
+
+
+def test_concurrent_lookups_share_one_query_and_are_memoized():
+    async def run():
+        repo, reads = await seeded_repo()
+        loader = start_request_scope()
+        first = await asyncio.gather(*(repo.find_by_id(id) for id in ['w0', 'w1', 'w0', 'missing']))
+        again = await asyncio.gather(repo.find_by_id('w1'), repo.find_by_id('missing'))
+        # Callers get copies: mutating one does not change the memoized document
+        first[0]['name'] = 'changed'
+        return reads, loader.queries, first, again, await repo.find_by_id('w0')
+    
+    reads, queries, first, again, w0 = asyncio.run(run())
+    assert reads == [['missing', 'w0', 'w1']] and queries == 1
+    assert [d and d['id'] for d in first] == ['w0', 'w1', 'w0', None]
+    assert again[0]['name'] == 'widget 1' and again[1] is None
+    assert w0['name'] == 'widget 0'
+
+
+def test_writes_drop_memoized_documents():
+    async def run():
+        repo, reads = await seeded_repo()
+        start_request_scope()
+        await repo.find_by_id('w1')
+        await repo.update('w1', {'name': 'renamed'})
+        renamed = await repo.find_by_id('w1')
+        await repo.delete('w1')
+        deleted = await repo.find_by_id('w1')
+        return reads, renamed, deleted
+    
+    reads, renamed, deleted = asyncio.run(run())
+    assert renamed['name'] == 'renamed' and deleted is None
+    assert reads == [['w1'], ['w1'], ['w1']]
+
+
+def test_without_a_request_scope_reads_go_straight_to_the_collection():
+    async def run():
+        repo, reads = await seeded_repo()
+        assert current_loader() is None
+        docs = await asyncio.gather(repo.find_by_id('w0'), repo.find_by_id('w0'))
+        return reads, docs
+    
+    reads, docs = asyncio.run(run())
+    assert reads == [] and [d['id'] for d in docs] == ['w0', 'w0']
+
+
+def test_api_routes_start_a_request_scope():
+    import server
+    assert any(d.dependency is use_request_loader for d in server.api_router.dependencies)
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+import asyncio
+
+import pytest
+
+from repositories.memory import InMemoryDatabase
+from repositories.pagination import keyset_filter
+from repositories.sqlite_store import SQLiteDatabase
+
+START = datetime(2026, 1, 1)
+
+
+def samples():
+    return [
+        {'id': f's{i:03d}', 'member_id': f'm{i % 3}', 'type': 'hrv' if i % 2 else 'steps',
+         'timestamp': START + timedelta(hours=i), 'ingested_at': START + timedelta(hours=i // 4), 'value_num': i}
+        for i in range(60)
+    ]
+
+
+QUERIES = [
+    {'member_id': 'm1'},
+    {'$and': [{'member_id': 'm1'}, {'ingested_at': {'$lte': START + timedelta(hours=8)}}]},
+    # find_changes: equality, upper bound and a keyset continuation
+    {'$and': [
+        {'member_id': 'm2'},
+        {'ingested_at': {'$lte': START + timedelta(hours=12)}},
+        keyset_filter([('ingested_at', 1), ('id', 1)], [START + timedelta(hours=3), 's014']),
+    ]},
+    {'$or': [{'member_id': 'm0', 'type': 'hrv'}, {'timestamp': {'$gte': START + timedelta(hours=55)}}]},
+    # Not pushable: value_num is not a column
+    {'$and': [{'member_id': 'm0'}, {'value_num': {'$gt': 30}}]},
+]
+
+
+@pytest.fixture
+def stores(tmp_path):
+    sqlite = SQLiteDatabase(str(tmp_path / 'metrics.db'))
+    memory = InMemoryDatabase()
+    
+    async def load():
+        for db in (sqlite, memory):
+            await db.metric_samples.insert_many(samples())
+    
+    asyncio.run(load())
+    yield sqlite.metric_samples, memory.metric_samples
+    sqlite.close()
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_queries_match_the_in_memory_backend(stores, query):
+    sqlite, memory = stores
+    sort = [('ingested_at', 1), ('id', 1)]
+    
+    async def run(collection):
+        docs = await collection.find(query).sort(sort).limit(5).to_list(length=5)
+        return [d['id'] for d in docs], await collection.count_documents(query)
+    
+    assert asyncio.run(run(sqlite)) == asyncio.run(run(memory))
+
+
+def test_and_and_keyset_or_are_pushed_down(stores):
+    sqlite, _ = stores
+    for query in QUERIES[:4]:
+        assert sqlite._where(query)[2], query
+    assert not sqlite._where(QUERIES[4])[2]
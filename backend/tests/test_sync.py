@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from conftest import member_with_metrics
+
+
+def sync(client, headers, member_id, **params):
+    r = client.get(f'/api/members/{member_id}/sync', headers=headers, params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def add_sample(client, headers, member_id, value):
+    client.post('/api/metrics', headers=headers, json={
+        'member_id': member_id, 'type': 'hrv', 'value_num': value, 'source': 'watch',
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+
+def test_initial_then_incremental_sync(app_client):
+    client, _ = app_client
+    headers, member_id = member_with_metrics(client, samples=3)
+    client.post(f'/api/members/{member_id}/consents', headers=headers, json={
+        'member_id': member_id, 'consent_type': 'data_collection', 'granted': True
+    })
+    
+    first = sync(client, headers, member_id)
+    assert len(first['metrics']) == 3 and len(first['consents']) == 1
+    assert first['has_more'] is False
+    
+    unchanged = sync(client, headers, member_id, since=first['cursor'])
+    assert (unchanged['metrics'], unchanged['alerts'], unchanged['consents'], unchanged['devices']) == ([], [], [], [])
+    
+    add_sample(client, headers, member_id, 77)
+    delta = sync(client, headers, member_id, since=unchanged['cursor'])
+    assert [m['value_num'] for m in delta['metrics']] == [77]
+    assert delta['consents'] == []
+
+
+def test_paging_with_a_limit_neither_skips_nor_repeats(app_client):
+    client, _ = app_client
+    # One bulk insert: every sample shares ingested_at, so ties are broken by id
+    headers, member_id = member_with_metrics(client, samples=5)
+    
+    seen, cursor, calls = [], None, 0
+    while True:
+        page = sync(client, headers, member_id, limit=2, **({'since': cursor} if cursor else {}))
+        seen += [m['id'] for m in page['metrics']]
+        cursor = page['cursor']
+        calls += 1
+        if not page['has_more']:
+            break
+    assert calls == 3
+    assert len(seen) == 5 and len(set(seen)) == 5
+
+
+def test_writes_inside_the_settle_window_arrive_on_a_later_sync(app_client):
+    client, container = app_client
+    headers, member_id = member_with_metrics(client, samples=1)
+    container.sync_service.settle_seconds = 3600
+    
+    held_back = sync(client, headers, member_id)
+    assert held_back['metrics'] == []
+    
+    container.sync_service.settle_seconds = 0
+    assert len(sync(client, headers, member_id, since=held_back['cursor'])['metrics']) == 1
+
+
+def test_malformed_cursor_is_rejected(app_client):
+    client, _ = app_client
+    headers, member_id = member_with_metrics(client, samples=1)
+    r = client.get(f'/api/members/{member_id}/sync', headers=headers, params={'since': 'not-a-cursor'})
+    assert r.status_code == 400
@@ -0,0 +1,126 @@
+"""
+Response compression (brotli when the `brotli` package is installed, else gzip).
+
+Only complete, single-message response bodies of at least `minimum_size`
+bytes are compressed. Streaming responses (Server-Sent Events, chunked
+bodies) pass through untouched so events are never held back in a
+compressor's buffer.
+"""
+from typing import List, Optional
+import asyncio
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Skip already-compressed or streaming media types
+_SKIP_TYPES = ('text/event-stream', 'image/', 'video/', 'audio/', 'application/zip', 'application/gzip')
+
+# Bodies larger than this are compressed off the event loop
+_THREAD_THRESHOLD = 1024 * 1024
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Preferred supported coding from an Accept-Encoding header (q=0 excluded)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding] = q
+    for coding in (('br', 'gzip') if brotli is not None else ('gzip',)):
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+def _compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses for clients that accept it"""
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = _choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start: List[Optional[Message]] = [None]
+        passthrough = [False]
+        
+        async def send_wrapper(message: Message):
+            if passthrough[0]:
+                await send(message)
+                return
+            
+            if message['type'] == 'http.response.start':
+                headers = Headers(raw=message['headers'])
+                content_type = headers.get('content-type', '')
+                if 'content-encoding' in headers or content_type.startswith(_SKIP_TYPES):
+                    passthrough[0] = True
+                    await send(message)
+                else:
+                    # Hold the start message until the body shows whether to compress
+                    start[0] = message
+                return
+            
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+            
+            body = message.get('body', b'')
+            if message.get('more_body', False) or len(body) < self.minimum_size:
+                # Streaming or small: send as is
+                passthrough[0] = True
+                await send(start[0])
+                await send(message)
+                return
+            
+            if len(body) > _THREAD_THRESHOLD:
+                compressed = await asyncio.to_thread(
+                    _compress, body, encoding, self.gzip_level, self.brotli_quality
+                )
+            else:
+                compressed = _compress(body, encoding, self.gzip_level, self.brotli_quality)
+            
+            headers = MutableHeaders(raw=start[0]['headers'])
+            headers['Content-Encoding'] = encoding
+            headers['Content-Length'] = str(len(compressed))
+            headers.add_vary_header('Accept-Encoding')
+            etag = headers.get('etag')
+            if etag and not etag.startswith('W/'):
+                # The representation changed, so a strong validator no longer applies
+                headers['ETag'] = f'W/{etag}'
+            await send(start[0])
+            await send({'type': 'http.response.body', 'body': compressed})
+        
+        await self.app(scope, receive, send_wrapper)
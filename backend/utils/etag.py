@@ -0,0 +1,42 @@
+"""
+Conditional GET helpers: weak ETags built from cheap version markers
+(e.g. the latest `updated_at` of a member's alerts) so a matching
+If-None-Match can be answered with 304 before the full query runs.
+"""
+from datetime import datetime
+from typing import Any
+import hashlib
+
+from fastapi import Request, Response
+
+# Clients may keep responses but must revalidate before reuse
+CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over version markers and anything else the response depends on (query params, user)"""
+    raw = '|'.join(p.isoformat() if isinstance(p, datetime) else str(p) for p in parts)
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match comparison (weak: W/ prefixes are ignored)"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    wanted = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith('W/') else candidate) == wanted:
+            return True
+    return False
+
+
+def etag_headers(etag: str) -> dict:
+    return {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
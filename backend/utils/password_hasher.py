@@ -0,0 +1,116 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow (~100-250 ms per call), so running it inline in an
+async handler stalls every other request on the worker. PasswordHasher runs the
+passlib calls on a dedicated, bounded thread pool and applies admission control:
+once the pool and its wait queue are full, new requests are rejected immediately
+with PasswordHasherBusy instead of queueing without limit.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import os
+import time
+
+from .security import hash_password, verify_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool is saturated and the request is shed"""
+    
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Too many concurrent authentication requests")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Bounded executor for bcrypt work.
+    `max_concurrency` calls run at once; up to `max_queue` more may wait.
+    """
+    
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 32):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        
+        # Metrics
+        self._completed = 0
+        self._rejected = 0
+        self._queue_time_total = 0.0
+        self._queue_time_max = 0.0
+        self._run_time_total = 0.0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="password-hasher"
+            )
+        return self._executor
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn on the pool, shedding load when the queue is full"""
+        if self._pending >= self.max_concurrency + self.max_queue:
+            self._rejected += 1
+            raise PasswordHasherBusy()
+        
+        self._pending += 1
+        enqueued_at = time.perf_counter()
+        try:
+            async with self._get_semaphore():
+                started_at = time.perf_counter()
+                queue_time = started_at - enqueued_at
+                self._queue_time_total += queue_time
+                self._queue_time_max = max(self._queue_time_max, queue_time)
+                
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._get_executor(), fn, *args)
+                
+                self._run_time_total += time.perf_counter() - started_at
+                self._completed += 1
+                return result
+        finally:
+            self._pending -= 1
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop"""
+        return await self._run(hash_password, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop"""
+        return await self._run(verify_password, plain_password, hashed_password)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool utilisation and queue-time metrics"""
+        completed = self._completed or 1
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'pending': self._pending,
+            'completed': self._completed,
+            'rejected': self._rejected,
+            'queue_time_avg_ms': round(self._queue_time_total / completed * 1000, 2),
+            'queue_time_max_ms': round(self._queue_time_max * 1000, 2),
+            'run_time_avg_ms': round(self._run_time_total / completed * 1000, 2),
+        }
+    
+    def shutdown(self):
+        """Release pool threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_concurrency=int(os.getenv("PASSWORD_HASH_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+)
@@ -33,27 +33,19 @@ export default function DashboardScreen() {
     setIsLoading(true);
 
     try {
-      // Get member profile
-      const profileResponse = await api.getMemberProfile(accessToken);
+      // Profile and risk status in one round trip
+      const homeResponse = await api.getHome(accessToken);
       
-      if (profileResponse.error) {
-        console.error('[Dashboard] Profile error:', profileResponse.error);
+      if (homeResponse.error) {
+        console.error('[Dashboard] Home error:', homeResponse.error);
         Alert.alert('Error', 'Failed to load your profile. Please try logging in again.');
         setIsLoading(false);
         return;
       }
       
-      if (profileResponse.data) {
-        setMemberProfile(profileResponse.data);
-
-        // Get risk status
-        const riskResponse = await api.getCurrentRisk(accessToken, profileResponse.data.id);
-        if (riskResponse.error) {
-          console.error('[Dashboard] Risk error:', riskResponse.error);
-          // Don't show error for risk - it's optional
-        } else if (riskResponse.data) {
-          setRiskStatus(riskResponse.data);
-        }
+      if (homeResponse.data) {
+        setMemberProfile(homeResponse.data.member);
+        setRiskStatus(homeResponse.data.current_risk);
       }
     } catch (error) {
       console.error('[Dashboard] Unexpected error:', error);
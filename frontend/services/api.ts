@@ -87,6 +87,28 @@ export const api = {
     }
   },
 
+  // Home screen: profile, current risk, daily metric summaries, devices and
+  // caregiver count in one request
+  getHome: async (token: string, days: number = 7): Promise<ApiResponse<any>> => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/members/me/home?days=${days}`, {
+        headers: {
+          'Authorization': `Bearer ${token}`,
+        },
+      });
+
+      const data = await response.json();
+
+      if (!response.ok) {
+        return { error: data.detail || 'Failed to fetch home' };
+      }
+
+      return { data };
+    } catch (error) {
+      return { error: 'Network error. Please check your connection.' };
+    }
+  },
+
   // Risk/Alerts endpoints
   getCurrentRisk: async (token: string, memberId: string): Promise<ApiResponse<any>> => {
     try {